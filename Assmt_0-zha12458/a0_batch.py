@@ -0,0 +1,144 @@
+"""CSC148 Assignment 0 - Object-Oriented Modelling, Batch Timetable Validation
+
+=== Module Description ===
+
+This file contains a function that validates many submitted timetables at once,
+spreading the work across a pool of worker processes. Each worker receives the
+course catalog once, when it starts, and then only receives the timetable
+requests themselves.
+
+A timetable request is a (semester code, selections) pair, where selections is a
+list of (course code, section code) pairs, e.g.
+
+    ('20239', [('CSC148H1', 'LEC0101'), ('CSC148H1', 'TUT0101')])
+"""
+from __future__ import annotations
+import collections
+from concurrent.futures import ProcessPoolExecutor
+import itertools
+import os
+from typing import Iterable, Iterator
+
+from a0_part3 import Course
+from a0_part4 import SEMESTERS, Timetable
+
+# The default number of requests sent to a worker process at a time.
+DEFAULT_CHUNK_SIZE = 256
+
+# The number of chunks of requests in flight per worker process.
+_CHUNKS_PER_PROCESS = 2
+
+# The catalog of this worker process, set by init_worker.
+_CATALOG: dict[str, Course] = {}
+
+
+def validate_timetables(requests: Iterable[tuple[str, list[tuple[str, str]]]],
+                        courses: dict[str, Course], processes: int | None = None,
+                        chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bool]:
+    """Yield whether each timetable request in <requests> is valid, in the same order.
+
+    A request is valid when its semester code is in SEMESTERS, every selected course is
+    in <courses> and has the selected section in that semester, and the resulting
+    Timetable is valid.
+
+    <courses> is a dictionary like the one returned by load_courses_data. The requests
+    are checked by <processes> worker processes (os.cpu_count() when None), each sent
+    <chunk_size> requests at a time; with processes <= 1 they are checked in this
+    process. <requests> is consumed lazily: a new chunk is sent as soon as the oldest
+    chunk in flight has been checked, so that at most a couple of chunks per worker are
+    held in memory. Since the results are yielded in order, a slow chunk holds back the
+    chunks sent after it: the workers keep checking the chunks already in flight, but no
+    new chunk is sent until the slow one is done.
+
+    Preconditions:
+        - chunk_size > 0
+    """
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if processes <= 1:
+        for request in requests:
+            yield check_request(request, courses)
+    else:
+        yield from _validate_in_pool(_chunks(requests, chunk_size), courses, processes)
+    return None
+
+
+def check_request(request: tuple[str, list[tuple[str, str]]], courses: dict[str, Course]) -> bool:
+    """Return whether the timetable request <request> is valid for the catalog <courses>.
+
+    See validate_timetables for what makes a request valid.
+    """
+    semester_code, selections = request
+    if semester_code not in SEMESTERS:
+        return False
+
+    timetable = Timetable(semester_code)
+    for course_code, section_code in selections:
+        course = courses.get(course_code)
+        if course is None or not timetable.add_section_by_code(course, section_code):
+            return False
+    return timetable.is_valid()
+
+
+def _validate_in_pool(chunks: Iterator[list[tuple[str, list[tuple[str, str]]]]],
+                      courses: dict[str, Course], processes: int) -> Iterator[bool]:
+    """Yield whether each request of <chunks> is valid for the catalog <courses>, in the
+    same order, checking _CHUNKS_PER_PROCESS chunks per worker process at a time with
+    <processes> worker processes."""
+    with ProcessPoolExecutor(processes, initializer=init_worker,
+                             initargs=(courses,)) as executor:
+        pending = collections.deque(
+            executor.submit(_check_chunk_in_worker, first_chunk)
+            for first_chunk in itertools.islice(chunks, _CHUNKS_PER_PROCESS * processes))
+        while pending:
+            results = pending.popleft().result()
+            for chunk in itertools.islice(chunks, 1):
+                pending.append(executor.submit(_check_chunk_in_worker, chunk))
+            yield from results
+    return None
+
+
+def init_worker(courses: dict[str, Course]) -> None:
+    """Store the catalog <courses> of this worker process (see worker_catalog).
+
+    This is the initializer of the worker processes of validate_timetables, and of
+    other process pools that share a catalog with their workers (e.g., in a0_replay).
+    """
+    _CATALOG.clear()
+    _CATALOG.update(courses)
+
+
+def worker_catalog() -> dict[str, Course]:
+    """Return the catalog of this worker process, as stored by init_worker."""
+    return _CATALOG
+
+
+def _chunks(requests: Iterable[tuple[str, list[tuple[str, str]]]],
+            chunk_size: int) -> Iterator[list[tuple[str, list[tuple[str, str]]]]]:
+    """Yield the consecutive lists of <chunk_size> requests of <requests> (the last one
+    may be shorter)."""
+    requests = iter(requests)
+    chunk = list(itertools.islice(requests, chunk_size))
+    while chunk:
+        yield chunk
+        chunk = list(itertools.islice(requests, chunk_size))
+    return None
+
+
+def _check_chunk_in_worker(chunk: list[tuple[str, list[tuple[str, str]]]]) -> list[bool]:
+    """Return whether each request of <chunk> is valid for the catalog of this worker
+    process."""
+    return [check_request(request, worker_catalog()) for request in chunk]
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
+
+    import python_ta
+
+    python_ta.check_all(config={
+        'max-line-length': 100,
+        'extra-imports': ['collections', 'concurrent.futures', 'itertools', 'os', 'typing',
+                          'a0_part3', 'a0_part4']
+    })
@@ -0,0 +1,68 @@
+"""CSC148 Assignment 0 - Object-Oriented Modelling, Batch Timetable Validation (Tests)
+
+=== Module Description ===
+
+This file contains tests that validate random timetable requests on a small
+synthetic catalog, in this process and with a pool of worker processes.
+"""
+import random
+
+import pytest
+
+import a0_batch
+from a0_batch import check_request, validate_timetables
+from a0_benchmark import random_timetable, generate_courses
+from a0_part3 import Course
+from a0_snapshot import timetable_request
+
+
+@pytest.fixture(scope='module')
+def courses() -> dict[str, Course]:
+    """A catalog of 20 synthetic courses."""
+    return {course.code: course
+            for course in (Course(raw) for raw in generate_courses(20, seed=148))}
+
+
+@pytest.fixture(scope='module')
+def requests(courses: dict[str, Course]) -> list[tuple[str, list[tuple[str, str]]]]:
+    """10 random timetable requests, some valid and some not, followed by requests for
+    an unknown semester, course and section."""
+    rng = random.Random(148)
+    res = [timetable_request(random_timetable(rng, list(courses.values())))
+           for _ in range(10)]
+    code = next(iter(courses))
+    return res + [('20251', []), ('20239', [('AAA000H1', 'LEC0101')]),
+                  ('20239', [(code, 'LEC9999')])]
+
+
+def test_serial_matches_check_request(courses: dict[str, Course],
+                                      requests: list[tuple[str, list[tuple[str, str]]]]
+                                      ) -> None:
+    """Test that validating in this process gives the result of check_request."""
+    results = list(validate_timetables(requests, courses, processes=1))
+    assert results == [check_request(request, courses) for request in requests]
+    assert any(results) and not all(results[:10])
+    assert results[10:] == [False, False, False]
+
+
+def test_parallel_matches_serial(courses: dict[str, Course],
+                                 requests: list[tuple[str, list[tuple[str, str]]]]) -> None:
+    """Test that validating with several worker processes, in small chunks, gives the
+    same results in the same order as validating in this process."""
+    expected = list(validate_timetables(requests, courses, processes=1))
+    assert list(validate_timetables(iter(requests), courses, processes=2,
+                                    chunk_size=3)) == expected
+
+
+@pytest.mark.parametrize('processes', [0, 1])
+def test_no_pool_for_one_process(courses: dict[str, Course],
+                                 requests: list[tuple[str, list[tuple[str, str]]]],
+                                 processes: int, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that no worker processes are started when processes <= 1."""
+    monkeypatch.setattr(a0_batch, 'ProcessPoolExecutor', None)
+    assert len(list(validate_timetables(requests, courses, processes=processes))) == \
+        len(requests)
+
+
+if __name__ == '__main__':
+    pytest.main(['a0_batch_test.py', '-v'])
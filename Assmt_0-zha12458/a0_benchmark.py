@@ -0,0 +1,253 @@
+"""CSC148 Assignment 0 - Object-Oriented Modelling, Benchmarks
+
+=== Module Description ===
+
+This file contains a generator for synthetic course catalogs in the same JSON
+format as data/courses/courses-100.json, and a benchmark suite that times the
+main operations of the Course, Section and Timetable classes on catalogs of
+increasing size.
+
+Run this module to benchmark catalogs of 100, 10 000 and 100 000 courses and
+write the results as JSON (see run_benchmarks for the format), e.g.
+
+    A0_CONTRACTS=off python a0_benchmark.py --sizes 100 10000 --output bench.json
+
+Contract checking multiplies the cost of every method call, so it should normally
+be turned off (see a0_contracts) when benchmarking; the mode used is recorded in
+the results. Run it with --check to run its doctests and PythonTA instead.
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import random
+import tempfile
+import time
+from typing import Callable, Iterator
+
+import a0_contracts
+from a0_part2 import Section
+from a0_part3 import Course
+from a0_part4 import SEMESTERS, Timetable, load_courses_data
+
+# The catalog sizes benchmarked by default.
+DEFAULT_SIZES = (100, 10_000, 100_000)
+
+# The number of times each operation is run per catalog size.
+DEFAULT_OPERATIONS = 10_000
+
+_DEPARTMENTS = ('ANT', 'AST', 'BIO', 'CHM', 'CSC', 'ECO', 'ENG', 'GGR', 'HIS', 'MAT',
+                'PHL', 'PHY', 'POL', 'PSY', 'SOC', 'STA')
+_WORDS = ('Introduction', 'Advanced', 'Topics', 'Theory', 'Methods', 'Systems', 'Analysis',
+          'Foundations', 'Applied', 'Computational', 'Modern', 'History', 'Design', 'Data')
+
+# The number of milliseconds in one hour.
+_MILLIS_PER_HOUR = 60 * 60 * 1000
+
+
+def generate_courses(num_courses: int, seed: int = 0) -> Iterator[dict]:
+    """Yield the raw data of <num_courses> synthetic courses, in the format read by the
+    Course initializer.
+
+    Each course is offered in one or both semesters, and has 1 to 4 LEC sections and up
+    to 8 TUT and 3 PRA sections per semester. Lectures meet for 3 hours a week (one to
+    three meetings), tutorials and practicals once for 1 to 3 hours, between 9:00 and
+    21:00. The same seed always generates the same courses.
+
+    Preconditions:
+        - 0 <= num_courses <= len(_DEPARTMENTS) * 900 * 10
+
+    >>> courses = list(generate_courses(3))
+    >>> [len(course['code']) for course in courses]
+    [8, 8, 8]
+    >>> Course(courses[0]).code == courses[0]['code']
+    True
+    """
+    rng = random.Random(seed)
+
+    for i in range(num_courses):
+        department = _DEPARTMENTS[i % len(_DEPARTMENTS)]
+        number = 100 + (i // len(_DEPARTMENTS)) % 900
+        campus = i // (len(_DEPARTMENTS) * 900)
+        code = f'{department}{number}H{(campus + 1) % 10}'
+        name = ' '.join(rng.sample(_WORDS, rng.randint(2, 4)))
+
+        sections = []
+        for semester in rng.choice([SEMESTERS[:1], SEMESTERS[1:], SEMESTERS]):
+            sections.extend(_generate_semester_sections(rng, semester))
+
+        yield {'name': name, 'code': code, 'sections': sections}
+    return None
+
+
+def _generate_semester_sections(rng: random.Random, semester: str) -> list[dict]:
+    """Return the raw data of the synthetic sections of a course in <semester>."""
+    sections = []
+    for method, count in (('LEC', rng.randint(1, 4)), ('TUT', rng.randint(0, 8)),
+                          ('PRA', rng.choice([0, 0, 0, 1, 2, 3]))):
+        for j in range(count):
+            sections.append(_generate_section(rng, f'{method}{(j + 1) * 100 + 1:04}', semester))
+    return sections
+
+
+def _generate_section(rng: random.Random, name: str, semester: str) -> dict:
+    """Return the raw data of a synthetic section with the given name and semester."""
+    if name.startswith('LEC'):
+        lengths = rng.choice([[3], [2, 1], [1, 1, 1]])
+    else:
+        lengths = [rng.randint(1, 3)]
+    days = rng.sample(range(1, 6), len(lengths))
+
+    meetings = []
+    for day, length in zip(days, lengths):
+        start = rng.randrange(18, 43 - 2 * length) * _MILLIS_PER_HOUR // 2
+        meetings.append({'start': {'day': day, 'millisofday': start},
+                         'end': {'day': day, 'millisofday': start + length * _MILLIS_PER_HOUR}})
+
+    return {'name': name, 'deliveryModes': [{'session': semester}], 'meetingTimes': meetings}
+
+
+def write_catalog(file: str, num_courses: int, seed: int = 0) -> None:
+    """Write a synthetic catalog of <num_courses> courses to <file>, in the format read
+    by load_courses_data. Courses are written one at a time, so the whole catalog is
+    never held in memory.
+    """
+    with open(file, 'w') as f:
+        f.write('[')
+        for i, raw_course_data in enumerate(generate_courses(num_courses, seed)):
+            if i > 0:
+                f.write(',\n')
+            f.write(json.dumps(raw_course_data))
+        f.write(']\n')
+
+
+def run_benchmarks(sizes: tuple[int, ...] = DEFAULT_SIZES, output: str | None = None,
+                   operations: int = DEFAULT_OPERATIONS, seed: int = 0) -> dict:
+    """Benchmark catalogs of each size in <sizes> and return the results.
+
+    The results are a dictionary with an 'environment' entry (Python version, contract
+    sample rate, seed) and a 'results' entry that maps each size (as a string) to a
+    dictionary mapping each benchmark name to {'operations', 'seconds', 'us_per_op'}.
+    If <output> is not None, the results are also written to <output> as JSON.
+    """
+    results = {}
+    for size in sizes:
+        results[str(size)] = _benchmark_size(size, operations, seed)
+
+    report = {
+        'environment': {'python': platform.python_version(),
+                        'contract_sample_rate': a0_contracts.SAMPLE_RATE,
+                        'seed': seed,
+                        'time': time.strftime('%Y-%m-%dT%H:%M:%S')},
+        'results': results
+    }
+    if output is not None:
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+def _benchmark_size(size: int, operations: int, seed: int) -> dict[str, dict]:
+    """Return the benchmark results for a synthetic catalog of <size> courses."""
+    rng = random.Random(seed)
+    results = {}
+
+    with tempfile.TemporaryDirectory() as directory:
+        file = os.path.join(directory, f'courses-{size}.json')
+        write_catalog(file, size, seed)
+
+        start = time.perf_counter()
+        courses = load_courses_data(file)
+        results['load_courses_data'] = _result(1, time.perf_counter() - start)
+
+    course_list = list(courses.values())
+    pairs = [_random_section(rng, course_list) for _ in range(operations)]
+
+    results['Course.lookup_section'] = _time(operations, lambda i: pairs[i][0].lookup_section(
+        pairs[i][1].section_code, pairs[i][1].semester_code))
+    results['Course.get_compatible_sections'] = _time(
+        operations, lambda i: pairs[i - 1][0].get_compatible_sections(pairs[i][1]))
+    results['Section.has_conflict'] = _time(
+        operations, lambda i: pairs[i - 1][1].has_conflict(pairs[i][1]))
+
+    timetables = [random_timetable(rng, course_list) for _ in range(max(1, operations // 10))]
+    results['Timetable.is_valid'] = _time(len(timetables), lambda i: timetables[i].is_valid())
+    return results
+
+
+def _random_section(rng: random.Random, courses: list[Course]) -> tuple[Course, Section]:
+    """Return a random course of <courses> and one of its sections."""
+    course = rng.choice(courses)
+    return course, rng.choice(course.sections)
+
+
+def random_timetable(rng: random.Random, courses: list[Course]) -> Timetable:
+    """Return a timetable holding a LEC section, and possibly a TUT section, of five random
+    courses of <courses>, in a random semester, drawn with <rng>.
+
+    The timetable may have conflicts, so it is a realistic input for both the benchmarks
+    and the tests of timetable validation.
+    """
+    timetable = Timetable(rng.choice(SEMESTERS))
+    for course in rng.sample(courses, min(5, len(courses))):
+        sections = course.get_semester_sections(timetable.semester_code)
+        for method in ('LEC', 'TUT'):
+            codes = [section.section_code for section in sections
+                     if section.section_code.startswith(method)]
+            if codes:
+                timetable.add_section_by_code(course, rng.choice(codes))
+    return timetable
+
+
+def _time(operations: int, operation: Callable[[int], object]) -> dict:
+    """Return the benchmark result of calling <operation> on 0, 1, ..., operations - 1."""
+    start = time.perf_counter()
+    for i in range(operations):
+        operation(i)
+    return _result(operations, time.perf_counter() - start)
+
+
+def _result(operations: int, seconds: float) -> dict:
+    """Return a benchmark result for <operations> operations that took <seconds> in total."""
+    return {'operations': operations, 'seconds': seconds,
+            'us_per_op': seconds / operations * 1e6 if operations else 0.0}
+
+
+def _main(args: argparse.Namespace) -> None:
+    """Run the benchmarks described by the command-line arguments <args> (see the module
+    docstring), write the results and print them."""
+    report = run_benchmarks(tuple(args.sizes), args.output, args.operations, args.seed)
+    for size, size_results in report['results'].items():
+        for name, result in size_results.items():
+            print(f"{size:>8} {name:<32} {result['us_per_op']:>14.2f} us/op")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the CSC148 A0 course model.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help='the numbers of courses in the synthetic catalogs')
+    parser.add_argument('--operations', type=int, default=DEFAULT_OPERATIONS,
+                        help='the number of times each operation is run per size')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='bench_output.json',
+                        help='the JSON file to write the results to')
+    parser.add_argument('--check', action='store_true',
+                        help='run the doctests and PythonTA on this module instead')
+    command_line = parser.parse_args()
+
+    if command_line.check:
+        import doctest
+        doctest.testmod()
+
+        import python_ta
+
+        python_ta.check_all(config={
+            'max-line-length': 100,
+            'extra-imports': ['argparse', 'json', 'os', 'platform', 'random', 'tempfile',
+                              'time', 'typing', 'a0_contracts', 'a0_part2', 'a0_part3',
+                              'a0_part4'],
+            'allowed-io': ['write_catalog', 'run_benchmarks', '_main']
+        })
+    else:
+        _main(command_line)
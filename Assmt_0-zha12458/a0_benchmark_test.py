@@ -0,0 +1,47 @@
+"""CSC148 Assignment 0 - Object-Oriented Modelling, Benchmarks (Tests)
+
+=== Module Description ===
+
+This file contains tests for the synthetic catalogs generated by a0_benchmark.
+"""
+import os
+
+import pytest
+
+from a0_benchmark import generate_courses, write_catalog
+from a0_part3 import Course
+from a0_part4 import SEMESTERS, load_courses_data
+
+
+def test_write_catalog_loads(tmp_path: str) -> None:
+    """Test that a written catalog loads with load_courses_data into the generated courses,
+    and that the same seed always generates the same catalog."""
+    file = os.path.join(tmp_path, 'courses.json')
+    write_catalog(file, 20, seed=148)
+    courses = load_courses_data(file)
+
+    assert list(generate_courses(20, seed=148)) == list(generate_courses(20, seed=148))
+    expected = [Course(raw) for raw in generate_courses(20, seed=148)]
+    assert list(courses) == [course.code for course in expected]
+    for course in expected:
+        assert courses[course.code].name == course.name
+        assert [(section.section_code, section.semester_code, section.timeslots)
+                for section in courses[course.code].sections] == \
+            [(section.section_code, section.semester_code, section.timeslots)
+             for section in course.sections]
+
+
+def test_generated_sections() -> None:
+    """Test that every generated course has a LEC section in each semester it is offered
+    in, and only in SEMESTERS."""
+    for raw_course_data in generate_courses(20, seed=148):
+        course = Course(raw_course_data)
+        semesters = {section.semester_code for section in course.sections}
+        assert semesters and semesters <= set(SEMESTERS)
+        for semester in semesters:
+            assert any(section.section_code.startswith('LEC')
+                       for section in course.get_semester_sections(semester))
+
+
+if __name__ == '__main__':
+    pytest.main(['a0_benchmark_test.py', '-v'])
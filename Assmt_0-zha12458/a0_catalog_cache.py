@@ -0,0 +1,310 @@
+"""CSC148 Assignment 0 - Object-Oriented Modelling, Compiled Catalog Cache
+
+=== Module Description ===
+
+This file contains a compiler that turns a course catalog JSON file (in the
+format read by load_courses_data) into a compact binary file, and a loader that
+memory-maps the binary file and builds Course objects only when they are looked up.
+
+The binary file is laid out as follows (all integers are little-endian):
+
+    header      MAGIC, then the number of strings, courses, sections and timeslots
+                as four unsigned 32-bit integers, then the size and modification
+                time (in nanoseconds) of the JSON file it was compiled from, as two
+                unsigned 64-bit integers
+    strings     (number of strings + 1) unsigned 32-bit offsets into the string data
+    courses     one (code, name, first section, number of sections) record per
+                course, sorted by course code; code and name are string numbers
+    sections    one (name, semester, first timeslot, number of timeslots) record
+                per section
+    timeslots   one (day, start minute, end minute) record per timeslot
+    string data the UTF-8 encoded strings, back to back
+
+Courses are built straight from the records of the memory-mapped file (see
+a0_decode), without going through their JSON format.
+"""
+from __future__ import annotations
+from bisect import bisect_left
+from collections.abc import Iterator, Mapping
+import json
+import mmap
+import os
+import struct
+from typing import NamedTuple
+
+from a0_contracts import check_contracts
+
+from a0_decode import CourseRecord, SectionRecord
+from a0_part3 import Course
+
+MAGIC = b'A0CAT\x00\x02\x00'
+
+_HEADER = struct.Struct('<8s4I2Q')
+_OFFSET = struct.Struct('<I')
+_COURSE = struct.Struct('<4I')
+_SECTION = struct.Struct('<4I')
+_TIMESLOT = struct.Struct('<BHH')
+
+# The number of milliseconds in one minute, used to convert to and from 'millisofday'.
+MILLIS_PER_MINUTE = 60 * 1000
+
+
+def compile_catalog(source: str, target: str) -> None:
+    """Compile the course catalog JSON file <source> into the binary file <target>.
+
+    If <source> contains more than one course with the same code, the last one is
+    kept, just like load_courses_data. The size and modification time of <source> are
+    recorded in <target>, so that load_compiled_catalog can tell when it is stale.
+
+    Preconditions:
+        - source is a valid JSON file in the same format as for load_courses_data
+    """
+    with open(source) as f:
+        raw_courses_data = {course_data['code']: course_data for course_data in json.load(f)}
+
+    strings: dict[str, int] = {}
+    course_table: list[tuple[int, int, int, int]] = []
+    section_table: list[tuple[int, int, int, int]] = []
+    timeslot_table: list[tuple[int, int, int]] = []
+
+    for code in sorted(raw_courses_data):
+        raw_course_data = raw_courses_data[code]
+        course_table.append((_intern(strings, code), _intern(strings, raw_course_data['name']),
+                             len(section_table), len(raw_course_data['sections'])))
+
+        for raw_section_data in raw_course_data['sections']:
+            section_table.append((_intern(strings, raw_section_data['name']),
+                                  _intern(strings, raw_section_data['deliveryModes'][0]['session']),
+                                  len(timeslot_table), len(raw_section_data['meetingTimes'])))
+
+            for meeting in raw_section_data['meetingTimes']:
+                timeslot_table.append((meeting['start']['day'],
+                                       meeting['start']['millisofday'] // MILLIS_PER_MINUTE,
+                                       meeting['end']['millisofday'] // MILLIS_PER_MINUTE))
+
+    encoded = [string.encode('utf-8') for string in strings]
+    offsets = [0]
+    for data in encoded:
+        offsets.append(offsets[-1] + len(data))
+
+    with open(target, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, len(encoded), len(course_table), len(section_table),
+                             len(timeslot_table), *_source_stat(source)))
+        f.write(b''.join(_OFFSET.pack(offset) for offset in offsets))
+        f.write(b''.join(_COURSE.pack(*record) for record in course_table))
+        f.write(b''.join(_SECTION.pack(*record) for record in section_table))
+        f.write(b''.join(_TIMESLOT.pack(*record) for record in timeslot_table))
+        f.write(b''.join(encoded))
+
+
+def _source_stat(source: str) -> tuple[int, int]:
+    """Return the size and modification time (in nanoseconds) of the file <source>."""
+    stat = os.stat(source)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _intern(strings: dict[str, int], string: str) -> int:
+    """Return the string number of <string>, adding it to <strings> if it is new."""
+    if string not in strings:
+        strings[string] = len(strings)
+    return strings[string]
+
+
+class _Layout(NamedTuple):
+    """The byte offsets of the tables of a compiled catalog file.
+
+    Instance Attributes:
+        - strings: the byte offset of the string offset table
+        - courses: the byte offset of the course table
+        - sections: the byte offset of the section table
+        - timeslots: the byte offset of the timeslot table
+        - data: the byte offset of the string data
+    """
+    strings: int
+    courses: int
+    sections: int
+    timeslots: int
+    data: int
+
+
+def load_compiled_catalog(file: str, source: str | None = None) -> CompiledCatalog:
+    """Return a CompiledCatalog for the binary file <file> created by compile_catalog.
+
+    Only the header of the file is read here; the rest of the file is memory-mapped
+    and decoded when courses are looked up.
+
+    Raise ValueError if <file> was not created by (this version of) compile_catalog, or
+    is truncated. If <source> is not None, also raise ValueError if <file> is stale:
+    if it was not compiled from the current version of the JSON file <source>.
+    """
+    catalog = CompiledCatalog(file)
+    if source is not None and catalog.source_stat() != _source_stat(source):
+        catalog.close()
+        raise ValueError(f'{file} is stale: {source} has changed since it was compiled')
+    return catalog
+
+
+@check_contracts
+class CompiledCatalog(Mapping):
+    """A read-only mapping from course codes to Courses, backed by a compiled catalog file.
+
+    A Course (with its Sections and Timeslots) is built from the memory-mapped file the
+    first time its code is looked up, and is then cached, so a CompiledCatalog can be
+    used wherever the result of load_courses_data is expected.
+
+    Private Instance Attributes:
+        - _mmap: the memory-mapped catalog file
+        - _buffer: a memoryview of _mmap
+        - _num_courses: the number of courses in the catalog
+        - _layout: the byte offsets of the tables of the file
+        - _cache: the courses that have been built so far, by position in the course table
+
+    Representation Invariants:
+        - self._num_courses >= 0
+        - all(0 <= i < self._num_courses for i in self._cache)
+    """
+    _mmap: mmap.mmap
+    _buffer: memoryview
+    _num_courses: int
+    _layout: _Layout
+    _cache: dict[int, Course]
+
+    def __init__(self, file: str) -> None:
+        """Memory-map the compiled catalog <file>.
+
+        Raise ValueError if <file> was not created by (this version of) compile_catalog,
+        or is truncated.
+        """
+        with open(file, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+
+        if len(self._buffer) < _HEADER.size:
+            self.close()
+            raise ValueError(f'{file} is not a compiled catalog')
+        magic, num_strings, num_courses, num_sections, num_timeslots = \
+            _HEADER.unpack_from(self._buffer, 0)[:5]
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f'{file} is not a compiled catalog (or was compiled by an '
+                             f'older version)')
+
+        self._num_courses = num_courses
+        courses_start = _HEADER.size + (num_strings + 1) * _OFFSET.size
+        sections_start = courses_start + num_courses * _COURSE.size
+        timeslots_start = sections_start + num_sections * _SECTION.size
+        self._layout = _Layout(_HEADER.size, courses_start, sections_start, timeslots_start,
+                               timeslots_start + num_timeslots * _TIMESLOT.size)
+        self._cache = {}
+
+        if len(self._buffer) < self._layout.data or len(self._buffer) != self._layout.data \
+                + _OFFSET.unpack_from(self._buffer, courses_start - _OFFSET.size)[0]:
+            self.close()
+            raise ValueError(f'{file} is truncated or corrupt')
+
+    def source_stat(self) -> tuple[int, int]:
+        """Return the size and modification time (in nanoseconds) of the JSON file this
+        catalog was compiled from, when it was compiled."""
+        return _HEADER.unpack_from(self._buffer, 0)[-2:]
+
+    def close(self) -> None:
+        """Release the memory-mapped file. Courses that were already built remain usable."""
+        self._buffer.release()
+        self._mmap.close()
+
+    def __enter__(self) -> CompiledCatalog:
+        """Return this catalog, to be closed at the end of a with statement."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close this catalog."""
+        self.close()
+
+    def __len__(self) -> int:
+        """Return the number of courses in this catalog."""
+        return self._num_courses
+
+    def __iter__(self) -> Iterator[str]:
+        """Yield the course codes in this catalog, in sorted order."""
+        for i in range(self._num_courses):
+            yield self._course_code(i)
+        return None
+
+    def __contains__(self, code: object) -> bool:
+        """Return whether this catalog has a course with the given code, without building
+        the course."""
+        return isinstance(code, str) and self._find(code) is not None
+
+    def __getitem__(self, code: str) -> Course:
+        """Return the course with the given code.
+
+        Raise KeyError if there is no such course.
+        """
+        i = self._find(code)
+        if i is None:
+            raise KeyError(code)
+
+        if i not in self._cache:
+            self._cache[i] = Course(self.course_record(i))
+        return self._cache[i]
+
+    def _find(self, code: str) -> int | None:
+        """Return the position of the course with the given code in the course table, or
+        None if there is no such course.
+
+        Course codes are found by binary search over the (sorted) course table, so no
+        index has to be built when the catalog is loaded.
+        """
+        i = bisect_left(range(self._num_courses), code, key=self._course_code)
+        if i == self._num_courses or self._course_code(i) != code:
+            return None
+        return i
+
+    def _string(self, number: int) -> str:
+        """Return the string with the given string number."""
+        start, end = struct.unpack_from('<2I', self._buffer,
+                                        self._layout.strings + number * _OFFSET.size)
+        return str(self._buffer[self._layout.data + start:self._layout.data + end], 'utf-8')
+
+    def _course_code(self, i: int) -> str:
+        """Return the code of the course at position <i> of the course table."""
+        code = _COURSE.unpack_from(self._buffer, self._layout.courses + i * _COURSE.size)[0]
+        return self._string(code)
+
+    def course_record(self, i: int) -> CourseRecord:
+        """Return the record (see a0_decode) of the course at position <i> of the course
+        table (its position in the iteration order of this catalog).
+
+        Preconditions:
+            - 0 <= i < len(self)
+        """
+        code, name, first_section, num_sections = \
+            _COURSE.unpack_from(self._buffer, self._layout.courses + i * _COURSE.size)
+        return CourseRecord(self._string(name), self._string(code),
+                            [self._section_record(j)
+                             for j in range(first_section, first_section + num_sections)])
+
+    def _section_record(self, j: int) -> SectionRecord:
+        """Return the record of the section at position <j> of the section table."""
+        name, semester, first_timeslot, num_timeslots = \
+            _SECTION.unpack_from(self._buffer, self._layout.sections + j * _SECTION.size)
+        meetings = tuple((day, start * MILLIS_PER_MINUTE, end * MILLIS_PER_MINUTE)
+                         for day, start, end in _TIMESLOT.iter_unpack(
+                             self._buffer[self._layout.timeslots + first_timeslot * _TIMESLOT.size:
+                                          self._layout.timeslots
+                                          + (first_timeslot + num_timeslots) * _TIMESLOT.size]))
+        return SectionRecord(self._string(name), self._string(semester), meetings)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
+
+    import python_ta
+
+    python_ta.check_all(config={
+        'allowed-io': ['compile_catalog', 'CompiledCatalog.__init__'],
+        'max-line-length': 100,
+        'extra-imports': ['bisect', 'collections.abc', 'json', 'mmap', 'os', 'struct', 'typing',
+                          'a0_contracts', 'a0_decode', 'a0_part3'],
+    })
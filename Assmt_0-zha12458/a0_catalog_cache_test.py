@@ -0,0 +1,92 @@
+"""CSC148 Assignment 0 - Object-Oriented Modelling, Compiled Catalog Cache (Tests)
+
+=== Module Description ===
+
+This file contains tests that compile a small synthetic catalog, and compare the
+courses of the compiled catalog with those of load_courses_data.
+"""
+import os
+
+import pytest
+
+from a0_benchmark import write_catalog
+from a0_catalog_cache import compile_catalog, load_compiled_catalog
+from a0_part3 import Course
+from a0_part4 import load_courses_data
+
+
+@pytest.fixture
+def files(tmp_path: str) -> tuple[str, str]:
+    """The JSON file of a catalog of 12 synthetic courses, and its compiled file."""
+    source = os.path.join(tmp_path, 'courses.json')
+    target = os.path.join(tmp_path, 'courses.bin')
+    write_catalog(source, 12, seed=148)
+    compile_catalog(source, target)
+    return source, target
+
+
+def test_round_trip(files: tuple[str, str]) -> None:
+    """Test that the compiled catalog has the same courses as load_courses_data, in
+    sorted order of course code."""
+    source, target = files
+    expected = load_courses_data(source)
+    with load_compiled_catalog(target, source) as catalog:
+        assert list(catalog) == sorted(expected)
+        for code, course in expected.items():
+            assert catalog[code].to_record() == course.to_record()
+
+
+def test_lookup(files: tuple[str, str]) -> None:
+    """Test that courses are looked up by code, built once, and that unknown codes are
+    not found."""
+    _, target = files
+    with load_compiled_catalog(target) as catalog:
+        codes = list(catalog)
+        assert len(catalog) == len(codes) == 12
+        for code in [codes[0], codes[7], codes[-1]]:
+            assert isinstance(catalog[code], Course)
+            assert catalog[code] is catalog[code]
+            assert catalog[code].code == code
+        for code in ['', 'AAA000H1', codes[0] + 'X', 'ZZZ999H9']:
+            assert code not in catalog
+            with pytest.raises(KeyError):
+                _ = catalog[code]
+
+
+def test_contains_builds_nothing(files: tuple[str, str]) -> None:
+    """Test that testing for a course code does not build the course."""
+    _, target = files
+    with load_compiled_catalog(target) as catalog:
+        codes = list(catalog)
+        assert all(code in catalog for code in codes)
+        assert 148 not in catalog
+        assert catalog._cache == {}
+
+
+def test_stale(files: tuple[str, str]) -> None:
+    """Test that a compiled catalog is rejected once its JSON file has changed."""
+    source, target = files
+    write_catalog(source, 13, seed=148)
+    with pytest.raises(ValueError):
+        load_compiled_catalog(target, source)
+    load_compiled_catalog(target).close()
+
+
+@pytest.mark.parametrize('damage', ['not a catalog', 'truncated', 'older version'])
+def test_corrupt(files: tuple[str, str], damage: str) -> None:
+    """Test that files that are not complete compiled catalogs are rejected."""
+    source, target = files
+    with open(target, 'rb') as f:
+        data = f.read()
+
+    if damage == 'not a catalog':
+        os.replace(source, target)
+    else:
+        with open(target, 'wb') as f:
+            f.write(data[:-1] if damage == 'truncated' else data[:6] + b'\x01' + data[7:])
+    with pytest.raises(ValueError):
+        load_compiled_catalog(target)
+
+
+if __name__ == '__main__':
+    pytest.main(['a0_catalog_cache_test.py', '-v'])
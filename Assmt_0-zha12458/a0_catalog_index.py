@@ -0,0 +1,326 @@
+"""CSC148 Assignment 0 - Object-Oriented Modelling, Catalog Time Index
+
+=== Module Description ===
+
+This file contains SectionIndex, an inverted index over every section of a
+course catalog that answers "which sections meet only inside this time window?"
+and "which sections do not conflict with this timetable?" without looking at
+every section.
+
+Each day is split into time buckets (30 minutes long by default). For every
+(semester, day, bucket), the index stores the set of sections that meet during
+that bucket, as a bitset (a Python int whose bit i is set for section number i),
+together with the unions of all earlier and all later buckets of the day. A query
+combines a handful of these bitsets, and only the sections that meet during a
+bucket that is partly inside and partly outside the query window are checked
+exactly against their timeslots.
+"""
+from __future__ import annotations
+from datetime import time
+from typing import Iterable
+
+from a0_contracts import check_contracts
+
+from a0_part1 import MINUTES_PER_DAY, Timeslot, minute_of_day
+from a0_part2 import Section, union_mask
+from a0_part3 import Course
+from a0_part4 import Timetable
+
+# The default length of a time bucket, in minutes.
+DEFAULT_BUCKET_MINUTES = 30
+
+DAYS = (1, 2, 3, 4, 5)
+
+
+@check_contracts
+class SectionIndex:
+    """An index of the sections of a course catalog by semester, day and time of day.
+
+    Instance Attributes:
+        - bucket_minutes: the length of a time bucket, in minutes
+        - num_buckets: the number of time buckets in a day
+
+    Private Instance Attributes:
+        - _entries: the (course, section) pair of each section number, or None for the
+            numbers of sections that were removed
+        - _free_numbers: the section numbers whose entry is None, reused by add_course
+        - _course_numbers: maps the code of each course in this index to the section
+            numbers of its sections
+        - _semester_bits: maps each semester code to the bitset of its sections
+        - _day_bits: maps (semester code, day) to three lists of bitsets (buckets, before,
+            after): buckets[b] is the bitset of the sections meeting during bucket b of
+            that day, before[b] the union of buckets 0 to b - 1, and after[b] the union of
+            buckets b to num_buckets - 1
+
+    The sections of a course added with add_course reuse the numbers of removed sections
+    first, so the bitsets stay as long as the largest number of sections indexed at once.
+
+    Representation Invariants:
+        - self.bucket_minutes > 0
+        - self.num_buckets * self.bucket_minutes >= MINUTES_PER_DAY
+        - all(len(bits[0]) == self.num_buckets for bits in self._day_bits.values())
+        - all(len(bits[1]) == self.num_buckets + 1 for bits in self._day_bits.values())
+        - all(len(bits[2]) == self.num_buckets + 1 for bits in self._day_bits.values())
+        - all(self._entries[number] is None for number in self._free_numbers)
+    """
+    bucket_minutes: int
+    num_buckets: int
+    _entries: list[tuple[Course, Section] | None]
+    _free_numbers: list[int]
+    _course_numbers: dict[str, list[int]]
+    _semester_bits: dict[str, int]
+    _day_bits: dict[tuple[str, int], tuple[list[int], list[int], list[int]]]
+
+    def __init__(self, courses: Iterable[Course],
+                 bucket_minutes: int = DEFAULT_BUCKET_MINUTES) -> None:
+        """Initialize an index of every section of <courses>.
+
+        <courses> can be, e.g., the values of the dictionary returned by load_courses_data.
+
+        Preconditions:
+            - bucket_minutes > 0
+            - no two courses in <courses> have the same code
+        """
+        self.bucket_minutes = bucket_minutes
+        self.num_buckets = -(-MINUTES_PER_DAY // bucket_minutes)
+        self._entries = []
+        self._free_numbers = []
+        self._course_numbers = {}
+        self._semester_bits = {}
+        self._day_bits = {}
+
+        for course in courses:
+            self._add_sections(course)
+
+        for buckets, before, after in self._day_bits.values():
+            for b in range(self.num_buckets):
+                before[b + 1] = before[b] | buckets[b]
+                after[self.num_buckets - 1 - b] = after[self.num_buckets - b] \
+                    | buckets[self.num_buckets - 1 - b]
+
+    def __len__(self) -> int:
+        """Return the number of sections in this index."""
+        return sum(len(numbers) for numbers in self._course_numbers.values())
+
+    def __contains__(self, course_code: object) -> bool:
+        """Return whether this index has the sections of the course with <course_code>."""
+        return course_code in self._course_numbers
+
+    def add_course(self, course: Course) -> None:
+        """Add every section of <course> to this index.
+
+        Preconditions:
+            - course.code not in self
+        """
+        for key, timeslot_buckets, bit in self._add_sections(course):
+            _, before, after = self._day_bits[key]
+            for b in range(timeslot_buckets.start + 1, self.num_buckets + 1):
+                before[b] |= bit
+            for b in range(timeslot_buckets.stop):
+                after[b] |= bit
+
+    def remove_course(self, course_code: str) -> bool:
+        """Remove every section of the course with <course_code> from this index.
+
+        Return whether that course was in this index.
+        """
+        if course_code not in self._course_numbers:
+            return False
+
+        for number in self._course_numbers.pop(course_code):
+            section = self._entry(number)[1]
+            self._entries[number] = None
+            self._free_numbers.append(number)
+            bit = 1 << number
+            semester = section.semester_code
+            self._semester_bits[semester] &= ~bit
+
+            for timeslot in section.timeslots:
+                buckets, before, after = self._day_bits[(semester, timeslot.day)]
+                timeslot_buckets = _timeslot_buckets(timeslot, self.bucket_minutes)
+                for b in timeslot_buckets:
+                    buckets[b] &= ~bit
+                for b in range(timeslot_buckets.start + 1, self.num_buckets + 1):
+                    before[b] &= ~bit
+                for b in range(timeslot_buckets.stop):
+                    after[b] &= ~bit
+
+        return True
+
+    def _add_sections(self, course: Course) -> list[tuple[tuple[str, int], range, int]]:
+        """Give a section number to every section of <course> and add it to the bitsets of
+        its semester and of the buckets it meets during, but not to the unions of buckets.
+
+        Return a (key of self._day_bits, buckets, bit) triple for each timeslot of the
+        sections, for updating those unions.
+        """
+        numbers = self._course_numbers[course.code] = []
+        res = []
+        for section in course.sections:
+            if self._free_numbers:
+                number = self._free_numbers.pop()
+                self._entries[number] = (course, section)
+            else:
+                number = len(self._entries)
+                self._entries.append((course, section))
+            numbers.append(number)
+            bit = 1 << number
+            semester = section.semester_code
+            self._semester_bits[semester] = self._semester_bits.get(semester, 0) | bit
+
+            for timeslot in section.timeslots:
+                key = (semester, timeslot.day)
+                if key not in self._day_bits:
+                    self._day_bits[key] = ([0] * self.num_buckets,
+                                           [0] * (self.num_buckets + 1),
+                                           [0] * (self.num_buckets + 1))
+                timeslot_buckets = _timeslot_buckets(timeslot, self.bucket_minutes)
+                for b in timeslot_buckets:
+                    self._day_bits[key][0][b] |= bit
+                res.append((key, timeslot_buckets, bit))
+        return res
+
+    def find_within(self, semester_code: str, days: Iterable[int], start: time,
+                    end: time) -> list[tuple[Course, Section]]:
+        """Return the (course, section) pairs of the sections in <semester_code> whose
+        timeslots are all on one of <days>, between <start> and <end>.
+
+        The pairs are returned in the order of their section numbers, which is the order
+        their courses and sections were indexed if no course was removed.
+
+        >>> index = SectionIndex([])
+        >>> index.find_within('20239', [2, 4], time(10), time(14))
+        []
+        """
+        days = set(days)
+        window_start, window_end = minute_of_day(start), minute_of_day(end)
+
+        outside = 0
+        boundary = 0
+        for day in DAYS:
+            if (semester_code, day) not in self._day_bits:
+                continue
+            buckets, before, after = self._day_bits[(semester_code, day)]
+            if day not in days or window_start >= window_end:
+                outside |= after[0]
+                continue
+
+            # Every section meeting during a bucket completely before or after the window
+            # meets outside of it.
+            outside |= before[window_start // self.bucket_minutes]
+            outside |= after[min(-(-window_end // self.bucket_minutes), self.num_buckets)]
+            for b in _partial_buckets(window_start, window_end, self.bucket_minutes):
+                boundary |= buckets[b]
+
+        candidates = self._semester_bits.get(semester_code, 0) & ~outside
+        return [self._entry(i) for i in _bit_positions(candidates)
+                if not (boundary >> i) & 1 or all(
+                    window_start <= minute_of_day(timeslot.start)
+                    and minute_of_day(timeslot.end) <= window_end
+                    for timeslot in self._entry(i)[1].timeslots)]
+
+    def find_not_conflicting(self, semester_code: str,
+                             timeslots: list[Timeslot]) -> list[tuple[Course, Section]]:
+        """Return the (course, section) pairs of the sections in <semester_code> that do
+        not conflict with any of <timeslots>.
+
+        The pairs are returned in the order of their section numbers, which is the order
+        their courses and sections were indexed if no course was removed.
+        """
+        busy_mask = union_mask(timeslots)
+        conflicting = 0
+        boundary = 0
+
+        for timeslot in timeslots:
+            key = (semester_code, timeslot.day)
+            if key not in self._day_bits:
+                continue
+            buckets = self._day_bits[key][0]
+            busy_start, busy_end = minute_of_day(timeslot.start), minute_of_day(timeslot.end)
+
+            # Every section meeting during a bucket that is completely busy conflicts.
+            for b in range(-(-busy_start // self.bucket_minutes),
+                           busy_end // self.bucket_minutes):
+                conflicting |= buckets[b]
+            for b in _partial_buckets(busy_start, busy_end, self.bucket_minutes):
+                boundary |= buckets[b]
+
+        candidates = self._semester_bits.get(semester_code, 0) & ~conflicting
+        return [self._entry(i) for i in _bit_positions(candidates)
+                if not (boundary >> i) & 1 or not self._entry(i)[1].mask & busy_mask]
+
+    def find_compatible(self, timetable: Timetable) -> list[tuple[Course, Section]]:
+        """Return the (course, section) pairs of the sections in the semester of
+        <timetable> that do not conflict with any section of <timetable>.
+        """
+        timeslots = [timeslot for section in timetable.get_all_sections()
+                     for timeslot in section.timeslots]
+        return self.find_not_conflicting(timetable.semester_code, timeslots)
+
+    def _entry(self, number: int) -> tuple[Course, Section]:
+        """Return the (course, section) pair of the section number <number>.
+
+        Preconditions:
+            - self._entries[number] is not None
+        """
+        entry = self._entries[number]
+        assert entry is not None
+        return entry
+
+
+def _timeslot_buckets(timeslot: Timeslot, bucket_minutes: int) -> range:
+    """Return the buckets of length <bucket_minutes> during which <timeslot> meets.
+
+    >>> _timeslot_buckets(Timeslot(1, time(9, 10), time(10)), 30)
+    range(18, 20)
+    """
+    return range(minute_of_day(timeslot.start) // bucket_minutes,
+                 (minute_of_day(timeslot.end) - 1) // bucket_minutes + 1)
+
+
+def _partial_buckets(start: int, end: int, bucket_minutes: int) -> set[int]:
+    """Return the buckets of length <bucket_minutes> that are partly, but not completely,
+    inside the interval from minute <start> to minute <end> of a day.
+
+    >>> sorted(_partial_buckets(70, 130, 30))
+    [2, 4]
+    >>> _partial_buckets(60, 120, 30)
+    set()
+    """
+    res = set()
+    if start % bucket_minutes:
+        res.add(start // bucket_minutes)
+    if end % bucket_minutes:
+        res.add(end // bucket_minutes)
+    return res
+
+
+def _bit_positions(bits: int) -> list[int]:
+    """Return the positions of the bits that are set in <bits>, in increasing order.
+
+    The binary digits are scanned with str.find, which takes one fast pass over the digits
+    plus one step per set bit, instead of one big-int operation per set bit.
+
+    >>> _bit_positions(0b10110)
+    [1, 2, 4]
+    """
+    digits = bin(bits)[:1:-1]
+    res = []
+    i = digits.find('1')
+    while i != -1:
+        res.append(i)
+        i = digits.find('1', i + 1)
+    return res
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
+
+    import python_ta
+
+    python_ta.check_all(config={
+        'max-line-length': 100,
+        'extra-imports': ['datetime', 'typing', 'a0_contracts', 'a0_part1', 'a0_part2',
+                          'a0_part3', 'a0_part4'],
+    })
@@ -0,0 +1,84 @@
+"""CSC148 Assignment 0 - Object-Oriented Modelling, Catalog Time Index (Tests)
+
+=== Module Description ===
+
+This file contains tests that compare the answers of SectionIndex with a direct
+check of every section, on a small synthetic catalog.
+"""
+from datetime import time
+import random
+
+import pytest
+
+from a0_benchmark import generate_courses
+from a0_catalog_index import SectionIndex
+from a0_part1 import Timeslot
+from a0_part3 import Course
+
+
+@pytest.fixture(scope='module')
+def courses() -> list[Course]:
+    """A small synthetic catalog."""
+    return [Course(raw_course_data) for raw_course_data in generate_courses(20, seed=148)]
+
+
+@pytest.mark.parametrize('bucket_minutes', [7, 30, 60])
+def test_find_within(courses: list[Course], bucket_minutes: int) -> None:
+    """Test find_within against every section, for windows that do and do not start or
+    end on a bucket boundary."""
+    index = SectionIndex(courses, bucket_minutes)
+    pairs = [(course, section) for course in courses for section in course.sections]
+
+    for days, start, end in [({1, 2, 3, 4, 5}, time(9), time(21)), ({2, 4}, time(10), time(14)),
+                             ({1, 3, 5}, time(9, 10), time(15, 50)), ({4}, time(12), time(12))]:
+        expected = [(course, section) for course, section in pairs
+                    if section.semester_code == '20239'
+                    and all(t.day in days and start <= t.start and t.end <= end
+                            for t in section.timeslots)]
+        assert index.find_within('20239', days, start, end) == expected
+
+
+@pytest.mark.parametrize('bucket_minutes', [7, 30, 60])
+def test_find_not_conflicting(courses: list[Course], bucket_minutes: int) -> None:
+    """Test find_not_conflicting against every section, for random busy timeslots."""
+    index = SectionIndex(courses, bucket_minutes)
+    pairs = [(course, section) for course in courses for section in course.sections]
+    rng = random.Random(0)
+
+    for _ in range(3):
+        busy = []
+        for _ in range(3):
+            hour, minute = rng.randint(9, 19), rng.choice([0, 10, 30, 45])
+            busy.append(Timeslot(rng.randint(1, 5), time(hour, minute), time(hour + 1, minute)))
+        expected = [(course, section) for course, section in pairs
+                    if section.semester_code == '20241'
+                    and all(t.day != b.day or t.end <= b.start or b.end <= t.start
+                            for t in section.timeslots for b in busy)]
+        assert index.find_not_conflicting('20241', busy) == expected
+
+
+def test_remove_and_add_course(courses: list[Course]) -> None:
+    """Test that removing and adding back courses gives the same answers as a new index,
+    and that the numbers of removed sections are reused."""
+    index = SectionIndex(courses)
+    num_entries = len(index._entries)
+    for _ in range(3):
+        for course in courses[:5]:
+            assert index.remove_course(course.code)
+        assert not index.remove_course(courses[0].code)
+        for course in courses[:5]:
+            index.add_course(course)
+    assert len(index._entries) == num_entries
+    assert len(index) == len(SectionIndex(courses))
+
+    expected = SectionIndex(courses)
+    busy = [Timeslot(2, time(11), time(13))]
+    for semester in ('20239', '20241'):
+        assert set(index.find_within(semester, range(1, 6), time(10), time(16))) \
+            == set(expected.find_within(semester, range(1, 6), time(10), time(16)))
+        assert set(index.find_not_conflicting(semester, busy)) \
+            == set(expected.find_not_conflicting(semester, busy))
+
+
+if __name__ == '__main__':
+    pytest.main(['a0_catalog_index_test.py', '-v'])
@@ -0,0 +1,253 @@
+"""CSC148 Assignment 0 - Object-Oriented Modelling, Columnar Catalog
+
+=== Module Description ===
+
+This file contains ColumnarCatalog, an in-memory representation of a whole
+course catalog that stores every timeslot in parallel typed arrays instead of
+as Timeslot objects:
+
+    courses     the code and name of each course, and the number of its first
+                section (course i has sections course_offsets[i] to
+                course_offsets[i + 1] - 1)
+    sections    the section code and semester of each section (as numbers in a
+                shared table of strings), and the number of its first timeslot
+                (section j has timeslots timeslot_offsets[j] to
+                timeslot_offsets[j + 1] - 1)
+    timeslots   the day, start minute and end minute of each timeslot
+
+A meeting time takes 5 bytes, and a section 12 bytes plus its share of the
+string table, instead of several hundred bytes of Python objects.
+
+ColumnarCatalog is a mapping from course codes to Courses, like the dictionary
+returned by load_courses_data, so existing code keeps working: each Course is a
+thin view built from the arrays when it is first looked up, and its Sections
+are only built when they are needed (see Course). Bulk scans over every section,
+such as find_within, instead run over the arrays directly, with NumPy.
+"""
+from __future__ import annotations
+from array import array
+from collections.abc import Iterable, Iterator, Mapping
+from datetime import time
+from typing import NamedTuple
+
+import numpy as np
+
+from a0_contracts import check_contracts
+
+from a0_catalog_cache import MILLIS_PER_MINUTE
+from a0_decode import CourseRecord, SectionRecord, load_course_records
+from a0_part1 import minute_of_day
+from a0_part3 import Course
+
+
+def load_columnar_catalog(file: str) -> ColumnarCatalog:
+    """Return a ColumnarCatalog of the courses in <file>.
+
+    If <file> contains more than one course with the same code, the last one is kept,
+    just like load_courses_data.
+
+    Preconditions:
+        - file is a valid JSON file in the same format as for load_courses_data
+    """
+    return ColumnarCatalog(load_course_records(file))
+
+
+class _CourseColumns(NamedTuple):
+    """The columns of the courses of a ColumnarCatalog.
+
+    Instance Attributes:
+        - codes: the code of each course
+        - names: the name of each course
+        - section_offsets: the number of the first section of each course, followed by
+            the total number of sections
+    """
+    codes: list[str]
+    names: list[str]
+    section_offsets: array
+
+
+class _SectionColumns(NamedTuple):
+    """The columns of the sections of a ColumnarCatalog.
+
+    Instance Attributes:
+        - codes: the number in the string table of the code of each section
+        - semesters: the number in the string table of the semester code of each section
+        - timeslot_offsets: the number of the first timeslot of each section, followed
+            by the total number of timeslots
+    """
+    codes: array
+    semesters: array
+    timeslot_offsets: array
+
+
+class _TimeslotColumns(NamedTuple):
+    """The columns of the timeslots of a ColumnarCatalog.
+
+    Instance Attributes:
+        - days: the day of each timeslot
+        - starts: the start minute of the day of each timeslot
+        - ends: the end minute of the day of each timeslot
+    """
+    days: array
+    starts: array
+    ends: array
+
+
+@check_contracts
+class ColumnarCatalog(Mapping):
+    """A course catalog whose timeslots are stored in parallel typed arrays.
+
+    Private Instance Attributes:
+        - _courses: the columns of the courses
+        - _positions: maps each course code to its course number
+        - _strings: the section codes and semester codes of the sections
+        - _string_numbers: maps each string of _strings to its number in _strings
+        - _sections: the columns of the sections
+        - _timeslots: the columns of the timeslots
+        - _cache: the courses that have been built so far, by course number
+
+    Representation Invariants:
+        - len(self._courses.names) == len(self._courses.codes) == len(self._positions)
+        - len(self._string_numbers) == len(self._strings)
+        - len(self._courses.section_offsets) == len(self._courses.codes) + 1
+        - len(self._sections.codes) == len(self._sections.semesters) \
+            == self._courses.section_offsets[-1]
+        - len(self._sections.timeslot_offsets) == len(self._sections.codes) + 1
+        - len(self._timeslots.days) == len(self._timeslots.starts) \
+            == len(self._timeslots.ends) == self._sections.timeslot_offsets[-1]
+    """
+    _courses: _CourseColumns
+    _positions: dict[str, int]
+    _strings: list[str]
+    _string_numbers: dict[str, int]
+    _sections: _SectionColumns
+    _timeslots: _TimeslotColumns
+    _cache: dict[int, Course]
+
+    def __init__(self, records: Iterable[CourseRecord]) -> None:
+        """Initialize a catalog of the courses with the given records (see a0_decode).
+
+        If more than one record has the same course code, the last one is kept, in the
+        position of the first one, just like load_courses_data.
+        """
+        self._courses = _CourseColumns([], [], array('I', [0]))
+        self._positions = {}
+        self._string_numbers = {}
+        self._sections = _SectionColumns(array('I'), array('I'), array('I', [0]))
+        self._timeslots = _TimeslotColumns(array('B'), array('H'), array('H'))
+        self._cache = {}
+
+        for record in {course.code: course for course in records}.values():
+            self._positions[record.code] = len(self._courses.codes)
+            self._courses.codes.append(record.code)
+            self._courses.names.append(record.name)
+
+            for section in record.sections:
+                # Strings are numbered in the order they are first seen.
+                self._sections.codes.append(
+                    self._string_numbers.setdefault(section.name, len(self._string_numbers)))
+                self._sections.semesters.append(
+                    self._string_numbers.setdefault(section.session, len(self._string_numbers)))
+
+                for day, start_millis, end_millis in section.meetings:
+                    self._timeslots.days.append(day)
+                    self._timeslots.starts.append(start_millis // MILLIS_PER_MINUTE)
+                    self._timeslots.ends.append(end_millis // MILLIS_PER_MINUTE)
+                self._sections.timeslot_offsets.append(len(self._timeslots.days))
+
+            self._courses.section_offsets.append(len(self._sections.codes))
+
+        self._strings = list(self._string_numbers)
+
+    def __len__(self) -> int:
+        """Return the number of courses in this catalog."""
+        return len(self._courses.codes)
+
+    def __iter__(self) -> Iterator[str]:
+        """Yield the course codes in this catalog, in the order they were added."""
+        return iter(self._courses.codes)
+
+    def __contains__(self, code: object) -> bool:
+        """Return whether this catalog has a course with the given code."""
+        return code in self._positions
+
+    def __getitem__(self, code: str) -> Course:
+        """Return the course with the given code.
+
+        Raise KeyError if there is no such course.
+        """
+        i = self._positions[code]
+        if i not in self._cache:
+            self._cache[i] = Course(self.course_record(i))
+        return self._cache[i]
+
+    def course_record(self, i: int) -> CourseRecord:
+        """Return the record of the course with course number <i> (its position in the
+        iteration order of this catalog).
+
+        Preconditions:
+            - 0 <= i < len(self)
+        """
+        sections = []
+        for j in range(self._courses.section_offsets[i], self._courses.section_offsets[i + 1]):
+            meetings = tuple((self._timeslots.days[k],
+                              self._timeslots.starts[k] * MILLIS_PER_MINUTE,
+                              self._timeslots.ends[k] * MILLIS_PER_MINUTE)
+                             for k in range(self._sections.timeslot_offsets[j],
+                                            self._sections.timeslot_offsets[j + 1]))
+            sections.append(SectionRecord(self._strings[self._sections.codes[j]],
+                                          self._strings[self._sections.semesters[j]], meetings))
+        return CourseRecord(self._courses.names[i], self._courses.codes[i], sections)
+
+    def nbytes(self) -> int:
+        """Return the number of bytes taken by the arrays of this catalog."""
+        return sum(len(column) * column.itemsize
+                   for column in [self._courses.section_offsets, *self._sections,
+                                  *self._timeslots])
+
+    def find_within(self, semester_code: str, days: Iterable[int], start: time,
+                    end: time) -> list[tuple[str, str]]:
+        """Return the (course code, section code) pairs of the sections in <semester_code>
+        whose timeslots are all on one of <days>, between <start> and <end>.
+
+        The pairs are returned in the order of the courses and sections in this catalog.
+        This scans every timeslot of the catalog, as a handful of NumPy array operations,
+        and builds no Course or Section: the caller looks up the ones it needs.
+        """
+        if semester_code not in self._string_numbers:
+            return []
+
+        # np.frombuffer shares the memory of the arrays, rather than copying them.
+        day_column, start_column, end_column = (np.frombuffer(column, dtype=column.typecode)
+                                                for column in self._timeslots)
+        inside = (np.isin(day_column, np.fromiter(days, dtype=np.uint8))
+                  & (start_column >= minute_of_day(start))
+                  & (end_column <= minute_of_day(end)))
+
+        # The number of timeslots of each section that are not inside the window.
+        outside = np.concatenate(([0], np.cumsum(~inside)))
+        offsets = np.frombuffer(self._sections.timeslot_offsets, dtype=np.uint32)
+        matches = np.nonzero(
+            (outside[offsets[1:]] == outside[offsets[:-1]])
+            & (np.frombuffer(self._sections.semesters, dtype=np.uint32)
+               == self._string_numbers[semester_code]))[0]
+
+        course_numbers = np.searchsorted(
+            np.frombuffer(self._courses.section_offsets, dtype=np.uint32), matches,
+            side='right') - 1
+        return [(self._courses.codes[i], self._strings[self._sections.codes[j]])
+                for i, j in zip(course_numbers.tolist(), matches.tolist())]
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
+
+    import python_ta
+
+    python_ta.check_all(config={
+        'max-line-length': 100,
+        'extra-imports': ['array', 'collections.abc', 'datetime', 'typing', 'numpy',
+                          'a0_contracts', 'a0_catalog_cache', 'a0_decode', 'a0_part1',
+                          'a0_part3'],
+    })
@@ -0,0 +1,68 @@
+"""CSC148 Assignment 0 - Object-Oriented Modelling, Columnar Catalog (Tests)
+
+=== Module Description ===
+
+This file contains tests that compare a ColumnarCatalog with the Courses built
+directly from the same synthetic catalog.
+"""
+from datetime import time
+
+import pytest
+
+from a0_benchmark import generate_courses
+from a0_columnar import ColumnarCatalog
+from a0_decode import course_record
+from a0_part3 import Course
+
+
+@pytest.fixture
+def raw_courses_data() -> list[dict]:
+    """The raw data of a small synthetic catalog."""
+    return list(generate_courses(10, seed=148))
+
+
+def test_courses_match(raw_courses_data: list[dict]) -> None:
+    """Test that the courses of the catalog have the same sections as the originals."""
+    catalog = ColumnarCatalog(course_record(raw) for raw in raw_courses_data)
+    assert list(catalog) == [raw['code'] for raw in raw_courses_data]
+
+    for raw in raw_courses_data:
+        expected = Course(raw)
+        actual = catalog[raw['code']]
+        assert actual is catalog[raw['code']]
+        assert actual.name == expected.name
+        assert [(s.section_code, s.semester_code, s.timeslots) for s in actual.sections] \
+            == [(s.section_code, s.semester_code, s.timeslots) for s in expected.sections]
+
+
+def test_find_within(raw_courses_data: list[dict]) -> None:
+    """Test find_within against a direct check of every section."""
+    catalog = ColumnarCatalog(course_record(raw) for raw in raw_courses_data)
+    courses = [Course(raw) for raw in raw_courses_data]
+
+    for semester, days, start, end in [('20239', {1, 2, 3, 4, 5}, time(9), time(21)),
+                                       ('20241', {2, 4}, time(10), time(14)),
+                                       ('20239', {1, 3, 5}, time(9, 30), time(16)),
+                                       ('20199', {1}, time(9), time(21))]:
+        expected = [(course.code, section.section_code) for course in courses
+                    for section in course.sections
+                    if section.semester_code == semester
+                    and all(t.day in days and start <= t.start and t.end <= end
+                            for t in section.timeslots)]
+        assert catalog.find_within(semester, days, start, end) == expected
+    assert catalog._cache == {}
+
+
+def test_duplicate_code(raw_courses_data: list[dict]) -> None:
+    """Test that the last course with a duplicate code is kept, in the position of the
+    first one, just like load_courses_data."""
+    replacement = dict(raw_courses_data[1], code=raw_courses_data[0]['code'])
+    catalog = ColumnarCatalog(course_record(raw) for raw in raw_courses_data + [replacement])
+    assert list(catalog) == [raw['code'] for raw in raw_courses_data]
+    assert catalog[replacement['code']].name == replacement['name']
+    assert [s.section_code for s in catalog[replacement['code']].sections] \
+        == [s['name'] for s in replacement['sections']]
+
+
+if __name__ == '__main__':
+    pytest.main(['a0_columnar_test.py', '-v'])
@@ -0,0 +1,169 @@
+"""CSC148 Assignment 0 - Object-Oriented Modelling, Section Conflict Matrix
+
+=== Module Description ===
+
+This file contains functions that compute which sections conflict with which,
+for all of the sections of a semester at once.
+
+The timeslots of the sections are packed into NumPy arrays (owning section, day,
+start minute, end minute) and grouped by day and sorted by start time. Each
+timeslot is then compared only against the run of same-day timeslots that can
+overlap it. The conflict matrix is produced one block of rows at a time, so
+memory use is bounded by the block size, and the interval tests of a block are
+done with one set of NumPy array operations per day (there is no Python loop
+over the timeslots).
+"""
+from __future__ import annotations
+from typing import Iterator
+
+import numpy as np
+
+from a0_part1 import minute_of_day
+from a0_part2 import Section
+from a0_part3 import Course
+
+# The default number of rows of the conflict matrix computed at once.
+DEFAULT_BLOCK_SIZE = 1024
+
+
+def semester_sections(courses: dict[str, Course],
+                      semester_code: str) -> tuple[list[str], list[Section]]:
+    """Return every section of <courses> in <semester_code>, as two parallel lists: the
+    code of the course of each section, and the sections.
+
+    <courses> is a dictionary like the one returned by load_courses_data. The list of
+    sections can be passed as it is to conflict_matrix and conflict_lists, whose rows
+    are then in the same order as the course codes.
+    """
+    codes, sections = [], []
+    for code, course in courses.items():
+        for section in course.get_semester_sections(semester_code):
+            codes.append(code)
+            sections.append(section)
+    return codes, sections
+
+
+def conflict_matrix(sections: list[Section], block_size: int = DEFAULT_BLOCK_SIZE) -> np.ndarray:
+    """Return a boolean matrix whose entry [i, j] is sections[i].has_conflict(sections[j]).
+
+    Note that the matrix has len(sections) ** 2 entries; use conflict_lists for large
+    numbers of sections.
+
+    Preconditions:
+        - block_size > 0
+    """
+    matrix = np.zeros((len(sections), len(sections)), dtype=bool)
+    for first, block in _conflict_blocks(sections, block_size):
+        matrix[first:first + len(block)] = block
+    return matrix
+
+
+def conflict_lists(sections: list[Section],
+                   block_size: int = DEFAULT_BLOCK_SIZE) -> list[list[int]]:
+    """Return the positions of the sections that conflict with each section.
+
+    Element i of the result is the sorted list of every j != i such that
+    sections[i].has_conflict(sections[j]). Only block_size rows of the conflict
+    matrix are held in memory at once.
+
+    Preconditions:
+        - block_size > 0
+    """
+    res = []
+    for first, block in _conflict_blocks(sections, block_size):
+        block[np.arange(len(block)), np.arange(first, first + len(block))] = False
+        rows, cols = np.nonzero(block)
+        bounds = np.searchsorted(rows, np.arange(len(block) + 1))
+        res.extend(cols[bounds[i]:bounds[i + 1]].tolist() for i in range(len(block)))
+    return res
+
+
+def pack_timeslots(sections: list[Section]) -> tuple[np.ndarray, np.ndarray, np.ndarray,
+                                                     np.ndarray]:
+    """Return the timeslots of <sections> as four parallel arrays: the position of the
+    owning section in <sections>, the day, and the start and end minute of the day.
+
+    The timeslots are in the same order as <sections>, so the owner array is sorted.
+    """
+    owners, days, starts, ends = [], [], [], []
+    for i, section in enumerate(sections):
+        for timeslot in section.timeslots:
+            owners.append(i)
+            days.append(timeslot.day)
+            starts.append(minute_of_day(timeslot.start))
+            ends.append(minute_of_day(timeslot.end))
+
+    return (np.array(owners, dtype=np.int32), np.array(days, dtype=np.int8),
+            np.array(starts, dtype=np.int16), np.array(ends, dtype=np.int16))
+
+
+def _conflict_blocks(sections: list[Section],
+                     block_size: int) -> Iterator[tuple[int, np.ndarray]]:
+    """Yield (first, block) pairs that together make up the conflict matrix of <sections>.
+
+    Each block is a boolean array holding rows first to first + len(block) - 1 of the
+    conflict matrix, and has at most block_size rows.
+    """
+    owners, days, starts, ends = pack_timeslots(sections)
+    by_day = _timeslots_by_day(owners, days, starts, ends)
+
+    for first in range(0, len(sections), block_size):
+        block = np.zeros((min(block_size, len(sections) - first), len(sections)), dtype=bool)
+        lo, hi = np.searchsorted(owners, [first, first + block_size])
+        for day, day_timeslots in by_day.items():
+            on_day = lo + np.nonzero(days[lo:hi] == day)[0]
+            rows_and_owners = _overlaps(starts[on_day], ends[on_day], day_timeslots)
+            block[owners[on_day][rows_and_owners[0]] - first, rows_and_owners[1]] = True
+        yield first, block
+    return None
+
+
+def _timeslots_by_day(owners: np.ndarray, days: np.ndarray, starts: np.ndarray,
+                      ends: np.ndarray) -> dict[int, tuple[np.ndarray, np.ndarray, np.ndarray,
+                                                           int]]:
+    """Return a dictionary that maps each day of the packed timeslots (see pack_timeslots)
+    to the owners, start minutes and end minutes of the timeslots on that day, sorted by
+    start time, and the length of the longest of them."""
+    by_day = {}
+    for day in np.unique(days).tolist():
+        on_day = np.nonzero(days == day)[0]
+        order = on_day[np.argsort(starts[on_day], kind='stable')]
+        by_day[day] = (owners[order], starts[order], ends[order],
+                       int((ends[order] - starts[order]).max()))
+    return by_day
+
+
+def _overlaps(starts: np.ndarray, ends: np.ndarray,
+              day_timeslots: tuple[np.ndarray, np.ndarray, np.ndarray, int]
+              ) -> tuple[np.ndarray, np.ndarray]:
+    """Return the (row, owner) pairs of overlapping timeslots, as two parallel arrays:
+    for each timeslot <row> of the timeslots with <starts> and <ends>, and each timeslot
+    of a day (as returned by _timeslots_by_day) that overlaps it, the row and the owner
+    of the day's timeslot.
+    """
+    day_owners, day_starts, day_ends, longest = day_timeslots
+    # Only the timeslots of the day starting in (start - longest, end) can overlap a
+    # timeslot, and they form the run left to right - 1 of the day's timeslots.
+    left = np.searchsorted(day_starts, starts - longest, side='right')
+    right = np.searchsorted(day_starts, ends, side='left')
+    lengths = np.maximum(right - left, 0)
+
+    # Concatenate the runs: candidates[m] is the m-th day timeslot of all the runs, and
+    # rows[m] the timeslot whose run it belongs to.
+    rows = np.repeat(np.arange(len(starts)), lengths)
+    candidates = np.arange(lengths.sum()) + np.repeat(left - (np.cumsum(lengths) - lengths),
+                                                      lengths)
+    hits = day_ends[candidates] > starts[rows]
+    return rows[hits], day_owners[candidates[hits]]
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
+
+    import python_ta
+
+    python_ta.check_all(config={
+        'max-line-length': 100,
+        'extra-imports': ['typing', 'numpy', 'a0_part1', 'a0_part2', 'a0_part3'],
+    })
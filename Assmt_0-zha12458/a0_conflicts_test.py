@@ -0,0 +1,60 @@
+"""CSC148 Assignment 0 - Object-Oriented Modelling, Section Conflict Matrix (Tests)
+
+=== Module Description ===
+
+This file contains tests that compare conflict_matrix and conflict_lists with
+calling Section.has_conflict on every pair of sections of a semester of a small
+synthetic catalog.
+"""
+import pytest
+
+from a0_benchmark import generate_courses
+from a0_conflicts import conflict_lists, conflict_matrix, semester_sections
+from a0_part2 import Section
+from a0_part3 import Course
+
+
+@pytest.fixture(scope='module')
+def sections() -> list[Section]:
+    """The sections of 3 synthetic courses in 20239 (29 sections, with 33 conflicting pairs)."""
+    courses = {course.code: course
+               for course in (Course(raw) for raw in generate_courses(3, seed=148))}
+    codes, sections = semester_sections(courses, '20239')
+    assert [courses[code].lookup_section(section.section_code, '20239')
+            for code, section in zip(codes, sections)] == sections
+    return sections
+
+
+@pytest.fixture(scope='module')
+def expected(sections: list[Section]) -> list[list[bool]]:
+    """The result of has_conflict for every pair of <sections>."""
+    return [[first.has_conflict(second) for second in sections] for first in sections]
+
+
+@pytest.mark.parametrize('block_size', [1, 7, 1024])
+def test_conflict_matrix(sections: list[Section], expected: list[list[bool]],
+                         block_size: int) -> None:
+    """Test that conflict_matrix matches has_conflict, whether or not the matrix is split
+    into blocks."""
+    assert len(sections) > 7
+    assert conflict_matrix(sections, block_size).tolist() == expected
+
+
+@pytest.mark.parametrize('block_size', [1, 7, 1024])
+def test_conflict_lists(sections: list[Section], expected: list[list[bool]],
+                        block_size: int) -> None:
+    """Test that conflict_lists lists the other sections that each section conflicts
+    with."""
+    assert conflict_lists(sections, block_size) == [
+        [j for j, conflict in enumerate(row) if conflict and j != i]
+        for i, row in enumerate(expected)]
+
+
+def test_no_sections() -> None:
+    """Test the conflict matrix and lists of no sections."""
+    assert conflict_matrix([]).shape == (0, 0)
+    assert conflict_lists([]) == []
+
+
+if __name__ == '__main__':
+    pytest.main(['a0_conflicts_test.py', '-v'])
@@ -0,0 +1,151 @@
+"""CSC148 Assignment 0 - Object-Oriented Modelling, Contract Checking Switch
+
+=== Module Description ===
+
+This file contains the check_contracts decorator used by the classes in this
+assignment. It wraps python_ta's check_contracts so that contract checking can be
+turned off, or sampled, without changing the decorated classes.
+
+The mode is taken from the A0_CONTRACTS environment variable:
+
+    - 'on' (the default): check every call, exactly like python_ta's check_contracts
+    - 'off': do not check anything, and do not import python_ta at all
+    - a positive integer N: check one in every N calls of each method
+
+Alternatively, set SAMPLE_RATE in this module before importing any of the modules
+that use the decorator (0 means 'off', 1 means 'on' and N means one in every N).
+Classes are only decorated when their module is first imported, so changing
+SAMPLE_RATE afterwards has no effect on them.
+"""
+from __future__ import annotations
+import functools
+import importlib
+import inspect
+import itertools
+import os
+from typing import Any, Callable
+
+
+def _parse_sample_rate(mode: str) -> int:
+    """Return the sample rate described by the A0_CONTRACTS value <mode>.
+
+    Raise ValueError if <mode> is not 'on', 'off' or a positive integer.
+
+    >>> _parse_sample_rate('on')
+    1
+    >>> _parse_sample_rate('off')
+    0
+    >>> _parse_sample_rate('100')
+    100
+    """
+    mode = mode.strip().lower()
+    if mode == 'on':
+        return 1
+    elif mode == 'off':
+        return 0
+    elif mode.isdigit() and int(mode) > 0:
+        return int(mode)
+    else:
+        raise ValueError(f"A0_CONTRACTS must be 'on', 'off' or a positive integer, not {mode!r}")
+
+
+# 0 disables contract checking, 1 checks every call and N > 1 checks one in every N calls.
+SAMPLE_RATE = _parse_sample_rate(os.environ.get('A0_CONTRACTS', 'on'))
+
+
+def check_contracts(func_or_class: Any) -> Any:
+    """A decorator to enable contract checking for a function or class, according to
+    SAMPLE_RATE.
+
+    When contracts are sampled, the representation invariants and attribute types of an
+    instance are checked at the end of each sampled method call only; attribute
+    assignments outside of methods are not checked.
+
+    A class that defines its own __setattr__ (e.g., to make its instances immutable) keeps
+    it, instead of python_ta's attribute assignment check.
+    """
+    if SAMPLE_RATE == 0:
+        return func_or_class
+
+    # python_ta is imported here rather than at the top of the module, so that it is not
+    # imported at all when contract checking is off.
+    pyta_check_contracts = importlib.import_module('python_ta.contracts').check_contracts
+
+    if not inspect.isclass(func_or_class):
+        if SAMPLE_RATE == 1:
+            return pyta_check_contracts(func_or_class)
+        return _sampled(func_or_class, pyta_check_contracts(func_or_class), SAMPLE_RATE)
+
+    klass = func_or_class
+    originals = {attribute: value for attribute, value in klass.__dict__.items()
+                 if inspect.isfunction(value)}
+    pyta_check_contracts(klass)
+
+    if SAMPLE_RATE == 1:
+        if '__setattr__' in originals:
+            klass.__setattr__ = originals['__setattr__']
+        return klass
+
+    for name, original in originals.items():
+        if name != '__setattr__':
+            setattr(klass, name, _sampled_method(original, klass.__dict__[name], SAMPLE_RATE))
+
+    # Undo python_ta's attribute assignment check, which would otherwise run on every assignment.
+    if '__setattr__' in originals:
+        klass.__setattr__ = originals['__setattr__']
+    else:
+        del klass.__setattr__
+
+    return klass
+
+
+def _sampled(func: Callable, checked: Callable, rate: int) -> Callable:
+    """Return a function that calls <checked> on one in every <rate> calls, and <func>
+    on the others.
+    """
+    calls = itertools.count()
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if next(calls) % rate == 0:
+            return checked(*args, **kwargs)
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+def _sampled_method(method: Callable, checked: Any, rate: int) -> Callable:
+    """Return a method that calls the contract-checked method <checked> on one in every
+    <rate> calls, and <method> on the others.
+    """
+    calls = itertools.count()
+
+    @functools.wraps(method)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        if next(calls) % rate == 0:
+            return checked.__get__(self, type(self))(*args, **kwargs)
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def contract_slots() -> tuple[str, ...]:
+    """Return the extra __slots__ entries that a class decorated with check_contracts
+    must declare, so that python_ta can store its bookkeeping on the class's instances.
+
+    >>> contract_slots() in [(), ('__dict__',)]
+    True
+    """
+    return ('__dict__',) if SAMPLE_RATE else ()
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
+
+    import python_ta
+
+    python_ta.check_all(config={
+        'max-line-length': 100,
+        'extra-imports': ['functools', 'importlib', 'inspect', 'itertools', 'os', 'typing'],
+    })
@@ -0,0 +1,76 @@
+"""CSC148 Assignment 0 - Object-Oriented Modelling, Contract Checking Switch (Tests)
+
+=== Module Description ===
+
+This file contains tests for the check_contracts decorator in a0_contracts.
+"""
+import pytest
+
+import a0_contracts
+
+
+def _make_counter_class() -> type:
+    """Return a new (undecorated) class whose decrement method can break its
+    representation invariant."""
+    class Counter:
+        """A counter that should never become negative.
+
+        Representation Invariants:
+            - self.value >= 0
+        """
+        value: int
+
+        def __init__(self, value: int) -> None:
+            """Initialize a counter with the given value."""
+            self.value = value
+
+        def decrement(self) -> None:
+            """Decrease the value of this counter by one."""
+            self.value -= 1
+
+    return Counter
+
+
+def test_check_contracts_on(monkeypatch) -> None:
+    """Test that every call is checked when SAMPLE_RATE is 1."""
+    monkeypatch.setattr(a0_contracts, 'SAMPLE_RATE', 1)
+    counter = a0_contracts.check_contracts(_make_counter_class())(0)
+
+    with pytest.raises(AssertionError):
+        counter.decrement()
+
+
+def test_check_contracts_off(monkeypatch) -> None:
+    """Test that nothing is checked when SAMPLE_RATE is 0."""
+    monkeypatch.setattr(a0_contracts, 'SAMPLE_RATE', 0)
+    counter_class = _make_counter_class()
+
+    assert a0_contracts.check_contracts(counter_class) is counter_class
+    counter = counter_class(0)
+    counter.decrement()
+    assert counter.value == -1
+
+
+def test_check_contracts_sampled(monkeypatch) -> None:
+    """Test that one in every SAMPLE_RATE calls of a method is checked."""
+    monkeypatch.setattr(a0_contracts, 'SAMPLE_RATE', 3)
+    counter = a0_contracts.check_contracts(_make_counter_class())(5)
+
+    counter.decrement()  # first call: checked, and the invariant holds
+    counter.value = 0  # attribute assignments are not checked when sampling
+    counter.decrement()  # second call: unchecked
+    counter.decrement()  # third call: unchecked
+    assert counter.value == -2
+
+    with pytest.raises(AssertionError):
+        counter.decrement()  # fourth call: checked
+
+
+def test_parse_sample_rate_invalid() -> None:
+    """Test that an invalid A0_CONTRACTS value is rejected."""
+    with pytest.raises(ValueError):
+        a0_contracts._parse_sample_rate('sometimes')
+
+
+if __name__ == '__main__':
+    pytest.main(['a0_contracts_test.py', '-v'])
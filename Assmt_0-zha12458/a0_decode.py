@@ -0,0 +1,203 @@
+"""CSC148 Assignment 0 - Object-Oriented Modelling, Fast Catalog Decoding
+
+=== Module Description ===
+
+This file contains compact, typed records for the JSON data of courses and
+sections, and functions that decode catalog JSON straight into these records,
+keeping only the fields that Course and Section read:
+
+    - a course's 'name', 'code' and 'sections'
+    - a section's 'name', its first delivery mode's 'session', and the day and
+      start and end 'millisofday' of each of its 'meetingTimes'
+
+Course and Section can be initialized from these records as well as from the
+raw JSON dictionaries. Since a Course keeps the data of its sections until they
+are first needed, a catalog loaded from records also takes much less memory.
+
+The fastest available JSON backend is used (see BACKEND):
+
+    - 'msgspec', if installed, which decodes directly into a schema of the fields
+      above and never builds the dictionaries of the fields that are skipped
+    - 'orjson', if installed, which decodes into dictionaries much faster than
+      the json module
+    - 'json', the standard library module, otherwise
+
+The cyclic garbage collector is paused while a document is decoded: decoding
+creates millions of containers, none of which can be part of a reference cycle,
+and the collections they would trigger otherwise take most of the decoding time.
+"""
+# The annotations in this module are evaluated eagerly (no `from __future__ import
+# annotations`), so that the field types of the records can be resolved when python_ta
+# checks a record passed to Course or Section.
+import contextlib
+import functools
+import gc
+import importlib
+import json
+from types import GenericAlias, ModuleType
+from typing import Any, Iterator, NamedTuple
+
+
+def _optional_module(name: str) -> ModuleType | None:
+    """Return the module <name>, or None if it is not installed."""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+# The optional JSON backends, or None for those that are not installed.
+MSGSPEC = _optional_module('msgspec')
+ORJSON = _optional_module('orjson')
+
+# The JSON backend used by decode_courses: 'msgspec', 'orjson' or 'json'.
+BACKEND = 'msgspec' if MSGSPEC is not None else 'orjson' if ORJSON is not None else 'json'
+
+
+class SectionRecord(NamedTuple):
+    """The data of a section that Section reads.
+
+    Instance Attributes:
+        - name: the section code, e.g. 'LEC0101'
+        - session: the semester code, e.g. '20239'
+        - meetings: the (day, start millisofday, end millisofday) of each meeting time
+    """
+    name: str
+    session: str
+    meetings: tuple[tuple[int, int, int], ...]
+
+
+class CourseRecord(NamedTuple):
+    """The data of a course that Course reads.
+
+    Instance Attributes:
+        - name: the course title
+        - code: the course code, e.g. 'CSC148H1'
+        - sections: the records of the sections of the course
+    """
+    name: str
+    code: str
+    sections: list[SectionRecord]
+
+
+def decode_courses(data: bytes | str) -> list[CourseRecord]:
+    """Return the records of the courses in the JSON document <data>, which holds either
+    a list of course data or the data of one course.
+
+    Preconditions:
+        - data is a valid JSON document in the format described in Part 3 of the
+          assignment handout (or a list of such documents)
+
+    >>> records = decode_courses(
+    ...     '{"name": "Intro", "code": "CSC108H1", "sections": [{"name": "LEC0101", '
+    ...     '"deliveryModes": [{"session": "20239", "mode": "INPER"}], "meetingTimes": ['
+    ...     '{"start": {"day": 1, "millisofday": 36000000}, '
+    ...     '"end": {"day": 1, "millisofday": 39600000}, "building": {}}]}]}')
+    >>> records[0].sections
+    [SectionRecord(name='LEC0101', session='20239', meetings=((1, 36000000, 39600000),))]
+    """
+    with _gc_paused():
+        return _decode_courses(data)
+
+
+def _decode_courses(data: bytes | str) -> list[CourseRecord]:
+    """Return the records of the courses in the JSON document <data>, as for
+    decode_courses."""
+    if BACKEND == 'msgspec':
+        decoded = _msgspec_decoder().decode(data)
+        if not isinstance(decoded, list):
+            decoded = [decoded]
+        return [CourseRecord(course.name, course.code,
+                             [SectionRecord(section.name, section.delivery_modes[0].session,
+                                            tuple((meeting.start.day, meeting.start.millisofday,
+                                                   meeting.end.millisofday)
+                                                  for meeting in section.meeting_times))
+                              for section in course.sections])
+                for course in decoded]
+
+    loads = ORJSON.loads if BACKEND == 'orjson' and ORJSON is not None else json.loads
+    decoded = loads(data)
+    if isinstance(decoded, dict):
+        decoded = [decoded]
+    return [course_record(raw_course_data) for raw_course_data in decoded]
+
+
+@functools.cache
+def _msgspec_decoder() -> Any:
+    """Return the msgspec decoder of the catalog JSON data, built the first time it is
+    needed.
+
+    The decoder decodes either a list of course data or the data of one course straight
+    into a schema of the fields that are read. The other fields are skipped, and the
+    camelCase JSON field names are mapped to the snake_case field names.
+
+    Preconditions:
+        - MSGSPEC is not None
+    """
+    assert MSGSPEC is not None
+    time = MSGSPEC.defstruct('Time', [('day', int), ('millisofday', int)])
+    meeting = MSGSPEC.defstruct('Meeting', [('start', time), ('end', time)])
+    delivery_mode = MSGSPEC.defstruct('DeliveryMode', [('session', str)])
+    section = MSGSPEC.defstruct('Section', [('name', str),
+                                            ('delivery_modes', GenericAlias(list, delivery_mode)),
+                                            ('meeting_times', GenericAlias(list, meeting))],
+                                rename='camel')
+    course = MSGSPEC.defstruct('Course', [('name', str), ('code', str),
+                                          ('sections', GenericAlias(list, section))])
+    return MSGSPEC.json.Decoder(GenericAlias(list, course) | course)
+
+
+def load_course_records(file: str) -> list[CourseRecord]:
+    """Return the records of the courses in <file>, which holds either a list of course
+    data or the data of one course.
+
+    Preconditions:
+        - file is a valid JSON file in the format described for decode_courses
+    """
+    with open(file, 'rb') as f:
+        return decode_courses(f.read())
+
+
+def course_record(raw_course_data: dict[str, Any]) -> CourseRecord:
+    """Return the record of the course with the raw JSON data <raw_course_data>."""
+    return CourseRecord(raw_course_data['name'], raw_course_data['code'],
+                        [section_record(raw_section_data)
+                         for raw_section_data in raw_course_data['sections']])
+
+
+def section_record(raw_section_data: dict[str, Any]) -> SectionRecord:
+    """Return the record of the section with the raw JSON data <raw_section_data>."""
+    return SectionRecord(raw_section_data['name'],
+                         raw_section_data['deliveryModes'][0]['session'],
+                         tuple((meeting['start']['day'], meeting['start']['millisofday'],
+                                meeting['end']['millisofday'])
+                               for meeting in raw_section_data['meetingTimes']))
+
+
+@contextlib.contextmanager
+def _gc_paused() -> Iterator[None]:
+    """Return a context manager that pauses the cyclic garbage collector during its block,
+    if it is enabled."""
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+    return None
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
+
+    import python_ta
+
+    python_ta.check_all(config={
+        'allowed-io': ['load_course_records'],
+        'max-line-length': 100,
+        'extra-imports': ['contextlib', 'functools', 'gc', 'importlib', 'json', 'types',
+                          'typing'],
+        'disable': ['C0103']
+    })
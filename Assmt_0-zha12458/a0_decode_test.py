@@ -0,0 +1,72 @@
+"""CSC148 Assignment 0 - Object-Oriented Modelling, Fast Catalog Decoding (Tests)
+
+=== Module Description ===
+
+This file contains tests that check that Courses built from the records of
+a0_decode match Courses built from the raw JSON data, for every available backend.
+"""
+import json
+import os
+
+import pytest
+
+import a0_decode
+from a0_benchmark import generate_courses
+from a0_part3 import Course
+from a0_part4 import load_courses_data, load_courses_data_fast
+
+BACKENDS = [backend for backend, module in [('json', json), ('orjson', a0_decode.ORJSON),
+                                              ('msgspec', a0_decode.MSGSPEC)]
+            if module is not None]
+
+
+def _section_data(course: Course) -> list[tuple]:
+    """Return the code, semester code and timeslots of every section of <course>."""
+    return [(section.section_code, section.semester_code, section.timeslots)
+            for section in course.sections]
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_load_fast_matches(tmp_path: str, backend: str,
+                           monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that load_courses_data_fast loads the same courses as load_courses_data."""
+    monkeypatch.setattr(a0_decode, 'BACKEND', backend)
+    file = os.path.join(tmp_path, 'courses.json')
+    with open(file, 'w') as f:
+        json.dump(list(generate_courses(5, seed=148)), f)
+
+    expected = load_courses_data(file)
+    actual = load_courses_data_fast(file)
+    assert list(actual) == list(expected)
+    for code, course in actual.items():
+        assert course.name == expected[code].name
+        assert _section_data(course) == _section_data(expected[code])
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_decode_single_course(backend: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a document with one course, and fields that are not read, is decoded."""
+    monkeypatch.setattr(a0_decode, 'BACKEND', backend)
+    raw_course_data = next(generate_courses(1, seed=148))
+    raw_course_data['sections'][0]['instructors'] = [{'name': 'David Liu'}]
+
+    [record] = a0_decode.decode_courses(json.dumps(raw_course_data))
+    course = Course(record)
+    assert course.code == raw_course_data['code']
+    assert _section_data(course) == _section_data(Course(raw_course_data))
+
+
+def test_msgspec_matches_json(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the msgspec and json backends decode a catalog into equal records."""
+    pytest.importorskip('msgspec')
+    data = json.dumps(list(generate_courses(5, seed=148)))
+
+    monkeypatch.setattr(a0_decode, 'BACKEND', 'json')
+    expected = a0_decode.decode_courses(data)
+    monkeypatch.setattr(a0_decode, 'BACKEND', 'msgspec')
+    assert a0_decode.decode_courses(data) == expected
+    assert a0_decode.decode_courses(data.encode()) == expected
+
+
+if __name__ == '__main__':
+    pytest.main(['a0_decode_test.py', '-v'])
@@ -0,0 +1,114 @@
+"""CSC148 Assignment 0 - Object-Oriented Modelling, Multi-File Catalog Ingestion
+
+=== Module Description ===
+
+This file contains a function that loads a course catalog split across many JSON
+files (e.g., one file per department) into a single dictionary of Courses, like
+the one returned by load_courses_data.
+
+Each file holds either a list of course data, like data/courses/courses-100.json,
+or the data of a single course, like data/courses/course-csc148.json. The files
+are decoded (into the compact records of a0_decode), and their Courses created,
+by a pool of worker processes; the Courses are then merged in this process, in
+file order.
+"""
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+import glob
+import os
+from typing import Iterable
+
+import a0_stats
+from a0_decode import load_course_records
+from a0_part3 import Course
+
+
+def load_catalog(paths: str | Iterable[str], processes: int | None = None) -> dict[str, Course]:
+    """Return a dictionary mapping each course code to its Course, for every course in
+    the JSON files given by <paths>.
+
+    <paths> is either a directory, in which case every *.json file directly inside it
+    is loaded, a glob pattern such as 'data/courses/*.json', or a list of file names.
+    Directories and glob patterns are loaded in sorted file name order.
+
+    With a0_stats instrumentation on, the JSON decoding and Course construction phases
+    are recorded only for files loaded in this process.
+
+    The files are loaded by <processes> worker processes (os.cpu_count() when None);
+    with processes <= 1, or a single file, they are loaded in this process.
+
+    Raise ValueError if the same course code appears more than once, in the same file
+    or in different files.
+
+    Preconditions:
+        - every file is a valid JSON file that contains either a list of course data or
+          the data of one course, in the format described in Part 3 of the assignment
+          handout
+    """
+    files = catalog_files(paths)
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = min(processes, len(files))
+
+    if processes <= 1:
+        return _merge(files, map(_load_file, files))
+
+    with ProcessPoolExecutor(processes) as executor:
+        return _merge(files, executor.map(_load_file, files))
+
+
+def catalog_files(paths: str | Iterable[str]) -> list[str]:
+    """Return the list of files described by <paths>, as for load_catalog.
+
+    >>> catalog_files(['b.json', 'a.json'])
+    ['b.json', 'a.json']
+    """
+    if not isinstance(paths, str):
+        return list(paths)
+    elif os.path.isdir(paths):
+        return sorted(os.path.join(paths, name) for name in os.listdir(paths)
+                      if name.endswith('.json'))
+    else:
+        return sorted(glob.glob(paths))
+
+
+def _load_file(file: str) -> list[Course]:
+    """Return the Courses corresponding to the data found in <file>, in order."""
+    with a0_stats.phase('load_catalog.decode'):
+        records = load_course_records(file)
+    with a0_stats.phase('load_catalog.construct'):
+        return [Course(record) for record in records]
+
+
+def _merge(files: list[str], loaded: Iterable[list[Course]]) -> dict[str, Course]:
+    """Return a dictionary mapping each course code to its Course, for the Courses loaded
+    from each of <files>, in order.
+
+    Raise ValueError if the same course code appears more than once.
+    """
+    all_courses = {}
+    sources = {}
+
+    for file, courses in zip(files, loaded):
+        for course in courses:
+            if course.code in all_courses:
+                raise ValueError(f'duplicate course code {course.code!r} in {file!r} '
+                                 f'(first seen in {sources[course.code]!r})')
+            all_courses[course.code] = course
+            sources[course.code] = file
+
+    return all_courses
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
+
+    import python_ta
+
+    python_ta.check_all(config={
+        'allowed-io': ['_load_file'],
+        'max-line-length': 100,
+        'extra-imports': ['concurrent.futures', 'glob', 'os', 'typing', 'a0_stats', 'a0_decode',
+                          'a0_part3'],
+    })
@@ -0,0 +1,64 @@
+"""CSC148 Assignment 0 - Object-Oriented Modelling, Multi-File Catalog Ingestion (Tests)
+
+=== Module Description ===
+
+This file contains tests for load_catalog. The catalog files are generated in a
+temporary directory, so that these tests do not depend on the files in data/.
+"""
+import json
+import os
+
+import pytest
+
+import a0_ingest
+from a0_benchmark import generate_courses
+from a0_ingest import load_catalog
+
+
+@pytest.fixture
+def catalog_dir(tmp_path: str) -> str:
+    """A directory with three catalog files: two lists of courses and a single course."""
+    raw_courses = list(generate_courses(7, seed=148))
+    for name, data in [('a.json', raw_courses[:3]), ('b.json', raw_courses[3:6]),
+                       ('c.json', raw_courses[6])]:
+        with open(os.path.join(tmp_path, name), 'w') as f:
+            json.dump(data, f)
+    return str(tmp_path)
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_load_directory(catalog_dir: str, processes: int) -> None:
+    """Test that every course of every file is loaded, in file order."""
+    expected = [raw_course_data['code'] for raw_course_data in generate_courses(7, seed=148)]
+    courses = load_catalog(catalog_dir, processes)
+    assert list(courses) == expected
+    assert all(course.code == code for code, course in courses.items())
+
+
+def test_load_glob_and_list(catalog_dir: str) -> None:
+    """Test that a glob pattern and a list of files select only the matching files."""
+    assert len(load_catalog(os.path.join(catalog_dir, '[ab].json'), 1)) == 6
+    assert len(load_catalog([os.path.join(catalog_dir, 'c.json')], 1)) == 1
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_duplicate_code(catalog_dir: str, processes: int) -> None:
+    """Test that a course code found in two files raises ValueError."""
+    raw_course_data = next(generate_courses(1, seed=148))
+    with open(os.path.join(catalog_dir, 'd.json'), 'w') as f:
+        json.dump([raw_course_data], f)
+
+    with pytest.raises(ValueError, match=raw_course_data['code']):
+        load_catalog(catalog_dir, processes)
+
+
+@pytest.mark.parametrize('processes', [0, 1])
+def test_load_in_process(catalog_dir: str, processes: int,
+                         monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that no worker processes are started when processes <= 1."""
+    monkeypatch.setattr(a0_ingest, 'ProcessPoolExecutor', None)
+    assert len(load_catalog(catalog_dir, processes)) == 7
+
+
+if __name__ == '__main__':
+    pytest.main(['a0_ingest_test.py', '-v'])
@@ -0,0 +1,327 @@
+"""CSC148 Assignment 0 - Object-Oriented Modelling, Timetable Optimizer
+
+=== Module Description ===
+
+This file contains a function that finds the best valid timetables for a list of
+courses in a given semester, according to a weighted objective (see Objective):
+
+    - days: the number of days with at least one class
+    - gaps: the total number of minutes between classes on the same day
+    - early: the total number of minutes of class before early_limit
+    - span: the total, over the days with a class, of the number of minutes from
+      the start of the first class to the end of the last class
+
+A timetable takes the same sections as for a0_solver: one section of each
+teaching method that each course offers in the semester.
+
+The search is a depth-first branch and bound. At each node, the sections of the
+remaining choices that do not conflict with the sections chosen so far are
+found (a branch with a choice left without any such section is pruned), and a
+lower bound on the cost of every timetable below the node is computed from them.
+The bound never overestimates, so a branch is only pruned when it cannot hold a
+timetable better than the K best found so far, and the result is exact unless
+the time budget runs out first.
+"""
+from __future__ import annotations
+import heapq
+import itertools
+import time as timer
+from datetime import time
+from typing import NamedTuple
+
+from a0_part1 import MINUTES_PER_DAY, minute_of_day
+from a0_part2 import Section
+from a0_part3 import Course
+from a0_part4 import Timetable
+from a0_solver import build_slots
+
+# The number of search nodes between two checks of the time budget.
+_NODES_PER_CHECK = 256
+
+
+class Objective(NamedTuple):
+    """A weighted objective to minimize: the weighted sum of the cost terms described in
+    the module docstring.
+
+    Instance Attributes:
+        - days: the weight of the number of days with a class
+        - gaps: the weight of the number of minutes between classes
+        - early: the weight of the number of minutes of class before early_limit
+        - span: the weight of the number of minutes from first class to last class
+        - early_limit: the time of day before which classes count as early
+
+    Representation Invariants:
+        - self.days >= 0 and self.gaps >= 0 and self.early >= 0 and self.span >= 0
+    """
+    days: float = 0.0
+    gaps: float = 0.0
+    early: float = 0.0
+    span: float = 0.0
+    early_limit: time = time(10)
+
+
+class SearchResult(NamedTuple):
+    """The result of best_timetables.
+
+    Instance Attributes:
+        - timetables: (cost, timetable) pairs, from the lowest cost
+        - complete: whether the search finished within its time budget, i.e. whether
+            timetables are guaranteed to be the best ones
+    """
+    timetables: list[tuple[float, Timetable]]
+    complete: bool
+
+
+class _Option(NamedTuple):
+    """A section, summarized for the search.
+
+    Instance Attributes:
+        - position: the position of the section in its choice
+        - mask: the weekly occupancy bitmask of the section
+        - day_bits: the set of days the section meets on, as bits 1 to 5
+        - minutes: the number of minutes of class of the section
+        - early: the number of minutes of class of the section before the early limit
+        - bounds: the first start minute and last end minute of the section on each day
+            it meets on, as (day, first start, last end) triples
+    """
+    position: int
+    mask: int
+    day_bits: int
+    minutes: int
+    early: int
+    bounds: tuple[tuple[int, int, int], ...]
+
+
+class _State(NamedTuple):
+    """The sections chosen so far in the search, summarized.
+
+    Instance Attributes:
+        - occupied: the union of the occupancy bitmasks of the sections
+        - day_bits: the set of days with a class, as bits 1 to 5
+        - minutes: the total number of minutes of class
+        - early: the total number of minutes of class before the early limit
+        - firsts: the first start minute on each day (index 0 is unused), or
+            MINUTES_PER_DAY
+        - lasts: the last end minute on each day (index 0 is unused), or 0
+    """
+    occupied: int
+    day_bits: int
+    minutes: int
+    early: int
+    firsts: tuple[int, ...]
+    lasts: tuple[int, ...]
+
+
+_EMPTY_STATE = _State(0, 0, 0, 0, (MINUTES_PER_DAY,) * 6, (0,) * 6)
+
+
+def best_timetables(courses: list[Course], semester_code: str, objective: Objective,
+                    k: int = 1, time_limit: float | None = None) -> SearchResult:
+    """Return the <k> valid timetables for <courses> in <semester_code> with the lowest
+    cost according to <objective>, from the lowest cost.
+
+    When several timetables tie for the last of the <k> places, which of them are
+    returned is unspecified. If <time_limit> is not None, the search stops after about
+    <time_limit> seconds, and returns the best timetables found so far.
+
+    Raise ValueError if a weight of <objective> is negative: the lower bounds of the
+    search are only valid for weights >= 0.
+
+    Preconditions:
+        - courses does not contain the same course twice
+        - k >= 1
+    """
+    if min(objective.days, objective.gaps, objective.early, objective.span) < 0:
+        raise ValueError(f'negative weight in {objective!r}')
+
+    slots = build_slots(courses, semester_code)
+    if not slots and courses:
+        return SearchResult([], True)
+
+    options = _slot_options(slots, objective)
+    deadline = None if time_limit is None else timer.monotonic() + time_limit
+
+    # The best timetables found so far, as a heap of (-cost, -tie-breaker, choices), so
+    # that the worst of them is on top.
+    best: list[tuple[float, tuple[int, ...], tuple[int, ...]]] = []
+    nodes = itertools.count()
+
+    def search(depth: int, state: _State, choices: tuple[int, ...]) -> bool:
+        """Search every timetable below the node reached by <choices>, and return whether
+        the time budget ran out."""
+        if deadline is not None and next(nodes) % _NODES_PER_CHECK == 0 \
+                and timer.monotonic() > deadline:
+            return True
+
+        if depth == len(options):
+            entry = (-_cost(state, objective), tuple(-i for i in choices), choices)
+            if len(best) < k:
+                heapq.heappush(best, entry)
+            elif entry > best[0]:
+                heapq.heapreplace(best, entry)
+            return False
+
+        feasible = []
+        for slot_options in options[depth:]:
+            slot_feasible = [option for option in slot_options
+                             if not state.occupied & option.mask]
+            if not slot_feasible:
+                return False
+            feasible.append(slot_feasible)
+
+        if len(best) == k and _lower_bound(state, feasible, objective) >= -best[0][0]:
+            return False
+
+        children = sorted(((_cost(child, objective), option.position, child)
+                           for option in feasible[0]
+                           for child in [_add(state, option)]),
+                          key=lambda c: (c[0], c[1]))
+        for _, position, next_state in children:
+            if search(depth + 1, next_state, choices + (position,)):
+                return True
+        return False
+
+    out_of_time = search(0, _EMPTY_STATE, ())
+    return SearchResult([(-neg_cost, _timetable(slots, choices, semester_code))
+                         for neg_cost, _, choices in sorted(best, reverse=True)],
+                        not out_of_time)
+
+
+def _slot_options(slots: list[tuple[Course, list[Section]]],
+                  objective: Objective) -> list[list[_Option]]:
+    """Return the summaries, for the search, of the sections of each choice of <slots>
+    (see build_slots), with the early limit of <objective>."""
+    early_limit = minute_of_day(objective.early_limit)
+    return [[_option(i, section, early_limit) for i, section in enumerate(sections)]
+            for _, sections in slots]
+
+
+def _timetable(slots: list[tuple[Course, list[Section]]], choices: tuple[int, ...],
+               semester_code: str) -> Timetable:
+    """Return the timetable in <semester_code> with the section at position choices[i] of
+    each choice slots[i] (see build_slots)."""
+    timetable = Timetable(semester_code)
+    for (course, slot_sections), position in zip(slots, choices):
+        timetable.add_section_by_code(course, slot_sections[position].section_code)
+    return timetable
+
+
+def score(sections: list[Section], objective: Objective) -> float:
+    """Return the cost of a timetable with <sections> according to <objective>.
+
+    Preconditions:
+        - no two sections of <sections> conflict
+
+    >>> lec = Section({'name': 'LEC0101', 'deliveryModes': [{'session': '20239'}],
+    ...                'meetingTimes': [{'start': {'day': 1, 'millisofday': 32400000},
+    ...                                  'end': {'day': 1, 'millisofday': 39600000}}]})
+    >>> tut = Section({'name': 'TUT0101', 'deliveryModes': [{'session': '20239'}],
+    ...                'meetingTimes': [{'start': {'day': 1, 'millisofday': 43200000},
+    ...                                  'end': {'day': 1, 'millisofday': 46800000}}]})
+    >>> score([lec, tut], Objective(days=100, gaps=1, early=10, span=0.5))
+    880.0
+    """
+    early_limit = minute_of_day(objective.early_limit)
+    state = _EMPTY_STATE
+    for section in sections:
+        state = _add(state, _option(0, section, early_limit))
+    return _cost(state, objective)
+
+
+def _option(position: int, section: Section, early_limit: int) -> _Option:
+    """Return the summary of <section>, at <position> in its choice, for the search."""
+    day_bits = 0
+    minutes = 0
+    early = 0
+    bounds: dict[int, tuple[int, int]] = {}
+    for timeslot in section.timeslots:
+        start, end = minute_of_day(timeslot.start), minute_of_day(timeslot.end)
+        day_bits |= 1 << timeslot.day
+        minutes += end - start
+        early += max(0, min(end, early_limit) - start)
+        first, last = bounds.get(timeslot.day, (start, end))
+        bounds[timeslot.day] = (min(first, start), max(last, end))
+
+    return _Option(position, section.mask, day_bits, minutes, early,
+                   tuple((day, first, last) for day, (first, last) in bounds.items()))
+
+
+def _add(state: _State, option: _Option) -> _State:
+    """Return the state reached by choosing the section of <option> in <state>."""
+    firsts, lasts = list(state.firsts), list(state.lasts)
+    for day, first, last in option.bounds:
+        firsts[day] = min(firsts[day], first)
+        lasts[day] = max(lasts[day], last)
+    return _State(state.occupied | option.mask, state.day_bits | option.day_bits,
+                  state.minutes + option.minutes, state.early + option.early,
+                  tuple(firsts), tuple(lasts))
+
+
+def _span(state: _State) -> int:
+    """Return the total span of the days with a class in <state>, in minutes."""
+    return sum(last - first for first, last in zip(state.firsts, state.lasts) if last)
+
+
+def _cost(state: _State, objective: Objective) -> float:
+    """Return the cost of the sections chosen in <state>, according to <objective>."""
+    span = _span(state)
+    return (objective.days * state.day_bits.bit_count() + objective.gaps * (span - state.minutes)
+            + objective.early * state.early + objective.span * span)
+
+
+def _span_increase(state: _State, option: _Option) -> int:
+    """Return how much choosing the section of <option> in <state> increases the total
+    span of the days with a class, in minutes."""
+    increase = 0
+    for day, first, last in option.bounds:
+        if state.lasts[day]:
+            increase += max(0, state.firsts[day] - first) + max(0, last - state.lasts[day])
+        else:
+            increase += last - first
+    return increase
+
+
+def _lower_bound(state: _State, feasible: list[list[_Option]], objective: Objective) -> float:
+    """Return a lower bound on the cost of every timetable that extends <state> with one
+    of the sections of each list of options in <feasible>.
+
+    Each term is bounded separately:
+
+        - days and span never decrease as sections are added, so they are at least their
+          value after adding the remaining choice that increases them the most, even
+          when its cheapest section is taken
+        - early minutes add up, so they are at least the current ones plus the fewest
+          early minutes of each remaining choice
+        - gaps are the span minus the minutes of class, so they are at least the lower
+          bound of the span minus the most minutes of class that can be added
+    """
+    new_days = 0
+    span_increase = 0
+    early = state.early
+    max_minutes = state.minutes
+
+    for options in feasible:
+        new_days = max(new_days, min((option.day_bits & ~state.day_bits).bit_count()
+                                     for option in options))
+        span_increase = max(span_increase, min(_span_increase(state, option)
+                                               for option in options))
+        early += min(option.early for option in options)
+        max_minutes += max(option.minutes for option in options)
+
+    span_bound = _span(state) + span_increase
+    return (objective.days * (state.day_bits.bit_count() + new_days)
+            + objective.gaps * max(0, span_bound - max_minutes)
+            + objective.early * early + objective.span * span_bound)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
+
+    import python_ta
+
+    python_ta.check_all(config={
+        'max-line-length': 100,
+        'extra-imports': ['heapq', 'itertools', 'time', 'datetime', 'typing', 'a0_part1',
+                          'a0_part2', 'a0_part3', 'a0_part4', 'a0_solver'],
+    })
@@ -0,0 +1,68 @@
+"""CSC148 Assignment 0 - Object-Oriented Modelling, Timetable Optimizer (Tests)
+
+=== Module Description ===
+
+This file contains tests that compare best_timetables with scoring every valid
+timetable found by enumerate_timetables, on a small synthetic catalog.
+"""
+from datetime import time
+
+import pytest
+
+from a0_benchmark import generate_courses
+from a0_optimizer import Objective, best_timetables, score
+from a0_part2 import Section
+from a0_part3 import Course
+from a0_solver import enumerate_timetables
+
+OBJECTIVES = [Objective(days=1), Objective(gaps=1), Objective(early=1), Objective(span=1),
+              Objective(days=60, gaps=1, early=2, span=0.5, early_limit=time(11))]
+
+
+@pytest.fixture(scope='module')
+def courses() -> list[Course]:
+    """Three synthetic courses with 3 to 7 sections in 20239 (which have 20 valid
+    timetables)."""
+    raw_courses_data = [raw for raw in generate_courses(80, seed=148)
+                        if 3 <= sum(section['deliveryModes'][0]['session'] == '20239'
+                                    for section in raw['sections']) <= 7]
+    return [Course(raw) for raw in raw_courses_data[:3]]
+
+
+@pytest.fixture(scope='module')
+def all_timetables(courses: list[Course]) -> list[list[Section]]:
+    """The sections of every valid timetable of <courses> in 20239."""
+    return [timetable.get_all_sections()
+            for timetable in enumerate_timetables(courses, '20239', processes=1)]
+
+
+@pytest.mark.parametrize('objective', OBJECTIVES)
+def test_matches_brute_force(courses: list[Course], all_timetables: list[list[Section]],
+                             objective: Objective) -> None:
+    """Test that the costs of the best timetables are the lowest costs of all timetables."""
+    costs = sorted(score(sections, objective) for sections in all_timetables)
+
+    result = best_timetables(courses, '20239', objective, k=3)
+    assert result.complete
+    assert [cost for cost, _ in result.timetables] == costs[:3]
+    for cost, timetable in result.timetables:
+        assert timetable.is_valid()
+        assert score(timetable.get_all_sections(), objective) == cost
+
+
+def test_time_budget(courses: list[Course]) -> None:
+    """Test that a search that runs out of time reports that it is incomplete. The time
+    limit is negative, so the deadline has passed before the first check of the clock."""
+    result = best_timetables(courses, '20239', OBJECTIVES[-1], k=3, time_limit=-1)
+    assert not result.complete
+
+
+@pytest.mark.parametrize('objective', [Objective(days=-1), Objective(gaps=1, span=-0.5)])
+def test_negative_weight(courses: list[Course], objective: Objective) -> None:
+    """Test that an objective with a negative weight raises ValueError."""
+    with pytest.raises(ValueError):
+        best_timetables(courses, '20239', objective)
+
+
+if __name__ == '__main__':
+    pytest.main(['a0_optimizer_test.py', '-v'])
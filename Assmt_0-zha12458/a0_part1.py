@@ -23,7 +23,40 @@ For Part 1a of this assignment, you'll complete the implementation of this class
 from __future__ import annotations
 from datetime import time
 
-from python_ta.contracts import check_contracts
+from a0_contracts import check_contracts, contract_slots
+
+# The number of one-minute buckets in a single day of a weekly occupancy bitmask.
+MINUTES_PER_DAY = 24 * 60
+
+
+def minute_of_day(t: time) -> int:
+    """Return the number of minutes between midnight and <t>.
+
+    >>> minute_of_day(time(10, 30))
+    630
+    """
+    return t.hour * 60 + t.minute
+
+
+def occupancy_mask(day: int, start: time, end: time) -> int:
+    """Return the weekly occupancy bitmask of a meeting on <day> from <start> to <end>.
+
+    Bit number (day - 1) * MINUTES_PER_DAY + m is set for every minute m of the day
+    with start <= m < end, so two meetings conflict exactly when their masks share a bit.
+    An empty mask (0) is returned when end <= start.
+
+    >>> occupancy_mask(1, time(0, 0), time(0, 3))
+    7
+    >>> occupancy_mask(1, time(12), time(10))
+    0
+    >>> occupancy_mask(2, time(0, 0), time(0, 1)) == 1 << MINUTES_PER_DAY
+    True
+    """
+    start_minute = minute_of_day(start)
+    length = minute_of_day(end) - start_minute
+    if length <= 0:
+        return 0
+    return ((1 << length) - 1) << ((day - 1) * MINUTES_PER_DAY + start_minute)
 
 
 @check_contracts
@@ -36,6 +69,13 @@ class Timeslot:
             1 represents Monday, 2 represents Tuesday, etc.
         - start: the starting time of this timeslot.
         - end: the ending time of this timeslot.
+        - mask: the weekly occupancy bitmask of this timeslot (see occupancy_mask).
+            This is computed once when the timeslot is created, so that conflict
+            checks are a single integer AND.
+
+    Timeslots are immutable values: two timeslots with the same day, start and end are
+    equal and have the same hash. Use intern_timeslot rather than the initializer to
+    share a single Timeslot object between all meetings at the same time.
 
     Start and end times are represented as datetime.time objects. You may find the
     Python documentation useful: https://docs.python.org/3/library/datetime.html#time-objects
@@ -52,10 +92,13 @@ class Timeslot:
         - self.start < self.end
         - self.start.seconds == 0 and self.start.microseconds == 0
         - self.end.seconds == 0 and self.end.microseconds == 0
+        - self.mask == occupancy_mask(self.day, self.start, self.end)
     """
+    __slots__: tuple[str, ...] = ('day', 'start', 'end', 'mask') + contract_slots()
     day: int
     start: time
     end: time
+    mask: int
 
     def __init__(self, day: int, start: time, end: time) -> None:
         """Initialize a new timeslot with the given attributes.
@@ -68,9 +111,37 @@ class Timeslot:
         >>> my_timeslot.end
         datetime.time(12, 30)
         """
-        self.day = day
-        self.start = start
-        self.end = end
+        object.__setattr__(self, 'day', day)
+        object.__setattr__(self, 'start', start)
+        object.__setattr__(self, 'end', end)
+        object.__setattr__(self, 'mask', occupancy_mask(day, start, end))
+
+    def __setattr__(self, name: str, value: object) -> None:
+        """Raise an AttributeError, since timeslots are immutable.
+
+        >>> my_timeslot = Timeslot(2, time(10), time(12, 30))
+        >>> my_timeslot.day = 3
+        Traceback (most recent call last):
+        AttributeError: Timeslot objects are immutable
+        """
+        raise AttributeError('Timeslot objects are immutable')
+
+    def __eq__(self, other: object) -> bool:
+        """Return whether <other> is a timeslot with the same day, start and end as this one.
+
+        >>> Timeslot(2, time(10), time(12, 30)) == Timeslot(2, time(10), time(12, 30))
+        True
+        """
+        return isinstance(other, Timeslot) and self.day == other.day \
+            and self.start == other.start and self.end == other.end
+
+    def __hash__(self) -> int:
+        """Return a hash of this timeslot's day, start and end."""
+        return hash((self.day, self.start, self.end))
+
+    def __reduce__(self) -> tuple:
+        """Return how to pickle this timeslot: unpickling interns it again."""
+        return intern_timeslot, (self.day, self.start, self.end)
 
     def duration(self) -> float:
         """Return the duration of this timeslot, in hours.
@@ -98,8 +169,7 @@ class Timeslot:
         >>> timeslot1.has_conflict(timeslot2)
         True
         """
-        return True if self.day == other.day and not \
-            (self.end <= other.start or self.start >= other.end) else False
+        return (self.mask & other.mask) != 0
 
     def __repr__(self) -> str:
         """Returns a string representation of the timeslot.
@@ -115,6 +185,24 @@ class Timeslot:
         return f'Timeslot({self.day}, {repr(self.start)}, {repr(self.end)})'
 
 
+# Maps (day, start, end) to the shared Timeslot object for that meeting time.
+_TIMESLOTS: dict[tuple[int, time, time], Timeslot] = {}
+
+
+def intern_timeslot(day: int, start: time, end: time) -> Timeslot:
+    """Return the shared Timeslot with the given attributes, creating it if this is the
+    first time it is requested.
+
+    >>> intern_timeslot(2, time(10), time(12, 30)) is intern_timeslot(2, time(10), time(12, 30))
+    True
+    """
+    key = (day, start, end)
+    timeslot = _TIMESLOTS.get(key)
+    if timeslot is None:
+        timeslot = _TIMESLOTS[key] = Timeslot(day, start, end)
+    return timeslot
+
+
 if __name__ == '__main__':
     import doctest
 
@@ -133,5 +221,5 @@ if __name__ == '__main__':
 
     python_ta.check_all(config={
         'max-line-length': 100,
-        'extra-imports': ['datetime']
+        'extra-imports': ['datetime', 'a0_contracts']
     })
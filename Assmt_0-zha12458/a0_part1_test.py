@@ -31,7 +31,7 @@ Notes:
 from datetime import time
 import pytest
 
-from a0_part1 import Timeslot
+from a0_part1 import Timeslot, MINUTES_PER_DAY, intern_timeslot
 
 
 def test_duration_simple() -> None:
@@ -113,5 +113,48 @@ def test_rep_inv_invalid_start_end() -> None:
         Timeslot(4, time(12), time(10))
 
 
+def test_mask_back_to_back() -> None:
+    """Test that the occupancy masks of back-to-back timeslots share no bits,
+    while the mask of a timeslot covers exactly one bit per minute.
+    """
+    timeslot1 = Timeslot(2, time(9), time(11))
+    timeslot2 = Timeslot(2, time(11), time(11, 30))
+
+    assert timeslot1.mask & timeslot2.mask == 0
+    assert bin(timeslot1.mask).count('1') == 120
+
+
+def test_mask_different_days() -> None:
+    """Test that timeslots at the same time of day on different days use different bits.
+    """
+    timeslot1 = Timeslot(1, time(9), time(10))
+    timeslot2 = Timeslot(2, time(9), time(10))
+
+    assert timeslot1.mask << MINUTES_PER_DAY == timeslot2.mask
+    assert not timeslot1.has_conflict(timeslot2)
+
+
+def test_timeslot_value_semantics() -> None:
+    """Test that equal timeslots compare and hash equal, and that timeslots are immutable.
+    """
+    timeslot1 = Timeslot(4, time(13), time(14, 30))
+    timeslot2 = Timeslot(4, time(13), time(14, 30))
+
+    assert timeslot1 == timeslot2
+    assert len({timeslot1, timeslot2}) == 1
+    assert timeslot1 != Timeslot(4, time(13), time(14))
+    with pytest.raises(AttributeError):
+        timeslot1.day = 5
+
+
+def test_intern_timeslot_shared() -> None:
+    """Test that intern_timeslot returns one shared object per meeting time.
+    """
+    timeslot = intern_timeslot(5, time(15), time(16))
+
+    assert intern_timeslot(5, time(15), time(16)) is timeslot
+    assert intern_timeslot(5, time(15), time(17)) is not timeslot
+
+
 if __name__ == '__main__':
     pytest.main(['a0_part1_test.py', '-v'])
@@ -24,9 +24,10 @@ from __future__ import annotations
 from datetime import time
 import json
 
-from python_ta.contracts import check_contracts
+from a0_contracts import check_contracts
 
-from a0_part1 import Timeslot
+from a0_decode import SectionRecord
+from a0_part1 import Timeslot, intern_timeslot
 
 
 def load_section_data(file: str) -> Section:
@@ -67,6 +68,31 @@ def seconds_converter(milliseconds: int) -> time:
     return time(hours, minutes_remaining)
 
 
+def timeslot_from_millis(day: int, start_millis: int, end_millis: int) -> Timeslot:
+    """Return the shared Timeslot meeting on <day> between the given times of day,
+    in milliseconds.
+
+    The result is interned (see intern_timeslot), so repeated meeting times in the JSON
+    data share one Timeslot.
+
+    >>> timeslot_from_millis(1, 36000000, 39600000)
+    Timeslot(1, datetime.time(10, 0), datetime.time(11, 0))
+    """
+    return intern_timeslot(day, seconds_converter(start_millis), seconds_converter(end_millis))
+
+
+def union_mask(timeslots: list[Timeslot]) -> int:
+    """Return the weekly occupancy bitmask covering every timeslot in <timeslots>.
+
+    >>> union_mask([Timeslot(1, time(0, 0), time(0, 1)), Timeslot(1, time(0, 2), time(0, 3))])
+    5
+    """
+    mask = 0
+    for timeslot in timeslots:
+        mask |= timeslot.mask
+    return mask
+
+
 @check_contracts
 class Section:
     """A representation of a section of a course.
@@ -75,19 +101,24 @@ class Section:
         - section_code: section name
         - semester_code: semester code
         - timeslots: list of all meeting timeslots
+        - mask: the weekly occupancy bitmask of this section, i.e. the union of
+            the masks of its timeslots
 
     Representation Invariants: (Part 2c: fill these in)
         - self.semester_code in ('20239', '20241')
         - len(self.section_code) == 7
         - self.section_code.startswith(('LEC', 'TUT', 'PRA'))
         - len(self.timeslots) >= 1
+        - self.mask == union_mask(self.timeslots)
     """
     section_code: str
     semester_code: str
     timeslots: list[Timeslot]
+    mask: int
 
-    def __init__(self, raw_section_data: dict) -> None:
-        """Initialize a section from the given JSON data.
+    def __init__(self, raw_section_data: dict | SectionRecord) -> None:
+        """Initialize a section from the given JSON data, or from its record (see
+        a0_decode).
 
         Preconditions:
             - The data is in the format described on the assignment handout.
@@ -103,16 +134,22 @@ class Section:
               There are 1000 milliseconds in 1 second.
               We recommend creating a helper function to accomplish this task.
         """
-        self.section_code = raw_section_data['name']
-        self.semester_code = raw_section_data['deliveryModes'][0]['session']
-        self.timeslots = []
-
-        for timeslots_data in raw_section_data["meetingTimes"]:
-            day = timeslots_data['start']['day']
-            start_time = seconds_converter(timeslots_data['start']['millisofday'])
-            end_time = seconds_converter(timeslots_data['end']['millisofday'])
-
-            self.timeslots.append(Timeslot(day, start_time, end_time))
+        if isinstance(raw_section_data, SectionRecord):
+            self.section_code = raw_section_data.name
+            self.semester_code = raw_section_data.session
+            self.timeslots = [timeslot_from_millis(*meeting)
+                              for meeting in raw_section_data.meetings]
+        else:
+            self.section_code = raw_section_data['name']
+            self.semester_code = raw_section_data['deliveryModes'][0]['session']
+            self.timeslots = []
+
+            for timeslots_data in raw_section_data["meetingTimes"]:
+                self.timeslots.append(timeslot_from_millis(timeslots_data['start']['day'],
+                                                           timeslots_data['start']['millisofday'],
+                                                           timeslots_data['end']['millisofday']))
+
+        self.mask = union_mask(self.timeslots)
 
     def duration(self) -> float:
         """Return the total duration of timeslots of this section, in minutes.
@@ -134,11 +171,7 @@ class Section:
         >>> csc148_lec0201.has_conflict(csc236_lec0101)
         True
         """
-        for timeslot1 in self.timeslots:
-            for timeslot2 in other.timeslots:
-                if timeslot1.has_conflict(timeslot2):
-                    return True
-        return False
+        return (self.mask & other.mask) != 0
 
 
 if __name__ == '__main__':
@@ -158,6 +191,7 @@ if __name__ == '__main__':
 
     python_ta.check_all(config={
         'max-line-length': 100,
-        'extra-imports': ['datetime', 'json', 'a0_part1'],
+        'extra-imports': ['datetime', 'json', 'a0_contracts', 'a0_decode',
+                          'a0_part1'],
         'allowed-io': ['load_section_data']
     })
@@ -22,10 +22,13 @@ For Part 3 of this assignment, you'll complete the implementation of this class.
 """
 from __future__ import annotations
 import json
+from typing import Sequence
 
-from python_ta.contracts import check_contracts
+from a0_contracts import check_contracts
 
-from a0_part2 import Section
+from a0_decode import CourseRecord, SectionRecord, section_record
+from a0_part1 import Timeslot
+from a0_part2 import Section, union_mask
 
 
 def load_course_data(file: str) -> Course:
@@ -59,33 +62,75 @@ class Course:
     Instance Attributes (you need to fill this in!):
         - name: The name of this Course.
         - code: The course code of this Course.
-        - sections: A list sections of this Course.
+        - sections: A list sections of this Course. (This is a read-only property that
+            returns a new list each time: appending to it does not change this Course.)
+
+    Private Instance Attributes:
+        - _raw_sections: the JSON data (or records) of the sections of this course
+        - _sections: the Section built from each element of _raw_sections, or None if
+            that section has not been needed yet
+        - _section_index: maps (section_code, semester_code) to the position of the
+            matching section in _raw_sections
+        - _semester_positions: maps each semester code to the positions of the sections
+            of this course offered in that semester, in order
+        - _semester_sections: maps each semester code for which get_semester_sections
+            has been called to the sections of this course offered in that semester
+
+    Sections are only built from their JSON data when they are first needed (by
+    lookup_section, get_semester_sections, get_compatible_sections or self.sections),
+    and are then kept, so a course that is never used costs almost nothing to create.
+    self.sections builds every section.
 
     Representation Invariants:
         - self does not have duplicate section codes in the same semester
+        - len(self._sections) == len(self._raw_sections)
+        - len(self._section_index) == len(self._raw_sections)
     """
     # Write your instance attribute type annotations here!
     name: str
     code: str
-    sections: list[Section]
+    _raw_sections: Sequence[dict | SectionRecord]
+    _sections: list[Section | None]
+    _section_index: dict[tuple[str, str], int]
+    _semester_positions: dict[str, list[int]]
+    _semester_sections: dict[str, list[Section]]
 
-    def __init__(self, raw_course_data: dict) -> None:
-        """Initialize a course from the given JSON data.
+    def __init__(self, raw_course_data: dict | CourseRecord) -> None:
+        """Initialize a course from the given JSON data, or from its record (see a0_decode).
 
         Preconditions:
             - The data is in the format described on the assignment handout.
-
-        Hints:
-            - This might seem daunting at first because this JSON data is larger than the
-              section data in Part 2. However, keep in mind that the "section data" portions
-              of raw_course_data can be used to create new Section objects!
         """
-        self.name = raw_course_data['name']
-        self.code = raw_course_data['code']
-        self.sections = []
-
-        for section_info in raw_course_data['sections']:
-            self.sections.append(Section(section_info))
+        if isinstance(raw_course_data, CourseRecord):
+            self.name, self.code, self._raw_sections = raw_course_data
+        else:
+            self.name = raw_course_data['name']
+            self.code = raw_course_data['code']
+            self._raw_sections = raw_course_data['sections']
+        self._sections = [None] * len(self._raw_sections)
+        self._section_index = {}
+        self._semester_positions = {}
+        self._semester_sections = {}
+
+        for i, section_info in enumerate(self._raw_sections):
+            if isinstance(section_info, SectionRecord):
+                section_code, semester_code = section_info.name, section_info.session
+            else:
+                section_code = section_info['name']
+                semester_code = section_info['deliveryModes'][0]['session']
+            self._section_index[(section_code, semester_code)] = i
+            self._semester_positions.setdefault(semester_code, []).append(i)
+
+    @property
+    def sections(self) -> list[Section]:
+        """Return a new list of every section of this course, in the same order as the
+        JSON data.
+
+        Before sections were built lazily, this was a plain list attribute. It is now a
+        new copy each time, so mutating it (e.g., appending a section) has no effect on
+        this course; a course's sections are fixed by the data it was created from.
+        """
+        return [self._section_at(i) for i in range(len(self._raw_sections))]
 
     def get_code(self) -> str:
         """Return the course code for this course.
@@ -125,12 +170,39 @@ class Course:
         >>> lec0101.timeslots[1]
         Timeslot(3, datetime.time(9, 0), datetime.time(11, 0))
         """
-        for section in self.sections:
-            if section.section_code == section_code and section.semester_code == semester_code:
-                return section
-        return
+        i = self._section_index.get((section_code, semester_code))
+        if i is None:
+            return None
+        return self._section_at(i)
+
+    def get_semester_sections(self, semester_code: str) -> list[Section]:
+        """Return the sections of this course offered in the given semester.
+
+        The returned list is shared with this course and should not be mutated.
+
+        >>> csc148 = load_course_data('data/courses/course-csc148.json')
+        >>> fall_sections = csc148.get_semester_sections('20239')
+        >>> all(section.semester_code == '20239' for section in fall_sections)
+        True
+        """
+        if semester_code not in self._semester_sections:
+            self._semester_sections[semester_code] = [
+                self._section_at(i) for i in self._semester_positions.get(semester_code, [])]
+        return self._semester_sections[semester_code]
 
-    def get_compatible_sections(self, other_section: Section) -> list[Section]:
+    def get_section_codes(self, semester_code: str) -> list[str]:
+        """Return the section codes of the sections of this course offered in the given
+        semester, in the same order as the JSON data, without building any section.
+
+        >>> csc148 = load_course_data('data/courses/course-csc148.json')
+        >>> 'LEC0101' in csc148.get_section_codes('20239')
+        True
+        """
+        return [section_code for section_code, section_semester in self._section_index
+                if section_semester == semester_code]
+
+    def get_compatible_sections(self, other_section: Section,
+                                windows: list[Timeslot] | None = None) -> list[Section]:
         """Return a list of the sections of this course that are compatible with <other_section>.
 
         A section is compatible with <other_section> when BOTH:
@@ -138,17 +210,38 @@ class Course:
         - The section has the same semester as <other_section>
         - The section does not conflict with <other_section>
 
+        If <windows> is given (e.g., the free windows of a timetable, see
+        Timetable.free_windows), only the compatible sections whose timeslots all lie
+        within <windows> are returned. The other sections are skipped with a single
+        bitmask test, before any conflict check.
+
         Note that an empty list is a valid return value (when there are no compatible sections).
         """
         res = []
+        outside = None if windows is None else ~union_mask(windows)
 
-        for section in self.sections:
-            if section.semester_code == other_section.semester_code and \
-                    not section.has_conflict(other_section):
+        for section in self.get_semester_sections(other_section.semester_code):
+            if outside is not None and section.mask & outside:
+                continue
+            if not section.has_conflict(other_section):
                 res.append(section)
 
         return res
 
+    def to_record(self) -> CourseRecord:
+        """Return the record (see a0_decode) of the data this course was created from."""
+        return CourseRecord(self.name, self.code,
+                            [raw_section_data if isinstance(raw_section_data, SectionRecord)
+                             else section_record(raw_section_data)
+                             for raw_section_data in self._raw_sections])
+
+    def _section_at(self, i: int) -> Section:
+        """Return the section built from self._raw_sections[i], building it if needed."""
+        section = self._sections[i]
+        if section is None:
+            section = self._sections[i] = Section(self._raw_sections[i])
+        return section
+
 
 if __name__ == '__main__':
     import doctest
@@ -167,7 +260,7 @@ if __name__ == '__main__':
 
     python_ta.check_all(config={
         'max-line-length': 100,
-        'extra-imports': ['json', 'a0_part2'],
+        'extra-imports': ['json', 'typing', 'a0_contracts', 'a0_decode', 'a0_part1', 'a0_part2'],
         'allowed-io': ['load_course_data'],
         'disable': ['R1710']
     })
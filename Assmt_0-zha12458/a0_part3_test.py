@@ -0,0 +1,62 @@
+"""CSC148 Assignment 0 - Object-Oriented Modelling, Part 3 (Tests)
+
+=== Module Description ===
+
+This file contains tests that check that a Course only builds the Sections it
+needs, on synthetic course data.
+"""
+import pytest
+
+from a0_benchmark import generate_courses
+from a0_part3 import Course
+
+
+@pytest.fixture
+def course() -> Course:
+    """A synthetic course with sections in both semesters."""
+    return Course(next(generate_courses(1, seed=148)))
+
+
+def _num_built(course: Course) -> int:
+    """Return the number of sections of <course> that have been built."""
+    return sum(section is not None for section in course._sections)
+
+
+def test_new_course_builds_no_sections(course: Course) -> None:
+    """Test that creating a course builds none of its sections."""
+    assert len(course._sections) > 1
+    assert _num_built(course) == 0
+
+
+def test_lookup_section_builds_one(course: Course) -> None:
+    """Test that lookup_section builds only the section it returns, once."""
+    raw_section_data = course.to_record().sections[-1]
+    section = course.lookup_section(raw_section_data.name, raw_section_data.session)
+    assert section.section_code == raw_section_data.name
+    assert _num_built(course) == 1
+    assert course.lookup_section(raw_section_data.name, raw_section_data.session) is section
+    assert course.lookup_section('LEC9999', raw_section_data.session) is None
+    assert _num_built(course) == 1
+
+
+def test_get_semester_sections_builds_semester(course: Course) -> None:
+    """Test that get_semester_sections builds only the sections of its semester."""
+    sessions = [raw_section_data.session for raw_section_data in course.to_record().sections]
+    sections = course.get_semester_sections('20239')
+    assert 0 < len(sections) == sessions.count('20239') < len(sessions)
+    assert all(section.semester_code == '20239' for section in sections)
+    assert _num_built(course) == len(sections)
+
+
+def test_sections_is_a_copy(course: Course) -> None:
+    """Test that sections builds every section, and that mutating the list it returns
+    does not change the course."""
+    sections = course.sections
+    assert _num_built(course) == len(sections)
+    sections.clear()
+    assert len(course.sections) == len(course._sections)
+    assert course.sections[0] is course.sections[0]
+
+
+if __name__ == '__main__':
+    pytest.main(['a0_part3_test.py', '-v'])
@@ -21,13 +21,22 @@ This file contains the code for a class representing a timetable.
 For Part 4 of this assignment, you'll complete the implementation of this class.
 """
 from __future__ import annotations
+from datetime import time
 import json
+from typing import Iterable, Iterator, TextIO
 
-from python_ta.contracts import check_contracts
+from a0_contracts import check_contracts
+import a0_stats
 
+from a0_decode import load_course_records
+
+from a0_part1 import MINUTES_PER_DAY, Timeslot, intern_timeslot, minute_of_day
 from a0_part2 import Section
 from a0_part3 import Course
 
+# The semester codes that a Timetable can be created for.
+SEMESTERS = ('20239', '20241')
+
 
 @check_contracts
 class Timetable:
@@ -39,11 +48,37 @@ class Timetable:
             have been selected for this timetable. Note that a course can have more than one
             section selected (e.g., CSC148H1 might have both a LEC and TUT section).
 
+    Private Instance Attributes:
+        - _sections: every section in this timetable, in the order they were added
+        - _occupied: the union of the occupancy bitmasks of the sections in this timetable
+        - _lec_counts: maps each course in self.courses to its number of LEC sections
+        - _counts: the counts that make this timetable invalid when not zero:
+            - 'conflicts': the number of pairs of sections in this timetable that conflict
+            - 'wrong_semester': the number of sections in this timetable that are not in
+              self.semester_code
+            - 'bad_courses': the number of courses in self.courses that do not have
+              exactly one LEC section
+
+    The private attributes are kept up to date by add_section_by_code and remove_section,
+    so that is_valid and can_add_section do not have to look at every section. This means
+    that self.courses should only be changed through these two methods.
+
     Representation Invariants:
         - self.semester_code in ['20239', '20241']
+        - len(self._sections) == sum(len(sections) for sections in self.courses.values())
+        - self._lec_counts.keys() == self.courses.keys()
+        - self._counts.keys() == {'conflicts', 'wrong_semester', 'bad_courses'}
+        - 0 <= self._counts['conflicts'] <= len(self._sections) * (len(self._sections) - 1) // 2
+        - self._counts['conflicts'] == 0 or self._occupied != 0
+        - 0 <= self._counts['wrong_semester'] <= len(self._sections)
+        - self._counts['bad_courses'] == sum(1 for n in self._lec_counts.values() if n != 1)
     """
     semester_code: str
     courses: dict[Course, list[Section]]  # Maps course to a list of sections
+    _sections: list[Section]
+    _occupied: int
+    _lec_counts: dict[Course, int]
+    _counts: dict[str, int]
 
     def __init__(self, semester_code: str) -> None:
         """Initialize an empty timetable for the given semester.
@@ -51,8 +86,6 @@ class Timetable:
         Preconditions:
             - semester_code in ['20239', '20241']
 
-        This function is provided for you, and you should not change it.
-
         >>> my_timetable = Timetable('20239')
         >>> my_timetable.semester_code
         '20239'
@@ -61,6 +94,10 @@ class Timetable:
         """
         self.semester_code = semester_code
         self.courses = {}
+        self._sections = []
+        self._occupied = 0
+        self._lec_counts = {}
+        self._counts = {'conflicts': 0, 'wrong_semester': 0, 'bad_courses': 0}
 
     def add_section_by_code(self, course: Course, section_code: str) -> bool:
         """Add a new section to this timetable from the given course and section_code.
@@ -83,7 +120,56 @@ class Timetable:
 
         if course not in self.courses:
             self.courses[course] = []
+            self._lec_counts[course] = 0
+            self._counts['bad_courses'] += 1
         self.courses[course].append(section)
+
+        if section.mask & self._occupied:
+            self._counts['conflicts'] += sum(1 for other in self._sections
+                                             if other.mask & section.mask)
+        self._sections.append(section)
+        self._occupied |= section.mask
+        if section.semester_code != self.semester_code:
+            self._counts['wrong_semester'] += 1
+        if section.section_code.startswith('LEC'):
+            self._lec_counts[course] += 1
+            self._counts['bad_courses'] += _bad_lec_count_change(
+                self._lec_counts[course] - 1, self._lec_counts[course])
+        return True
+
+    def remove_section(self, course: Course, section_code: str) -> bool:
+        """Remove the section of the given course with the given section_code from this
+        timetable.
+
+        Return True if a section was removed, and False if this timetable does not contain
+        such a section. If the section was added more than once, only one copy is removed.
+        A course with no sections left is removed from self.courses.
+        """
+        sections = self.courses.get(course, [])
+        section = next((s for s in sections if s.section_code == section_code), None)
+
+        if section is None:
+            return False
+
+        sections.remove(section)
+        self._sections.remove(section)
+        if section.section_code.startswith('LEC'):
+            self._lec_counts[course] -= 1
+            self._counts['bad_courses'] += _bad_lec_count_change(
+                self._lec_counts[course] + 1, self._lec_counts[course])
+        if not sections:
+            del self.courses[course]
+            if self._lec_counts.pop(course) != 1:
+                self._counts['bad_courses'] -= 1
+
+        if section.semester_code != self.semester_code:
+            self._counts['wrong_semester'] -= 1
+        if section.mask & self._occupied:
+            self._counts['conflicts'] -= sum(1 for other in self._sections
+                                             if other.mask & section.mask)
+        self._occupied = 0
+        for remaining in self._sections:
+            self._occupied |= remaining.mask
         return True
 
     def get_all_sections(self) -> list[Section]:
@@ -91,53 +177,121 @@ class Timetable:
 
         The sections may be returned in any order.
         """
-        res = []
-        for sections in self.courses.values():
-            res.extend(sections)
-        return res
+        return list(self._sections)
+
+    def get_occupied_mask(self) -> int:
+        """Return the weekly occupancy bitmask of this timetable, i.e. the union of the
+        masks of its sections (see a0_part2.Section)."""
+        return self._occupied
 
     def is_valid(self) -> bool:
         """Return whether this timetable is valid or not.
 
         See the assignment handout for the definition of "valid" for a timetable.
+        Each of the three conditions is tracked as sections are added and removed,
+        so this takes constant time.
+        """
+        # Condition 1: every section is in this timetable's semester ('wrong_semester')
+        # Condition 2: no two sections conflict ('conflicts')
+        # Condition 3: every course has exactly one LEC section ('bad_courses')
+        return not any(self._counts.values())
 
-        Hints:
-            - Reuse functions you've already implemented!
-            - There are three different conditions that need to be checked for timetable validity.
-              We recommend implementing and testing each condition separately, and encourage you
-              to use helper functions/methods here!
+    def can_add_section(self, course: Course, section_code: str) -> bool:
+        """Return whether this timetable would be valid after adding the section of the
+        given course with the given section_code (using add_section_by_code).
+
+        Return False if there is no such section. This timetable is not changed.
         """
-        my_sections = self.get_all_sections()
+        section = course.lookup_section(section_code, self.semester_code)
 
-        # Condition 1
-        for section in my_sections:
-            if section.semester_code != self.semester_code:
-                return False
+        if not section or self._counts['wrong_semester'] or self._counts['conflicts'] \
+                or section.mask & self._occupied:
+            return False
 
-        # Condition 2
-        section_set = set()
+        lec_count = self._lec_counts.get(course, 0)
+        new_lec_count = lec_count + section.section_code.startswith('LEC')
+        num_bad_courses = self._counts['bad_courses'] + (new_lec_count != 1)
+        if course in self._lec_counts and lec_count != 1:
+            num_bad_courses -= 1
+        return num_bad_courses == 0
+
+    def free_windows(self, min_minutes: int = 1, day_start: time = time(0),
+                     day_end: time | None = None, days: Iterable[int] = range(1, 6)
+                     ) -> list[Timeslot]:
+        """Return the free windows of this timetable: the longest stretches of time on each
+        of <days>, between <day_start> and <day_end> (the end of the day, i.e. midnight,
+        when None), during which no section of this timetable meets, and that last at
+        least <min_minutes> minutes.
+
+        The windows are returned by day, then by start time, as interned Timeslots (see
+        intern_timeslot). A time cannot be midnight at the end of the day, so a window
+        that lasts until then ends at 23:59 instead; as no meeting can end after 23:59,
+        no section fits in the last minute anyway. The timeslots of the sections
+        are sorted and merged into busy intervals, so this takes O(n log n) time for n
+        timeslots. A section fits in this timetable exactly when all of its timeslots lie
+        within the windows, which Course.get_compatible_sections can use as a pre-filter.
 
-        for new_section in my_sections:
-            if not section_set:
-                section_set.add(new_section)
-                continue
+        Preconditions:
+            - min_minutes >= 1
+            - day_end is None or day_start < day_end
 
-            for existing_section in section_set:
-                if new_section.has_conflict(existing_section):
-                    return False
-            section_set.add(new_section)
-
-        # Condition 3
-        for course in self.courses:
-            sections = self.courses[course]
-            cnt = 0
-            for section in sections:
-                if section.section_code.startswith('LEC'):
-                    cnt += 1
-            if cnt != 1:
-                return False
+        >>> course = Course({'name': 'Intro', 'code': 'CSC108H1', 'sections': [
+        ...     {'name': 'LEC0101', 'deliveryModes': [{'session': '20239'}],
+        ...      'meetingTimes': [{'start': {'day': 1, 'millisofday': 36000000},
+        ...                        'end': {'day': 1, 'millisofday': 43200000}}]}]})
+        >>> my_timetable = Timetable('20239')
+        >>> my_timetable.add_section_by_code(course, 'LEC0101')
+        True
+        >>> windows = my_timetable.free_windows(60, time(9), time(17), [1, 2])
+        >>> [(window.day, window.start.hour, window.end.hour) for window in windows]
+        [(1, 9, 10), (1, 12, 17), (2, 9, 17)]
+        """
+        busy = sorted((timeslot.day, minute_of_day(timeslot.start), minute_of_day(timeslot.end))
+                      for section in self._sections for timeslot in section.timeslots)
+        first = minute_of_day(day_start)
+        last = MINUTES_PER_DAY if day_end is None else minute_of_day(day_end)
+        windows = []
+
+        i = 0
+        for day in sorted(set(days)):
+            while i < len(busy) and busy[i][0] < day:
+                i += 1
+            free_from = first
+            while i < len(busy) and busy[i][0] == day:
+                _, start, end = busy[i]
+                if min(start, last) - free_from >= min_minutes:
+                    windows.append(_window(day, free_from, min(start, last)))
+                free_from = max(free_from, end)
+                i += 1
+            if last - free_from >= min_minutes:
+                windows.append(_window(day, free_from, last))
+
+        return windows
+
+
+def _window(day: int, start: int, end: int) -> Timeslot:
+    """Return the interned timeslot of a free window on <day> from minute <start> to
+    minute <end> of the day, ending at 23:59 if <end> is the end of the day.
+
+    >>> _window(1, 540, MINUTES_PER_DAY)
+    Timeslot(1, datetime.time(9, 0), datetime.time(23, 59))
+    """
+    end = min(end, MINUTES_PER_DAY - 1)
+    return intern_timeslot(day, time(start // 60, start % 60), time(end // 60, end % 60))
 
-        return True
+
+def _bad_lec_count_change(old_count: int, new_count: int) -> int:
+    """Return the change in the number of courses without exactly one LEC section when
+    a course's number of LEC sections changes from <old_count> to <new_count>.
+
+    >>> _bad_lec_count_change(0, 1)
+    -1
+    >>> _bad_lec_count_change(1, 2)
+    1
+    >>> _bad_lec_count_change(2, 3)
+    0
+    """
+    return (new_count != 1) - (old_count != 1)
 
 
 def load_courses_data(file: str) -> dict[str, Course]:
@@ -162,6 +316,135 @@ def load_courses_data(file: str) -> dict[str, Course]:
     return all_courses
 
 
+def load_courses_data_fast(file: str) -> dict[str, Course]:
+    """Return a dictionary of Courses corresponding to the data found in <file>, like
+    load_courses_data, but decoding <file> with the fastest available JSON backend
+    straight into compact records (see a0_decode).
+
+    Preconditions:
+        - file is a valid JSON file in the same format as for load_courses_data
+    """
+    with a0_stats.phase('load_courses_data_fast.decode'):
+        records = load_course_records(file)
+    with a0_stats.phase('load_courses_data_fast.construct'):
+        return {record.code: Course(record) for record in records}
+
+
+def iter_courses_data(file: str, codes: Iterable[str] | None = None,
+                      semester_code: str | None = None) -> Iterator[Course]:
+    """Yield the Courses corresponding to the data found in <file>, one at a time.
+
+    Unlike load_courses_data, the file is parsed incrementally, so only one course's
+    raw data (plus a bounded read buffer) is held in memory at once.
+
+    If <codes> is given, only courses whose code is in <codes> are yielded.
+    If <semester_code> is given, only courses with at least one section in that
+    semester are yielded (with all of their sections). Courses that are filtered
+    out are skipped before any Section objects are created for them.
+
+    Preconditions:
+        - file is a valid JSON file in the same format as for load_courses_data
+    """
+    if codes is not None:
+        codes = set(codes)
+
+    with open(file) as f:
+        for raw_course_data in _iter_json_list(f):
+            if codes is not None and raw_course_data['code'] not in codes:
+                continue
+            if semester_code is not None and all(
+                    raw_section['deliveryModes'][0]['session'] != semester_code
+                    for raw_section in raw_course_data['sections']):
+                continue
+            yield Course(raw_course_data)
+    return None
+
+
+def _iter_json_list(f: TextIO, chunk_size: int = 1 << 16) -> Iterator[dict]:
+    """Yield the elements of the JSON list of objects stored in <f>, one at a time.
+
+    <f> is read <chunk_size> characters at a time. When an element does not fit in
+    the buffer, the next read is doubled in size so that large elements are decoded
+    in O(log n) attempts rather than once per chunk.
+
+    Raise ValueError (a json.JSONDecodeError) if <f> does not hold a JSON list, if its
+    elements are not separated by single commas, or if anything but whitespace follows
+    the list, as json.load would.
+
+    Preconditions:
+        - the elements of the JSON list in f are all JSON objects
+        - chunk_size > 0
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+    # What comes next: '[' (the start of the list), 'first' (an element or ']'),
+    # 'element' (an element, after a comma), 'separator' (',' or ']') or 'end' (the end
+    # of the data, after the list).
+    expecting = '['
+
+    while not (eof and expecting == 'end' and pos == len(buffer)):
+        while pos < len(buffer) and buffer[pos] in ' \t\r\n':
+            pos += 1
+
+        if pos < len(buffer):
+            following = _after_punctuation(expecting, buffer, pos)
+            if following is not None:
+                expecting, pos = following, pos + 1
+                continue
+            try:
+                element, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                yield element
+                expecting = 'separator'
+                continue
+        elif eof and expecting == 'end':
+            continue
+        elif eof:
+            raise json.JSONDecodeError('Unexpected end of data', buffer, pos)
+
+        # The buffer holds no complete element: drop what has been consumed and read more.
+        chunk = f.read(max(chunk_size, len(buffer) - pos))
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        eof = not chunk
+    return None
+
+
+def _after_punctuation(expecting: str, buffer: str, pos: int) -> str | None:
+    """Return what comes next in a JSON list (as in _iter_json_list) after the '[', ','
+    or ']' at buffer[pos], when <expecting> came next before it. Return None if an
+    element starts at buffer[pos] instead.
+
+    Raise ValueError (a json.JSONDecodeError) if buffer[pos] cannot come next.
+
+    >>> _after_punctuation('separator', '[{},{}]', 3)
+    'element'
+    >>> _after_punctuation('element', '[{},{}]', 4) is None
+    True
+    """
+    char = buffer[pos]
+    if expecting == 'end':
+        raise json.JSONDecodeError('Extra data', buffer, pos)
+    if expecting == '[':
+        if char != '[':
+            raise json.JSONDecodeError('Expecting a list', buffer, pos)
+        return 'first'
+    if char == ']' and expecting != 'element':
+        return 'end'
+    if expecting == 'separator' and char == ',':
+        return 'element'
+    if expecting == 'separator' or char in ',]':
+        raise json.JSONDecodeError(
+            "Expecting ',' delimiter" if expecting == 'separator' else 'Expecting value',
+            buffer, pos)
+    return None
+
+
 def run_part4_example() -> None:
     """Run an example for Part 4.
 
@@ -197,8 +480,9 @@ if __name__ == '__main__':
     import python_ta
 
     python_ta.check_all(config={
-        'allowed-io': ['load_courses_data'],
+        'allowed-io': ['load_courses_data', 'iter_courses_data'],
         'max-line-length': 100,
-        'extra-imports': ['json', 'a0_part2', 'a0_part3'],
+        'extra-imports': ['datetime', 'json', 'typing', 'a0_contracts', 'a0_stats', 'a0_decode',
+                          'a0_part1', 'a0_part2', 'a0_part3'],
         'max-nested-blocks': 4
     })
@@ -0,0 +1,227 @@
+"""CSC148 Assignment 0 - Object-Oriented Modelling, Part 4 (Tests)
+
+=== Module Description ===
+
+This file contains tests for the Timetable class. The course data is built
+inline so that these tests do not depend on the files in data/.
+"""
+import io
+import json
+from datetime import time
+
+import pytest
+
+from a0_part1 import intern_timeslot
+from a0_part3 import Course
+from a0_part4 import Timetable, _iter_json_list, iter_courses_data, load_courses_data
+
+
+def _section_data(name: str, semester: str, meetings: list[tuple[int, int, int]]) -> dict:
+    """Return raw section data for <meetings>, given as (day, start hour, end hour)."""
+    return {
+        'name': name,
+        'deliveryModes': [{'session': semester}],
+        'meetingTimes': [{'start': {'day': day, 'millisofday': start * 3600000},
+                          'end': {'day': day, 'millisofday': end * 3600000}}
+                         for day, start, end in meetings]
+    }
+
+
+@pytest.fixture
+def csc148() -> Course:
+    """A course with two lectures and a tutorial in the fall semester."""
+    return Course({'name': 'Introduction to Computer Science', 'code': 'CSC148H1', 'sections': [
+        _section_data('LEC0101', '20239', [(1, 10, 11), (3, 9, 11)]),
+        _section_data('LEC0201', '20239', [(2, 13, 15)]),
+        _section_data('TUT0101', '20239', [(3, 11, 12)]),
+        _section_data('LEC0101', '20241', [(1, 10, 11)])
+    ]})
+
+
+@pytest.fixture
+def csc236() -> Course:
+    """A course with a lecture that conflicts with CSC148H1 LEC0101."""
+    return Course({'name': 'Introduction to the Theory of Computation', 'code': 'CSC236H1',
+                   'sections': [
+                       _section_data('LEC0101', '20239', [(3, 10, 12)]),
+                       _section_data('LEC0201', '20239', [(4, 10, 12)])
+                   ]})
+
+
+def test_add_section_by_code_semester(csc148: Course) -> None:
+    """Test that sections are looked up in the timetable's semester only."""
+    fall = Timetable('20239')
+    winter = Timetable('20241')
+
+    assert fall.add_section_by_code(csc148, 'TUT0101')
+    assert not winter.add_section_by_code(csc148, 'TUT0101')
+    assert winter.add_section_by_code(csc148, 'LEC0101')
+    assert winter.courses[csc148][0].semester_code == '20241'
+
+
+def test_get_compatible_sections(csc148: Course, csc236: Course) -> None:
+    """Test that only same-semester, non-conflicting sections are compatible."""
+    other = csc236.lookup_section('LEC0101', '20239')
+    compatible = csc148.get_compatible_sections(other)
+
+    assert [section.section_code for section in compatible] == ['LEC0201']
+
+
+def test_is_valid_back_to_back(csc148: Course) -> None:
+    """Test that back-to-back sections of the same course form a valid timetable."""
+    timetable = Timetable('20239')
+    timetable.add_section_by_code(csc148, 'LEC0101')
+    timetable.add_section_by_code(csc148, 'TUT0101')
+
+    assert timetable.is_valid()
+
+
+def test_is_valid_conflict(csc148: Course, csc236: Course) -> None:
+    """Test that a timetable with two overlapping lectures is not valid."""
+    timetable = Timetable('20239')
+    timetable.add_section_by_code(csc148, 'LEC0101')
+    timetable.add_section_by_code(csc236, 'LEC0101')
+
+    assert not timetable.is_valid()
+
+
+def test_is_valid_two_lectures(csc148: Course) -> None:
+    """Test that a timetable with two non-conflicting lectures of one course is not valid."""
+    timetable = Timetable('20239')
+    timetable.add_section_by_code(csc148, 'LEC0101')
+    timetable.add_section_by_code(csc148, 'LEC0201')
+
+    assert not timetable.is_valid()
+
+
+def test_is_valid_same_section_twice(csc148: Course) -> None:
+    """Test that adding the same section twice makes the timetable invalid."""
+    timetable = Timetable('20239')
+    timetable.add_section_by_code(csc148, 'LEC0101')
+    timetable.add_section_by_code(csc148, 'LEC0101')
+
+    assert not timetable.is_valid()
+
+
+def test_remove_section_restores_validity(csc148: Course, csc236: Course) -> None:
+    """Test that removing a conflicting section makes the timetable valid again,
+    and that a course with no sections left is removed from the timetable."""
+    timetable = Timetable('20239')
+    timetable.add_section_by_code(csc148, 'LEC0101')
+    timetable.add_section_by_code(csc236, 'LEC0101')
+
+    assert not timetable.remove_section(csc236, 'LEC0201')
+    assert timetable.remove_section(csc236, 'LEC0101')
+    assert timetable.is_valid()
+    assert list(timetable.courses) == [csc148]
+    assert timetable.remove_section(csc148, 'LEC0101')
+    assert timetable.courses == {}
+    assert timetable.is_valid()
+
+
+def test_can_add_section(csc148: Course, csc236: Course) -> None:
+    """Test that can_add_section agrees with adding the section and calling is_valid,
+    without changing the timetable."""
+    timetable = Timetable('20239')
+    timetable.add_section_by_code(csc148, 'LEC0101')
+
+    assert timetable.can_add_section(csc148, 'TUT0101')
+    assert not timetable.can_add_section(csc148, 'LEC0201')
+    assert not timetable.can_add_section(csc236, 'LEC0101')
+    assert not timetable.can_add_section(csc236, 'TUT0101')
+    assert timetable.can_add_section(csc236, 'LEC0201')
+    assert len(timetable.get_all_sections()) == 1
+
+    timetable.add_section_by_code(csc236, 'LEC0201')
+    assert timetable.is_valid()
+
+
+def test_free_windows(csc148: Course, csc236: Course) -> None:
+    """Test that free_windows merges overlapping and back-to-back sections, and applies
+    the minimum length and the day bounds."""
+    timetable = Timetable('20239')
+    for course, section_code in [(csc148, 'LEC0101'), (csc148, 'TUT0101'),
+                                 (csc236, 'LEC0101')]:
+        timetable.add_section_by_code(course, section_code)
+
+    windows = timetable.free_windows(60, time(9), time(18), days=[1, 3])
+    assert [(window.day, window.start, window.end) for window in windows] == [
+        (1, time(9), time(10)), (1, time(11), time(18)), (3, time(12), time(18))]
+
+    windows = timetable.free_windows(120, time(9), time(18), days=[1, 3])
+    assert [(window.day, window.start, window.end) for window in windows] == [
+        (1, time(11), time(18)), (3, time(12), time(18))]
+    assert len(Timetable('20239').free_windows()) == 5
+
+
+def test_free_windows_end_of_day() -> None:
+    """Test that the default end of the day is exclusive midnight, so that the last hour
+    of the day is a one-hour window, and that windows are interned timeslots."""
+    late = Course({'name': 'Late', 'code': 'LAT100H1', 'sections': [
+        _section_data('LEC0101', '20239', [(1, 9, 23)])]})
+    timetable = Timetable('20239')
+    timetable.add_section_by_code(late, 'LEC0101')
+
+    windows = timetable.free_windows(60, time(9), days=[1])
+    assert [(window.day, window.start, window.end) for window in windows] == \
+        [(1, time(23), time(23, 59))]
+    assert windows[0] is intern_timeslot(1, time(23), time(23, 59))
+
+
+def test_get_compatible_sections_windows(csc148: Course, csc236: Course) -> None:
+    """Test that passing the free windows of a timetable to get_compatible_sections only
+    keeps the compatible sections that fit in the timetable."""
+    timetable = Timetable('20239')
+    timetable.add_section_by_code(csc236, 'LEC0201')
+    other = csc236.lookup_section('LEC0101', '20239')
+
+    compatible = csc148.get_compatible_sections(other, timetable.free_windows())
+    assert [section.section_code for section in compatible] == ['LEC0201']
+    compatible = csc148.get_compatible_sections(other, timetable.free_windows(day_end=time(14)))
+    assert compatible == []
+
+
+def test_iter_courses_data_filters(tmp_path) -> None:
+    """Test that the streaming loader yields the same courses as load_courses_data,
+    and that its code and semester filters are applied."""
+    raw_courses = [
+        {'name': 'Fall course', 'code': 'AAA100H1',
+         'sections': [_section_data('LEC0101', '20239', [(1, 9, 10)])]},
+        {'name': 'Winter course', 'code': 'BBB100H1',
+         'sections': [_section_data('LEC0101', '20241', [(2, 9, 10)])]}
+    ]
+    file = tmp_path / 'courses.json'
+    file.write_text(json.dumps(raw_courses, indent=2))
+
+    assert [course.code for course in iter_courses_data(str(file))] == \
+        list(load_courses_data(str(file)))
+    assert [course.code for course in iter_courses_data(str(file), semester_code='20241')] == \
+        ['BBB100H1']
+    assert [course.code for course in iter_courses_data(str(file), codes={'AAA100H1'})] == \
+        ['AAA100H1']
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 1 << 16])
+@pytest.mark.parametrize('indent', [None, 2])
+def test_iter_json_list_chunks(chunk_size: int, indent: int | None) -> None:
+    """Test that the elements of a list are decoded whatever the chunk size, including
+    an element much larger than a chunk."""
+    elements = [{}, {'a': [1, 2, {'b': 'c, ]'}]},
+                {'code': 'BIG100H1', 'sections': [_section_data('LEC0101', '20239',
+                                                                [(1, 9, 10)])] * 20}]
+    for data in [elements, elements[:1], []]:
+        f = io.StringIO(json.dumps(data, indent=indent) + ' \n')
+        assert list(_iter_json_list(f, chunk_size)) == data
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 1 << 16])
+@pytest.mark.parametrize('text', ['[,,{}]', '[,]', '[{},]', '[{},,{}]', '[{} {}]', '{}', '[{}',
+                                  '[{},', '', '[{}]]', '[{}] x', '[] []'])
+def test_iter_json_list_invalid(chunk_size: int, text: str) -> None:
+    """Test that a document that is not a valid JSON list raises ValueError."""
+    with pytest.raises(ValueError):
+        list(_iter_json_list(io.StringIO(text), chunk_size))
+
+
+if __name__ == '__main__':
+    pytest.main(['a0_part4_test.py', '-v'])
@@ -0,0 +1,231 @@
+"""CSC148 Assignment 0 - Object-Oriented Modelling, Year Planner
+
+=== Module Description ===
+
+This file contains YearPlanner, which plans a whole year of study: one
+Timetable per semester code, over a catalog shared by every planner.
+
+The catalog (see YearCatalog) is partitioned by semester once, when it is built,
+into the courses offered in each semester, from their section codes alone. The
+occupancy bitmasks of the sections of a course in a semester, grouped by
+teaching method (the same choices as for a0_solver), are computed the first time
+a query needs them, and then kept. Cross-semester queries, such as which courses
+can still be placed in either term, then only combine these bitmasks with the
+occupancy of each timetable, and the Sections of a course that no query reaches
+are never built.
+"""
+from __future__ import annotations
+from typing import Collection, Iterable, NamedTuple
+
+from a0_contracts import check_contracts
+
+from a0_part3 import Course
+from a0_part4 import SEMESTERS, Timetable
+from a0_solver import build_slots
+
+
+class TermLoad(NamedTuple):
+    """The load of one term of a YearPlanner.
+
+    Instance Attributes:
+        - courses: the number of courses with a section in the term
+        - sections: the number of sections in the term
+        - hours: the total number of hours of class per week in the term
+    """
+    courses: int
+    sections: int
+    hours: float
+
+
+@check_contracts
+class YearCatalog:
+    """A course catalog partitioned by semester, shared by YearPlanners.
+
+    Instance Attributes:
+        - semesters: the semester codes of the partitions, in order
+
+    Private Instance Attributes:
+        - _courses: maps each course code to its course
+        - _offered: maps each semester code to the codes of the courses with a LEC
+            section in that semester, in the order of the catalog
+        - _choices: maps each (semester code, course code) pair for which they have
+            been needed to the occupancy bitmasks of the sections of the course in the
+            semester, one list per teaching method it offers
+
+    Representation Invariants:
+        - list(self._offered) == list(self.semesters)
+        - all(course_code in self._offered[semester_code] \
+              for semester_code, course_code in self._choices)
+    """
+    semesters: tuple[str, ...]
+    _courses: dict[str, Course]
+    _offered: dict[str, list[str]]
+    _choices: dict[tuple[str, str], list[list[int]]]
+
+    def __init__(self, courses: Iterable[Course], semesters: Iterable[str] = SEMESTERS) -> None:
+        """Initialize a catalog of <courses>, partitioned into <semesters>.
+
+        Preconditions:
+            - courses does not contain two courses with the same code
+        """
+        self.semesters = tuple(semesters)
+        self._courses = {course.code: course for course in courses}
+        self._offered = {
+            semester_code: [code for code, course in self._courses.items()
+                            if any(section_code.startswith('LEC')
+                                   for section_code in course.get_section_codes(semester_code))]
+            for semester_code in self.semesters}
+        self._choices = {}
+
+    def __contains__(self, course_code: object) -> bool:
+        """Return whether this catalog has a course with the given code."""
+        return course_code in self._courses
+
+    def get_course(self, course_code: str) -> Course | None:
+        """Return the course with the given code, or None if there is no such course."""
+        return self._courses.get(course_code)
+
+    def offered(self, semester_code: str) -> list[str]:
+        """Return the codes of the courses with a LEC section in <semester_code>.
+
+        Return an empty list if <semester_code> is not in self.semesters.
+        """
+        return list(self._offered.get(semester_code, []))
+
+    def placeable(self, semester_code: str, occupied: int,
+                  excluded: Collection[str] = ()) -> list[str]:
+        """Return the codes of the courses not in <excluded> that can be placed in
+        <semester_code> around the occupancy bitmask <occupied>: those with one section of
+        each teaching method they offer in the semester such that no two of these
+        sections conflict, and none of them overlaps <occupied>.
+
+        Return an empty list if <semester_code> is not in self.semesters.
+        """
+        return [code for code in self._offered.get(semester_code, [])
+                if code not in excluded and _fits(self._course_choices(semester_code, code),
+                                                  occupied)]
+
+    def _course_choices(self, semester_code: str, course_code: str) -> list[list[int]]:
+        """Return the occupancy bitmasks of the sections of the course with <course_code>
+        in <semester_code>, one list per teaching method it offers, computing them the
+        first time they are needed.
+
+        Preconditions:
+            - course_code in self._offered[semester_code]
+        """
+        key = (semester_code, course_code)
+        if key not in self._choices:
+            self._choices[key] = [[section.mask for section in sections]
+                                  for _, sections in build_slots([self._courses[course_code]],
+                                                                 semester_code)]
+        return self._choices[key]
+
+
+@check_contracts
+class YearPlanner:
+    """A plan for a year of study: one timetable per semester of a shared catalog.
+
+    Instance Attributes:
+        - catalog: the catalog the sections of this plan are taken from
+        - timetables: maps each semester code of the catalog to the timetable of that term
+
+    Representation Invariants:
+        - list(self.timetables) == list(self.catalog.semesters)
+        - all(timetable.semester_code == code for code, timetable in self.timetables.items())
+    """
+    catalog: YearCatalog
+    timetables: dict[str, Timetable]
+
+    def __init__(self, catalog: YearCatalog) -> None:
+        """Initialize an empty plan over <catalog>.
+
+        Preconditions:
+            - all(code in ['20239', '20241'] for code in catalog.semesters)
+        """
+        self.catalog = catalog
+        self.timetables = {code: Timetable(code) for code in catalog.semesters}
+
+    def add_section_by_code(self, semester_code: str, course_code: str, section_code: str) -> bool:
+        """Add the section of the given course with the given section_code to the
+        timetable of <semester_code>.
+
+        Return True if the section was added, and False if there is no such semester,
+        course, or section of the course in that semester. As for Timetable, a section
+        can be added even if it makes this plan invalid.
+        """
+        course = self.catalog.get_course(course_code)
+        if course is None or semester_code not in self.timetables:
+            return False
+        return self.timetables[semester_code].add_section_by_code(course, section_code)
+
+    def remove_section(self, semester_code: str, course_code: str, section_code: str) -> bool:
+        """Remove the section of the given course with the given section_code from the
+        timetable of <semester_code>.
+
+        Return True if a section was removed, and False if there is no such section in
+        that timetable.
+        """
+        course = self.catalog.get_course(course_code)
+        if course is None or semester_code not in self.timetables:
+            return False
+        return self.timetables[semester_code].remove_section(course, section_code)
+
+    def planned_courses(self) -> dict[str, list[str]]:
+        """Return a dictionary that maps each semester code to the codes of the courses
+        with a section in the timetable of that term."""
+        return {code: [course.code for course in timetable.courses]
+                for code, timetable in self.timetables.items()}
+
+    def term_load(self) -> dict[str, TermLoad]:
+        """Return a dictionary that maps each semester code to the load of that term."""
+        return {code: TermLoad(len(timetable.courses), len(sections),
+                               sum((section.duration() for section in sections), 0.0))
+                for code, timetable in self.timetables.items()
+                for sections in [timetable.get_all_sections()]}
+
+    def placeable_courses(self) -> dict[str, list[str]]:
+        """Return a dictionary that maps each semester code to the codes of the courses
+        that can still be added to the timetable of that term: the courses not yet
+        planned in any term that have one section of each teaching method they offer in
+        that term, none of which conflict with each other or with the sections already
+        in the timetable.
+
+        The courses of each term are listed in the order of the catalog.
+        """
+        planned = {code for codes in self.planned_courses().values() for code in codes}
+        return {code: self.catalog.placeable(code, timetable.get_occupied_mask(), planned)
+                for code, timetable in self.timetables.items()}
+
+    def is_valid(self) -> bool:
+        """Return whether this plan is valid: every timetable is valid, and no course has
+        sections in more than one term."""
+        planned = [code for codes in self.planned_courses().values() for code in codes]
+        return len(set(planned)) == len(planned) \
+            and all(timetable.is_valid() for timetable in self.timetables.values())
+
+
+def _fits(choices: list[list[int]], occupied: int) -> bool:
+    """Return whether one bitmask can be taken from each list of <choices> so that no two
+    of the bitmasks taken, and none of them and <occupied>, overlap.
+
+    >>> _fits([[0b0011, 0b1100], [0b0110, 0b1000]], 0b0000)
+    True
+    >>> _fits([[0b0011, 0b1100], [0b0110, 0b1000]], 0b1000)
+    False
+    """
+    if not choices:
+        return True
+    return any(not mask & occupied and _fits(choices[1:], occupied | mask)
+               for mask in choices[0])
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
+
+    import python_ta
+
+    python_ta.check_all(config={
+        'max-line-length': 100,
+        'extra-imports': ['typing', 'a0_contracts', 'a0_part3', 'a0_part4', 'a0_solver'],
+    })
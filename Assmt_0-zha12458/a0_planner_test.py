@@ -0,0 +1,148 @@
+"""CSC148 Assignment 0 - Object-Oriented Modelling, Year Planner (Tests)
+
+=== Module Description ===
+
+This file contains tests that compare the queries of YearPlanner with checking
+every course of a small synthetic catalog directly.
+"""
+import itertools
+
+import pytest
+
+from a0_benchmark import generate_courses
+from a0_part2 import Section
+from a0_part3 import Course
+from a0_part4 import SEMESTERS
+from a0_planner import TermLoad, YearCatalog, YearPlanner
+from a0_solver import build_slots
+
+
+@pytest.fixture(scope='module')
+def catalog() -> YearCatalog:
+    """A catalog of 12 synthetic courses, the first of which is offered in both terms with
+    the same sections."""
+    raw_courses = list(generate_courses(12, seed=148))
+    first_semester = raw_courses[0]['sections'][0]['deliveryModes'][0]['session']
+    raw_courses[0]['sections'] = [
+        dict(section, deliveryModes=[{'session': semester_code}])
+        for semester_code in SEMESTERS for section in raw_courses[0]['sections']
+        if section['deliveryModes'][0]['session'] == first_semester]
+    return YearCatalog([Course(raw) for raw in raw_courses])
+
+
+@pytest.fixture
+def planner(catalog: YearCatalog) -> YearPlanner:
+    """A valid plan with one course in each term: the first course offered in the term
+    that can be placed in it, with the first sections that fit."""
+    planner = YearPlanner(catalog)
+    for semester_code in catalog.semesters:
+        for code in catalog.offered(semester_code):
+            sections = _first_fit(catalog.get_course(code), semester_code, 0)
+            if sections is not None and code not in planner.planned_courses()['20239']:
+                for section in sections:
+                    assert planner.add_section_by_code(semester_code, code,
+                                                       section.section_code)
+                break
+    return planner
+
+
+def _first_fit(course: Course, semester_code: str, occupied: int) -> tuple[Section] | None:
+    """Return the first choice of sections of <course> that can be placed in
+    <semester_code> around <occupied>, by trying every choice of its sections, or None if
+    there is no such choice."""
+    slots = build_slots([course], semester_code)
+    if not slots:
+        return None
+    for sections in itertools.product(*(sections for _, sections in slots)):
+        if _disjoint([occupied] + [section.mask for section in sections]):
+            return sections
+    return None
+
+
+def _disjoint(masks: list[int]) -> bool:
+    """Return whether no two of <masks> overlap."""
+    union = 0
+    for mask in masks:
+        if union & mask:
+            return False
+        union |= mask
+    return True
+
+
+def test_sections_built_lazily() -> None:
+    """Test that a catalog builds no Section when it is created, that it lists the same
+    offered courses as build_slots, and that placeable only builds the Sections of the
+    courses it checks."""
+    courses = [Course(raw) for raw in generate_courses(12, seed=148)]
+    catalog = YearCatalog(courses)
+    assert all(section is None for course in courses for section in course._sections)
+
+    for semester_code in SEMESTERS:
+        assert catalog.offered(semester_code) == [
+            course.code for course in courses if build_slots([course], semester_code)]
+
+    courses = [Course(raw) for raw in generate_courses(12, seed=148)]
+    catalog = YearCatalog(courses)
+    checked = catalog.offered('20239')[0]
+    catalog.placeable('20239', 0, {course.code for course in courses} - {checked})
+    assert [course.code for course in courses
+            if any(section is not None for section in course._sections)] == [checked]
+
+
+def test_placeable_courses_matches_brute_force(catalog: YearCatalog,
+                                               planner: YearPlanner) -> None:
+    """Test that placeable_courses lists exactly the unplanned courses that fit in each
+    term."""
+    planned = {code for codes in planner.planned_courses().values() for code in codes}
+    placeable = planner.placeable_courses()
+    for semester_code, timetable in planner.timetables.items():
+        occupied = 0
+        for section in timetable.get_all_sections():
+            occupied |= section.mask
+        assert timetable.get_occupied_mask() == occupied
+        expected = [code for code in catalog.offered(semester_code)
+                    if code not in planned
+                    and _first_fit(catalog.get_course(code), semester_code, occupied) is not None]
+        assert placeable[semester_code] == expected
+
+
+def test_term_load(planner: YearPlanner) -> None:
+    """Test that term_load counts the courses, sections and hours of each term."""
+    for semester_code, load in planner.term_load().items():
+        sections = planner.timetables[semester_code].get_all_sections()
+        assert load == TermLoad(1, len(sections),
+                                sum(section.duration() for section in sections))
+
+
+def test_add_and_remove(catalog: YearCatalog, planner: YearPlanner) -> None:
+    """Test that sections are added to and removed from the timetable of their term."""
+    assert planner.is_valid()
+    assert not planner.add_section_by_code('20239', 'NOT A COURSE', 'LEC0101')
+    assert not planner.add_section_by_code('20251', catalog.offered('20239')[0], 'LEC0101')
+
+    code = catalog.offered('20239')[-1]
+    section_code = catalog.get_course(code).get_semester_sections('20239')[0].section_code
+    assert planner.add_section_by_code('20239', code, section_code)
+    assert code in planner.planned_courses()['20239']
+    assert code not in planner.placeable_courses()['20241']
+
+    assert planner.remove_section('20239', code, section_code)
+    assert not planner.remove_section('20239', code, section_code)
+    assert planner.is_valid()
+
+
+def test_course_in_both_terms(catalog: YearCatalog) -> None:
+    """Test that a plan with a course in both terms is not valid."""
+    code = next(code for code in catalog.offered('20239') if code in catalog.offered('20241'))
+    planner = YearPlanner(catalog)
+    for semester_code in SEMESTERS:
+        lec = next(section
+                   for section in catalog.get_course(code).get_semester_sections(semester_code)
+                   if section.section_code.startswith('LEC'))
+        assert planner.is_valid()
+        assert planner.add_section_by_code(semester_code, code, lec.section_code)
+    assert not planner.is_valid()
+
+
+if __name__ == '__main__':
+    pytest.main(['a0_planner_test.py', '-v'])
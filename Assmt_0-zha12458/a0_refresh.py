@@ -0,0 +1,122 @@
+"""CSC148 Assignment 0 - Object-Oriented Modelling, Incremental Catalog Refresh
+
+=== Module Description ===
+
+This file contains a function that refreshes a loaded catalog (a dictionary of
+Courses like the one returned by load_courses_data) from a newly published
+catalog file, by patching it instead of rebuilding it.
+
+Each course of the new file is compared with the record of the loaded course
+with the same code (see Course.to_record). Only the courses that were
+added, removed or changed are created or dropped; every other Course object,
+with the sections it has already built, is kept as it is. Derived structures
+keyed by Course identity, such as Timetables, therefore stay valid for the
+untouched courses, and SectionIndexes passed to refresh_catalog are patched to
+match.
+"""
+from __future__ import annotations
+from typing import Iterable, NamedTuple
+
+from a0_catalog_index import SectionIndex
+from a0_decode import CourseRecord, load_course_records
+from a0_part3 import Course
+
+
+class CatalogDiff(NamedTuple):
+    """The differences between a loaded catalog and a new catalog.
+
+    Instance Attributes:
+        - added: the codes of the courses only in the new catalog, in its order
+        - removed: the codes of the courses only in the loaded catalog, in its order
+        - changed: the codes of the courses in both catalogs whose content differs, in
+            the order of the new catalog
+        - unchanged: the number of courses in both catalogs with the same content
+    """
+    added: list[str]
+    removed: list[str]
+    changed: list[str]
+    unchanged: int
+
+
+def diff_catalog(courses: dict[str, Course], records: Iterable[CourseRecord]) -> CatalogDiff:
+    """Return the differences between the loaded catalog <courses> and the new catalog
+    with the course records <records>.
+
+    Raise ValueError if the same course code appears more than once in <records>.
+    """
+    return _diff(courses, _by_code(records))
+
+
+def refresh_catalog(courses: dict[str, Course], file: str,
+                    indexes: Iterable[SectionIndex] = ()) -> CatalogDiff:
+    """Update the loaded catalog <courses> in place to match the catalog in <file>, and
+    return the differences that were applied.
+
+    Added and changed courses get new Course objects, removed courses are deleted from
+    <courses>, and every other Course object is kept. Each SectionIndex in <indexes>,
+    which must index exactly the courses of <courses>, is updated in the same way.
+
+    Raise ValueError, without changing anything, if the same course code appears more
+    than once in <file>.
+
+    Preconditions:
+        - file is a valid JSON file in the same format as for load_courses_data
+    """
+    new_records = _by_code(load_course_records(file))
+    diff = _diff(courses, new_records)
+    indexes = list(indexes)
+
+    for code in diff.removed:
+        del courses[code]
+    for index in indexes:
+        for code in diff.removed + diff.changed:
+            index.remove_course(code)
+
+    for code in diff.changed + diff.added:
+        course = courses[code] = Course(new_records[code])
+        for index in indexes:
+            index.add_course(course)
+
+    return diff
+
+
+def _by_code(records: Iterable[CourseRecord]) -> dict[str, CourseRecord]:
+    """Return a dictionary mapping the code of each record of <records> to that record.
+
+    Raise ValueError if the same course code appears more than once.
+    """
+    res = {}
+    for record in records:
+        if record.code in res:
+            raise ValueError(f'duplicate course code {record.code!r}')
+        res[record.code] = record
+    return res
+
+
+def _diff(courses: dict[str, Course], new_records: dict[str, CourseRecord]) -> CatalogDiff:
+    """Return the differences between the loaded catalog <courses> and the new catalog
+    whose records are the values of <new_records>."""
+    added, changed = [], []
+    unchanged = 0
+    for code, record in new_records.items():
+        if code not in courses:
+            added.append(code)
+        elif courses[code].to_record() != record:
+            changed.append(code)
+        else:
+            unchanged += 1
+
+    removed = [course_code for course_code in courses if course_code not in new_records]
+    return CatalogDiff(added, removed, changed, unchanged)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
+
+    import python_ta
+
+    python_ta.check_all(config={
+        'max-line-length': 100,
+        'extra-imports': ['typing', 'a0_catalog_index', 'a0_decode', 'a0_part3'],
+    })
@@ -0,0 +1,82 @@
+"""CSC148 Assignment 0 - Object-Oriented Modelling, Incremental Catalog Refresh (Tests)
+
+=== Module Description ===
+
+This file contains tests for refresh_catalog, on small synthetic catalogs.
+"""
+from datetime import time
+import json
+import os
+
+import pytest
+
+from a0_benchmark import generate_courses
+from a0_catalog_index import SectionIndex
+from a0_part2 import Section
+from a0_part3 import Course
+from a0_part4 import load_courses_data
+from a0_refresh import refresh_catalog
+
+
+def _write(file: str, raw_courses_data: list[dict]) -> None:
+    """Write <raw_courses_data> to <file> as a JSON catalog."""
+    with open(file, 'w') as f:
+        json.dump(raw_courses_data, f)
+
+
+def _keys(pairs: list[tuple[Course, Section]]) -> set[tuple[str, str, str]]:
+    """Return the (course code, section code, semester code) of each pair of <pairs>."""
+    return {(course.code, section.section_code, section.semester_code)
+            for course, section in pairs}
+
+
+@pytest.fixture
+def raw_courses_data() -> list[dict]:
+    """The raw data of a small synthetic catalog."""
+    return list(generate_courses(6, seed=148))
+
+
+def test_refresh(tmp_path: str, raw_courses_data: list[dict]) -> None:
+    """Test that only added, removed and changed courses are replaced, and that the
+    index matches an index of the refreshed catalog."""
+    file = os.path.join(tmp_path, 'courses.json')
+    _write(file, raw_courses_data)
+    courses = load_courses_data(file)
+    index = SectionIndex(courses.values())
+    kept = courses[raw_courses_data[1]['code']]
+
+    changed = raw_courses_data[0]
+    meeting = changed['sections'][0]['meetingTimes'][0]
+    meeting['end']['millisofday'] += 30 * 60 * 1000
+    removed = raw_courses_data.pop(2)
+    added = next(generate_courses(7, seed=149)) | {'code': 'NEW100H1'}
+    _write(file, raw_courses_data + [added])
+
+    diff = refresh_catalog(courses, file, [index])
+    assert diff == (['NEW100H1'], [removed['code']], [changed['code']], 4)
+    assert courses[raw_courses_data[1]['code']] is kept
+    assert list(courses) == [c['code'] for c in raw_courses_data] + ['NEW100H1']
+
+    expected = SectionIndex(courses.values())
+    for semester in ('20239', '20241'):
+        for start, end in [(time(9), time(21)), (time(10, 10), time(14))]:
+            # The sections of changed and added courses reuse the numbers of removed ones.
+            assert _keys(index.find_within(semester, range(1, 6), start, end)) \
+                == _keys(expected.find_within(semester, range(1, 6), start, end))
+    assert len(index) == len(expected)
+
+
+def test_refresh_duplicate(tmp_path: str, raw_courses_data: list[dict]) -> None:
+    """Test that a new catalog with a duplicate course code changes nothing."""
+    file = os.path.join(tmp_path, 'courses.json')
+    _write(file, raw_courses_data)
+    courses = load_courses_data(file)
+    _write(file, raw_courses_data + raw_courses_data[:1])
+
+    with pytest.raises(ValueError):
+        refresh_catalog(courses, file)
+    assert list(courses) == [c['code'] for c in raw_courses_data]
+
+
+if __name__ == '__main__':
+    pytest.main(['a0_refresh_test.py', '-v'])
@@ -0,0 +1,398 @@
+"""CSC148 Assignment 0 - Object-Oriented Modelling, Registration Load Replay
+
+=== Module Description ===
+
+This file contains a load-testing harness that replays a trace of student
+registration actions against a course catalog, with several concurrent workers,
+and reports the throughput, the latency percentiles of each kind of action, and
+the memory growth.
+
+A trace is a list of Actions, each made by one student on their timetable for
+one semester:
+
+    - 'add_section_by_code': add the section <section_code> of <course_code>
+    - 'get_compatible_sections': find the sections of <course_code> compatible
+      with the section the student added last
+    - 'is_valid': check whether the timetable is valid
+
+Traces are generated offline from a catalog (see generate_trace), and can be
+saved to and replayed from CSV files. The actions of each student are replayed
+in order, by the same worker; the students are split across <workers> threads
+(which share the catalog) or worker processes (which each receive a copy of
+it, as in a0_batch).
+
+Run this module to replay a synthetic trace against a synthetic catalog loaded
+with load_courses_data, and write the report as JSON (see replay), e.g.
+
+    A0_CONTRACTS=off python a0_replay.py --courses 10000 --students 2000 \\
+        --mode process --workers 4 --output replay.json
+
+Run it with --check to run its doctests and PythonTA instead. As for
+a0_benchmark, contract checking should normally be turned off (see
+a0_contracts) when measuring performance.
+"""
+from __future__ import annotations
+import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import csv
+import json
+import os
+import platform
+import random
+import tempfile
+import time
+from typing import NamedTuple
+
+import a0_contracts
+from a0_stats import PERCENTILES, percentiles_us
+
+from a0_batch import init_worker, worker_catalog
+from a0_benchmark import write_catalog
+from a0_part2 import Section
+from a0_part3 import Course
+from a0_part4 import SEMESTERS, Timetable, load_courses_data
+
+# The kinds of actions in a trace.
+OPERATIONS = ('add_section_by_code', 'get_compatible_sections', 'is_valid')
+
+# The number of courses a generated student tries to register in.
+_COURSES_PER_STUDENT = 5
+
+# The file that the current memory use of this process is read from, where available.
+_STATM_FILE = '/proc/self/statm'
+
+
+class Action(NamedTuple):
+    """One registration action of a trace.
+
+    Instance Attributes:
+        - student: the number of the student making the action
+        - semester_code: the semester of the student's timetable
+        - operation: the kind of action, one of OPERATIONS
+        - course_code: the course acted on, or '' for 'is_valid'
+        - section_code: the section added, or '' for the other operations
+    """
+    student: int
+    semester_code: str
+    operation: str
+    course_code: str = ''
+    section_code: str = ''
+
+
+def generate_trace(courses: dict[str, Course], num_students: int, seed: int = 0) -> list[Action]:
+    """Return a synthetic trace of the registration of <num_students> students in the
+    catalog <courses>.
+
+    Each student picks a random semester and a few random courses, and tries to register
+    in those offered in that semester. For each course, the student looks for the
+    sections compatible with the last section they added (once they have added one),
+    adds a LEC section and possibly a TUT section, and checks whether their timetable is
+    valid. The actions of the students are interleaved at random. The same seed always
+    generates the same trace.
+
+    Every 'get_compatible_sections' action comes after an 'add_section_by_code' action
+    of the same student, so no action of the trace is skipped by replay.
+
+    Preconditions:
+        - courses != {}
+    """
+    rng = random.Random(seed)
+    course_list = list(courses.values())
+    student_actions = []
+
+    for student in range(num_students):
+        semester_code = rng.choice(SEMESTERS)
+        actions: list[Action] = []
+        for course in rng.sample(course_list, min(_COURSES_PER_STUDENT, len(course_list))):
+            if course.get_semester_sections(semester_code):
+                actions.extend(_course_actions(rng, Action(student, semester_code, 'is_valid'),
+                                               course, actions))
+        if actions:
+            student_actions.append(actions[::-1])
+
+    # Interleave the students by repeatedly taking the next action of a random student.
+    trace = []
+    while student_actions:
+        i = rng.randrange(len(student_actions))
+        trace.append(student_actions[i].pop())
+        if not student_actions[i]:
+            student_actions[i] = student_actions[-1]
+            student_actions.pop()
+    return trace
+
+
+def _course_actions(rng: random.Random, check: Action, course: Course,
+                    actions: list[Action]) -> list[Action]:
+    """Return the actions of a student registering in <course>, after their earlier
+    <actions>, ending with the timetable check <check> of the student.
+
+    The student first looks for the sections of <course> compatible with the last section
+    they added, if <actions> adds a section.
+
+    Preconditions:
+        - course.get_semester_sections(check.semester_code) != []
+    """
+    res = []
+    if any(action.operation == 'add_section_by_code' for action in actions):
+        res.append(check._replace(operation='get_compatible_sections', course_code=course.code))
+    sections = course.get_semester_sections(check.semester_code)
+    for method in ('LEC', 'TUT'):
+        codes = [section.section_code for section in sections
+                 if section.section_code.startswith(method)]
+        if codes:
+            res.append(check._replace(operation='add_section_by_code', course_code=course.code,
+                                      section_code=rng.choice(codes)))
+    res.append(check)
+    return res
+
+
+def write_trace(file: str, trace: list[Action]) -> None:
+    """Write <trace> to the CSV file <file>, with a header row of the field names."""
+    with open(file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(Action._fields)
+        writer.writerows(trace)
+
+
+def read_trace(file: str) -> list[Action]:
+    """Return the trace in the CSV file <file>, as written by write_trace.
+
+    Raise ValueError if <file> does not have the header row of write_trace, or has an
+    action with an unknown operation.
+    """
+    with open(file, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        if tuple(next(reader, ())) != Action._fields:
+            raise ValueError(f'{file} is not a trace file')
+
+        trace = []
+        for line_number, (student, semester_code, operation, course_code,
+                          section_code) in enumerate(reader, 2):
+            if operation not in OPERATIONS:
+                raise ValueError(f'{file}, line {line_number}: unknown operation {operation!r}')
+            trace.append(Action(int(student), semester_code, operation, course_code,
+                                section_code))
+        return trace
+
+
+def replay(trace: list[Action], courses: dict[str, Course], workers: int = 1,
+           mode: str = 'thread') -> dict:
+    """Replay <trace> against the catalog <courses> and return the report.
+
+    The students of <trace> are split across <workers> threads (mode 'thread') or worker
+    processes (mode 'process'). With workers <= 1, the trace is replayed in this thread.
+    In mode 'process', the time taken is that of the slowest worker, not counting the
+    time to start the workers and send them the catalog.
+
+    The report is a dictionary with:
+        - 'environment': the Python version, contract sample rate, mode and workers
+        - 'actions': the number of actions replayed, and 'seconds' the time they took
+        - 'actions_per_s': the throughput
+        - 'latency': maps each operation to {'calls', 'mean_us'} and its percentiles
+          (see a0_stats.PERCENTILES), e.g. 'p99_us'
+        - 'memory_growth_kb': the growth of the memory use of the processes replaying
+          the trace, or None if it cannot be measured on this platform
+
+    'get_compatible_sections' actions of a student who has not added a section yet are
+    skipped, and not counted.
+
+    Raise KeyError if <trace> refers to a course that is not in <courses>.
+
+    Preconditions:
+        - mode in ['thread', 'process']
+    """
+    shards: list[list[Action]] = [[] for _ in range(max(1, workers))]
+    for action in trace:
+        shards[action.student % len(shards)].append(action)
+
+    if mode == 'process' and workers > 1:
+        latencies, seconds, memory_growth = _replay_in_processes(shards, courses)
+    else:
+        memory_before = _memory_kb()
+        start = time.perf_counter()
+        if workers > 1:
+            with ThreadPoolExecutor(workers) as executor:
+                latencies = list(executor.map(replay_actions, shards, [courses] * workers))
+        else:
+            latencies = [replay_actions(shards[0], courses)]
+        seconds = time.perf_counter() - start
+        memory_growth = _memory_growth(memory_before, _memory_kb())
+
+    latency = {}
+    for operation in OPERATIONS:
+        latency[operation] = _summary(sorted(ns for shard_latencies in latencies
+                                             for ns in shard_latencies[operation]))
+    actions = sum(stats['calls'] for stats in latency.values())
+
+    return {
+        'environment': {'python': platform.python_version(),
+                        'contract_sample_rate': a0_contracts.SAMPLE_RATE,
+                        'mode': mode,
+                        'workers': workers},
+        'actions': actions,
+        'seconds': seconds,
+        'actions_per_s': actions / seconds if seconds else 0.0,
+        'latency': latency,
+        'memory_growth_kb': memory_growth
+    }
+
+
+def replay_actions(actions: list[Action], courses: dict[str, Course]) -> dict[str, list[int]]:
+    """Replay <actions>, in order, against the catalog <courses>, each student starting
+    with empty timetables, and return a dictionary that maps each operation to the
+    latency of each of its actions, in nanoseconds.
+
+    See replay for which actions are skipped. Raise KeyError if <actions> refers to a
+    course that is not in <courses>.
+    """
+    latencies: dict[str, list[int]] = {operation: [] for operation in OPERATIONS}
+    timetables: dict[tuple[int, str], Timetable] = {}
+    last_sections: dict[tuple[int, str], Section] = {}
+
+    for action in actions:
+        key = (action.student, action.semester_code)
+        timetable = timetables.get(key)
+        if timetable is None:
+            timetable = timetables[key] = Timetable(action.semester_code)
+
+        if action.operation == 'add_section_by_code':
+            course = courses[action.course_code]
+            start = time.perf_counter_ns()
+            added = timetable.add_section_by_code(course, action.section_code)
+            latencies[action.operation].append(time.perf_counter_ns() - start)
+            section = course.lookup_section(action.section_code, action.semester_code) \
+                if added else None
+            if section is not None:
+                last_sections[key] = section
+        elif action.operation == 'get_compatible_sections':
+            course = courses[action.course_code]
+            if key in last_sections:
+                start = time.perf_counter_ns()
+                course.get_compatible_sections(last_sections[key])
+                latencies[action.operation].append(time.perf_counter_ns() - start)
+        else:
+            start = time.perf_counter_ns()
+            timetable.is_valid()
+            latencies[action.operation].append(time.perf_counter_ns() - start)
+
+    return latencies
+
+
+def _summary(samples: list[int]) -> dict[str, float]:
+    """Return the number, mean and percentiles of the sorted latencies <samples> (in
+    nanoseconds), in microseconds.
+
+    >>> _summary([1000, 2000, 3000, 4000])
+    {'calls': 4, 'mean_us': 2.5, 'p50_us': 2.0, 'p90_us': 4.0, 'p99_us': 4.0}
+    """
+    return {'calls': len(samples),
+            'mean_us': sum(samples) / len(samples) / 1e3 if samples else 0.0,
+            **percentiles_us(samples)}
+
+
+def _replay_in_processes(shards: list[list[Action]], courses: dict[str, Course]
+                         ) -> tuple[list[dict[str, list[int]]], float, int | None]:
+    """Replay each of <shards> in its own worker process against the catalog <courses>,
+    and return the latencies of each shard (as returned by replay_actions), the time
+    taken by the slowest worker, and the total memory growth of the workers (None if it
+    cannot be measured).
+    """
+    with ProcessPoolExecutor(len(shards), initializer=init_worker,
+                             initargs=(courses,)) as executor:
+        results = list(executor.map(_replay_in_worker, shards))
+    # The workers time their own shards, so that starting them is not included.
+    seconds = max(shard_seconds for _, shard_seconds, _ in results)
+    growths = [growth for _, _, growth in results if growth is not None]
+    return ([shard_latencies for shard_latencies, _, _ in results], seconds,
+            sum(growths) if len(growths) == len(results) else None)
+
+
+def _memory_kb() -> int | None:
+    """Return the memory use (resident set size) of this process in kilobytes, or None if
+    it cannot be read on this platform."""
+    if not os.path.exists(_STATM_FILE):
+        return None
+    with open(_STATM_FILE) as f:
+        pages = int(f.read().split()[1])
+    return pages * os.sysconf('SC_PAGE_SIZE') // 1024
+
+
+def _memory_growth(before: int | None, after: int | None) -> int | None:
+    """Return the growth of the memory use from <before> to <after> kilobytes, or None if
+    either of them is None."""
+    if before is None or after is None:
+        return None
+    return after - before
+
+
+def _replay_in_worker(actions: list[Action]) -> tuple[dict[str, list[int]], float, int | None]:
+    """Replay <actions> against the catalog of this worker process, and return their
+    latencies (as for replay_actions), the time they took, and the memory growth of this
+    process in kilobytes (or None if it cannot be measured)."""
+    memory_before = _memory_kb()
+    start = time.perf_counter()
+    latencies = replay_actions(actions, worker_catalog())
+    seconds = time.perf_counter() - start
+    return latencies, seconds, _memory_growth(memory_before, _memory_kb())
+
+
+def _main(args: argparse.Namespace) -> None:
+    """Replay a trace as described by the command-line arguments <args> (see the module
+    docstring), write the report and print a summary of it."""
+    with tempfile.TemporaryDirectory() as directory:
+        catalog_file = os.path.join(directory, f'courses-{args.courses}.json')
+        write_catalog(catalog_file, args.courses, args.seed)
+        catalog = load_courses_data(catalog_file)
+
+    if args.trace:
+        trace = read_trace(args.trace)
+    else:
+        trace = generate_trace(catalog, args.students, args.seed)
+        if args.save_trace:
+            write_trace(args.save_trace, trace)
+
+    report = replay(trace, catalog, args.workers, args.mode)
+    with open(args.output, 'w') as output:
+        json.dump(report, output, indent=2)
+
+    print(f"{report['actions']} actions in {report['seconds']:.3f} s "
+          f"({report['actions_per_s']:.0f} actions/s), "
+          f"memory growth {report['memory_growth_kb']} KB")
+    for name, result in report['latency'].items():
+        print(f"{name:<24} {result['calls']:>8} calls "
+              + ' '.join(f"p{p} {result[f'p{p}_us']:>9.2f} us" for p in PERCENTILES))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Replay registration traffic against the '
+                                                 'CSC148 A0 course model.')
+    parser.add_argument('--courses', type=int, default=10_000,
+                        help='the number of courses in the synthetic catalog')
+    parser.add_argument('--students', type=int, default=1_000,
+                        help='the number of students in the synthetic trace')
+    parser.add_argument('--trace', help='a trace file to replay instead of a synthetic trace')
+    parser.add_argument('--save-trace', help='a file to save the synthetic trace to')
+    parser.add_argument('--mode', choices=['thread', 'process'], default='thread')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='replay_output.json',
+                        help='the JSON file to write the report to')
+    parser.add_argument('--check', action='store_true',
+                        help='run the doctests and PythonTA on this module instead')
+    command_line = parser.parse_args()
+
+    if command_line.check:
+        import doctest
+        doctest.testmod()
+
+        import python_ta
+
+        python_ta.check_all(config={
+            'max-line-length': 100,
+            'extra-imports': ['argparse', 'concurrent.futures', 'csv', 'json', 'os', 'platform',
+                              'random', 'tempfile', 'time', 'typing', 'a0_contracts', 'a0_stats',
+                              'a0_batch', 'a0_benchmark', 'a0_part2', 'a0_part3', 'a0_part4'],
+            'allowed-io': ['write_trace', 'read_trace', '_memory_kb', '_main']
+        })
+    else:
+        _main(command_line)
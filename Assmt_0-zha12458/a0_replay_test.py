@@ -0,0 +1,89 @@
+"""CSC148 Assignment 0 - Object-Oriented Modelling, Registration Load Replay (Tests)
+
+=== Module Description ===
+
+This file contains tests for the synthetic traces of a0_replay, and for replaying
+them with threads and processes on a small synthetic catalog.
+"""
+import os
+
+import pytest
+
+from a0_benchmark import generate_courses
+from a0_part3 import Course
+from a0_replay import OPERATIONS, Action, generate_trace, read_trace, replay, write_trace
+
+
+@pytest.fixture(scope='module')
+def courses() -> dict[str, Course]:
+    """A catalog of 40 synthetic courses."""
+    return {course.code: course
+            for course in (Course(raw) for raw in generate_courses(40, seed=148))}
+
+
+@pytest.fixture(scope='module')
+def trace(courses: dict[str, Course]) -> list[Action]:
+    """A synthetic trace of 12 students."""
+    return generate_trace(courses, 12, seed=148)
+
+
+def test_generate_trace(courses: dict[str, Course], trace: list[Action]) -> None:
+    """Test that a generated trace is reproducible, and that every student uses one
+    semester and starts by adding a section of a course offered in it."""
+    assert generate_trace(courses, 12, seed=148) == trace
+    assert {action.student for action in trace} <= set(range(12))
+
+    for student in {action.student for action in trace}:
+        actions = [action for action in trace if action.student == student]
+        assert len({action.semester_code for action in actions}) == 1
+        assert actions[0].operation == 'add_section_by_code'
+        for action in actions:
+            if action.operation == 'add_section_by_code':
+                assert courses[action.course_code].lookup_section(
+                    action.section_code, action.semester_code) is not None
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_compatible_after_add(courses: dict[str, Course], seed: int) -> None:
+    """Test that every compatible-section query of a trace comes after an add of the same
+    student, so that replay skips no action."""
+    trace = generate_trace(courses, 12, seed)
+    added = set()
+    for action in trace:
+        if action.operation == 'add_section_by_code':
+            added.add(action.student)
+        elif action.operation == 'get_compatible_sections':
+            assert action.student in added
+
+    assert replay(trace, courses)['actions'] == len(trace)
+
+
+def test_trace_file(tmp_path: str, trace: list[Action]) -> None:
+    """Test that a trace is read back from its file as it was written."""
+    file = os.path.join(tmp_path, 'trace.csv')
+    write_trace(file, trace)
+    assert read_trace(file) == trace
+
+    with open(file, 'a') as f:
+        f.write('0,20239,drop_section,CSC148H1,LEC0101\n')
+    with pytest.raises(ValueError):
+        read_trace(file)
+
+
+@pytest.mark.parametrize('mode, workers', [('thread', 1), ('thread', 3), ('process', 2)])
+def test_replay(courses: dict[str, Course], trace: list[Action], mode: str,
+                workers: int) -> None:
+    """Test that every action of the trace is replayed and reported."""
+    report = replay(trace, courses, workers, mode)
+    assert report['environment']['mode'] == mode
+    assert report['actions'] == len(trace)
+    assert report['actions_per_s'] > 0
+
+    for operation in OPERATIONS:
+        stats = report['latency'][operation]
+        assert stats['calls'] == sum(action.operation == operation for action in trace)
+        assert 0 <= stats['p50_us'] <= stats['p90_us'] <= stats['p99_us']
+
+
+if __name__ == '__main__':
+    pytest.main(['a0_replay_test.py', '-v'])
@@ -0,0 +1,218 @@
+"""CSC148 Assignment 0 - Object-Oriented Modelling, Timetable Snapshots
+
+=== Module Description ===
+
+This file contains functions that save Timetables to, and restore them from,
+compact append-only snapshot files.
+
+A timetable is saved as a reference into a course catalog rather than as its
+Course and Section objects: its semester code followed by the (course code,
+section code) pair of each of its sections, in the order they were added. This
+is the same timetable request format as in a0_batch, e.g.
+
+    ('20239', [('CSC148H1', 'LEC0101'), ('CSC148H1', 'TUT0101')])
+
+A snapshot file is a UTF-8 text file whose first line is SNAPSHOT_HEADER, and
+which holds one timetable per line:
+
+    20239 CSC148H1:LEC0101 CSC148H1:TUT0101
+
+Timetables are restored by looking their sections up in a loaded catalog (e.g.,
+the dictionary returned by load_courses_data), one line at a time. Every line,
+including the last one, ends with a newline, so a record cut off by an interrupted
+write is detected: it is rejected when reading, and removed by the next append.
+"""
+from __future__ import annotations
+import os
+import shutil
+import tempfile
+from typing import Iterable, Iterator, Mapping
+
+from a0_part3 import Course
+from a0_part4 import Timetable
+
+# The first line of every snapshot file.
+SNAPSHOT_HEADER = 'A0 timetables v1'
+
+# The number of bytes read at a time when looking for the end of the last complete line
+# of a snapshot file.
+_TAIL_SIZE = 4096
+
+
+def timetable_request(timetable: Timetable) -> tuple[str, list[tuple[str, str]]]:
+    """Return the timetable request for <timetable>: its semester code, and the (course
+    code, section code) pair of each of its sections, in the order they were added.
+    """
+    codes = {}
+    for course, sections in timetable.courses.items():
+        for course_section in sections:
+            codes[id(course_section)] = course.code
+    return timetable.semester_code, [(codes[id(section)], section.section_code)
+                                     for section in timetable.get_all_sections()]
+
+
+def restore_timetable(request: tuple[str, list[tuple[str, str]]],
+                      courses: Mapping[str, Course]) -> Timetable:
+    """Return the timetable of <request>, with the sections looked up in <courses>.
+
+    Raise ValueError if a course of <request> is not in <courses>, or does not have the
+    section in the semester of <request>.
+    """
+    semester_code, selections = request
+    timetable = Timetable(semester_code)
+    for course_code, section_code in selections:
+        course = courses.get(course_code)
+        if course is None:
+            raise ValueError(f'unknown course {course_code!r}')
+        if not timetable.add_section_by_code(course, section_code):
+            raise ValueError(f'{course_code} has no section {section_code} in {semester_code}')
+    return timetable
+
+
+def format_request(request: tuple[str, list[tuple[str, str]]]) -> str:
+    """Return the snapshot line (without the newline) of the timetable request <request>.
+
+    Raise ValueError if a code is empty or contains whitespace or ':'.
+
+    >>> format_request(('20239', [('CSC148H1', 'LEC0101'), ('CSC148H1', 'TUT0101')]))
+    '20239 CSC148H1:LEC0101 CSC148H1:TUT0101'
+    """
+    semester_code, selections = request
+    codes = [semester_code] + [code for selection in selections for code in selection]
+    for checked_code in codes:
+        # str.split() == [code] exactly when code is non-empty and has no whitespace.
+        if checked_code.split() != [checked_code] or ':' in checked_code:
+            raise ValueError(f'invalid code {checked_code!r}')
+
+    return ' '.join([semester_code] + [f'{course_code}:{section_code}'
+                                       for course_code, section_code in selections])
+
+
+def parse_request(line: str) -> tuple[str, list[tuple[str, str]]]:
+    """Return the timetable request of the snapshot line <line>.
+
+    Raise ValueError if <line> is not a valid snapshot line.
+
+    >>> parse_request('20239 CSC148H1:LEC0101 CSC148H1:TUT0101\\n')
+    ('20239', [('CSC148H1', 'LEC0101'), ('CSC148H1', 'TUT0101')])
+    """
+    words = line.split()
+    if not words:
+        raise ValueError('empty snapshot line')
+
+    selections = []
+    for word in words[1:]:
+        course_code, _, section_code = word.partition(':')
+        if not course_code or not section_code:
+            raise ValueError(f'invalid section reference {word!r}')
+        selections.append((course_code, section_code))
+    return words[0], selections
+
+
+def write_timetables(file: str, timetables: Iterable[Timetable]) -> int:
+    """Append <timetables> to the snapshot file <file>, creating it if needed, and
+    return the number of timetables written.
+
+    Raise ValueError if <file> exists but is not a snapshot file.
+    """
+    return write_requests(file, (timetable_request(timetable) for timetable in timetables))
+
+
+def write_requests(file: str, requests: Iterable[tuple[str, list[tuple[str, str]]]]) -> int:
+    """Append the timetable requests <requests> to the snapshot file <file>, creating it
+    if needed, and return the number of requests written.
+
+    Raise ValueError if <file> exists but is not a snapshot file, or if a request has an
+    invalid code (see format_request); <file> is then left unchanged. If the last line
+    of <file> has no newline, it is the incomplete record of an interrupted write, and
+    it is removed before the requests are appended.
+
+    The requests are formatted into a temporary file, one at a time, which is appended
+    to <file> once they are all valid, so the batch is never held in memory.
+    """
+    exists = os.path.exists(file) and os.path.getsize(file) > 0
+    if exists:
+        with open(file, 'rb') as f:
+            if f.readline().rstrip(b'\n') != SNAPSHOT_HEADER.encode('utf-8'):
+                raise ValueError(f'{file} is not a timetable snapshot file')
+
+    count = 0
+    with tempfile.TemporaryFile('w+', encoding='utf-8') as batch:
+        for request in requests:
+            batch.write(format_request(request) + '\n')
+            count += 1
+
+        if exists:
+            _truncate_incomplete_line(file)
+        batch.seek(0)
+        with open(file, 'a', encoding='utf-8') as f:
+            if f.tell() == 0:
+                f.write(SNAPSHOT_HEADER + '\n')
+            shutil.copyfileobj(batch, f)
+    return count
+
+
+def _truncate_incomplete_line(file: str) -> None:
+    """Remove the last line of <file> if it does not end with a newline."""
+    with open(file, 'r+b') as f:
+        end = f.seek(0, os.SEEK_END)
+        while end > 0:
+            start = max(0, end - _TAIL_SIZE)
+            f.seek(start)
+            newline = f.read(end - start).rfind(b'\n')
+            if newline >= 0:
+                f.truncate(start + newline + 1)
+                return
+            end = start
+        f.truncate(0)
+
+
+def read_requests(file: str) -> Iterator[tuple[str, list[tuple[str, str]]]]:
+    """Yield the timetable requests saved in the snapshot file <file>, in order.
+
+    Raise ValueError if <file> is not a snapshot file, or has an invalid line. A last
+    line without a newline is invalid, as it may be the incomplete record of an
+    interrupted write.
+    """
+    with open(file, encoding='utf-8') as f:
+        if f.readline().rstrip('\n') != SNAPSHOT_HEADER:
+            raise ValueError(f'{file} is not a timetable snapshot file')
+
+        for line_number, line in enumerate(f, 2):
+            try:
+                if not line.endswith('\n'):
+                    raise ValueError('incomplete line')
+                request = parse_request(line)
+            except ValueError as error:
+                raise ValueError(f'{file}, line {line_number}: {error}') from error
+            yield request
+    return None
+
+
+def read_timetables(file: str, courses: Mapping[str, Course]) -> Iterator[Timetable]:
+    """Yield the timetables saved in the snapshot file <file>, in order, with their
+    sections looked up in <courses>.
+
+    Raise ValueError if <file> is not a snapshot file, has an invalid line, or refers to
+    a section that is not in <courses>.
+    """
+    for request_number, request in enumerate(read_requests(file)):
+        try:
+            timetable = restore_timetable(request, courses)
+        except ValueError as error:
+            raise ValueError(f'{file}, timetable {request_number}: {error}') from error
+        yield timetable
+    return None
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
+
+    import python_ta
+
+    python_ta.check_all(config={
+        'allowed-io': ['write_requests', '_truncate_incomplete_line', 'read_requests'],
+        'max-line-length': 100,
+        'extra-imports': ['os', 'shutil', 'tempfile', 'typing', 'a0_part3', 'a0_part4'],
+    })
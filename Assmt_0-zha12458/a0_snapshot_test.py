@@ -0,0 +1,129 @@
+"""CSC148 Assignment 0 - Object-Oriented Modelling, Timetable Snapshots (Tests)
+
+=== Module Description ===
+
+This file contains tests for writing and reading timetable snapshot files.
+"""
+import os
+
+import pytest
+
+import a0_snapshot
+from a0_benchmark import generate_courses
+from a0_part3 import Course
+from a0_part4 import Timetable
+from a0_snapshot import (SNAPSHOT_HEADER, format_request, read_requests, read_timetables,
+                         timetable_request, write_requests, write_timetables)
+
+
+@pytest.fixture
+def courses() -> dict[str, Course]:
+    """A small synthetic catalog."""
+    return {raw['code']: Course(raw) for raw in generate_courses(4, seed=148)}
+
+
+def _timetables(courses: dict[str, Course]) -> list[Timetable]:
+    """Return a timetable per semester holding every section of every course of <courses>
+    in that semester, added one course at a time in reverse, then an empty timetable."""
+    res = []
+    for semester in ('20239', '20241'):
+        timetable = Timetable(semester)
+        for course in reversed(list(courses.values())):
+            for section in course.get_semester_sections(semester):
+                timetable.add_section_by_code(course, section.section_code)
+        res.append(timetable)
+    return res + [Timetable('20239')]
+
+
+def test_round_trip(tmp_path: str, courses: dict[str, Course]) -> None:
+    """Test that timetables written in two appends are read back in the same order, with
+    the same sections in the same order."""
+    file = os.path.join(tmp_path, 'timetables.txt')
+    timetables = _timetables(courses)
+    assert write_timetables(file, timetables[:1]) == 1
+    assert write_timetables(file, timetables[1:]) == 2
+
+    with open(file) as f:
+        assert f.readline() == SNAPSHOT_HEADER + '\n'
+    restored = list(read_timetables(file, courses))
+    assert [timetable_request(t) for t in restored] == [timetable_request(t) for t in timetables]
+    assert restored[0].get_all_sections() == timetables[0].get_all_sections()
+
+
+def test_unknown_section(tmp_path: str, courses: dict[str, Course]) -> None:
+    """Test that a reference to a section that is not in the catalog raises ValueError."""
+    file = os.path.join(tmp_path, 'timetables.txt')
+    write_timetables(file, _timetables(courses))
+    del courses[next(iter(courses))]
+
+    with pytest.raises(ValueError, match='timetable 0'):
+        list(read_timetables(file, courses))
+
+
+def test_invalid_batch_not_written(tmp_path: str, courses: dict[str, Course]) -> None:
+    """Test that a batch with an invalid code is not written at all, even in part."""
+    file = os.path.join(tmp_path, 'timetables.txt')
+    write_timetables(file, _timetables(courses)[:1])
+    with open(file) as f:
+        before = f.read()
+
+    with pytest.raises(ValueError):
+        write_requests(file, [('20239', [('CSC148H1', 'LEC0101')]),
+                              ('20239', [('CSC 148', 'LEC0101')])])
+    with open(file) as f:
+        assert f.read() == before
+
+
+def test_incomplete_line(tmp_path: str, courses: dict[str, Course]) -> None:
+    """Test that a last line cut off by an interrupted write is rejected when reading, and
+    removed before the next append."""
+    file = os.path.join(tmp_path, 'timetables.txt')
+    timetables = _timetables(courses)
+    write_timetables(file, timetables[:1])
+    with open(file) as f:
+        complete = f.read()
+    # An interrupted write of timetables[1] that stopped after its first section.
+    line = format_request(timetable_request(timetables[1]))
+    with open(file, 'a') as f:
+        f.write(' '.join(line.split()[:2]))
+
+    with pytest.raises(ValueError, match='incomplete line'):
+        list(read_timetables(file, courses))
+
+    assert write_timetables(file, timetables[1:]) == 2
+    with open(file) as f:
+        assert f.read().startswith(complete)
+    restored = list(read_timetables(file, courses))
+    assert [timetable_request(t) for t in restored] == [timetable_request(t) for t in timetables]
+
+
+def test_truncate_long_incomplete_line(tmp_path: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that an incomplete line longer than the blocks read from the end of the file is
+    removed whole."""
+    monkeypatch.setattr(a0_snapshot, '_TAIL_SIZE', 3)
+    file = os.path.join(tmp_path, 'timetables.txt')
+    write_requests(file, [('20239', [('CSC148H1', 'LEC0101')])])
+    with open(file, 'a') as f:
+        f.write('20241 CSC148H1:LEC0101 CSC148H1:TU')
+
+    assert write_requests(file, [('20241', [('CSC148H1', 'LEC0101')])]) == 1
+    assert list(read_requests(file)) == [('20239', [('CSC148H1', 'LEC0101')]),
+                                         ('20241', [('CSC148H1', 'LEC0101')])]
+
+
+def test_invalid_files(tmp_path: str) -> None:
+    """Test that files that are not snapshot files, and invalid codes, raise ValueError."""
+    file = os.path.join(tmp_path, 'other.txt')
+    with open(file, 'w') as f:
+        f.write('something else\n')
+
+    with pytest.raises(ValueError):
+        write_timetables(file, [])
+    with pytest.raises(ValueError):
+        list(read_timetables(file, {}))
+    with pytest.raises(ValueError):
+        format_request(('20239', [('CSC 148', 'LEC0101')]))
+
+
+if __name__ == '__main__':
+    pytest.main(['a0_snapshot_test.py', '-v'])
@@ -0,0 +1,245 @@
+"""CSC148 Assignment 0 - Object-Oriented Modelling, Timetable Solver
+
+=== Module Description ===
+
+This file contains functions that enumerate and count every valid Timetable
+that can be built from a list of courses in a given semester.
+
+A timetable for the courses takes exactly one section of each teaching method
+(LEC, TUT, PRA) that a course offers in the semester, so that every course has
+exactly one LEC section. The search backtracks over these choices, pruning a
+branch as soon as the chosen sections conflict (using the weekly occupancy
+bitmasks of the sections), and can split the search tree across a process pool.
+Every timetable produced satisfies Timetable.is_valid.
+"""
+from __future__ import annotations
+import collections
+from concurrent.futures import ProcessPoolExecutor
+import itertools
+import os
+from typing import Iterator
+
+from a0_part2 import Section
+from a0_part3 import Course
+from a0_part4 import Timetable
+
+# The teaching methods that a timetable takes one section of, per course.
+TEACHING_METHODS = ('LEC', 'TUT', 'PRA')
+
+# The number of search subtrees handed out per worker process, so that workers that
+# finish small subtrees early can pick up more work.
+_TASKS_PER_PROCESS = 8
+
+# The largest number of timetables a worker process returns at once. A worker that
+# finds more stops there and returns the rest of its search stack, to be continued
+# by a new task, so memory use does not grow with the size of a search subtree.
+_CHUNK_SIZE = 4096
+
+
+def build_slots(courses: list[Course], semester_code: str) -> list[tuple[Course, list[Section]]]:
+    """Return the choices to be made for a timetable of <courses> in <semester_code>.
+
+    Each choice is a (course, sections) pair, where sections are the sections of one
+    teaching method of the course in the semester. The choices are ordered by
+    increasing number of sections, so that the search fails as early as possible.
+    Return an empty list if some course has no LEC section in the semester.
+
+    Preconditions:
+        - courses does not contain the same course twice
+    """
+    slots = []
+    for course in courses:
+        by_method: dict[str, list[Section]] = {}
+        for section in course.get_semester_sections(semester_code):
+            by_method.setdefault(section.section_code[:3], []).append(section)
+
+        if 'LEC' not in by_method:
+            return []
+        for method in TEACHING_METHODS:
+            if method in by_method:
+                slots.append((course, by_method[method]))
+
+    slots.sort(key=lambda slot: len(slot[1]))
+    return slots
+
+
+def count_timetables(courses: list[Course], semester_code: str,
+                     processes: int | None = None) -> int:
+    """Return the number of valid timetables for <courses> in <semester_code>.
+
+    The search is split across <processes> worker processes (os.cpu_count() when None);
+    with processes <= 1 it runs in this process.
+
+    Preconditions:
+        - courses does not contain the same course twice
+    """
+    slots = build_slots(courses, semester_code)
+    if not slots and courses:
+        return 0
+
+    masks = _slot_masks(slots)
+    if processes is None:
+        processes = os.cpu_count() or 1
+    prefixes = _split(masks, processes)
+    if processes <= 1 or len(prefixes) <= 1:
+        return sum(_count(masks, len(prefix), occupied) for prefix, occupied in prefixes)
+
+    with ProcessPoolExecutor(min(processes, len(prefixes))) as executor:
+        counts = executor.map(_count_task, [(masks, len(prefix), occupied)
+                                            for prefix, occupied in prefixes])
+        return sum(counts)
+
+
+def enumerate_timetables(courses: list[Course], semester_code: str,
+                         processes: int | None = None) -> Iterator[Timetable]:
+    """Yield every valid timetable for <courses> in <semester_code>.
+
+    The search is split across <processes> worker processes (os.cpu_count() when None);
+    with processes <= 1 it runs in this process. Workers only return the positions of
+    the chosen sections, at most _CHUNK_SIZE timetables at a time, and the Timetables
+    are built here as they are yielded, in the same order as in this process.
+
+    Preconditions:
+        - courses does not contain the same course twice
+    """
+    slots = build_slots(courses, semester_code)
+    if slots or not courses:
+        masks = _slot_masks(slots)
+        if processes is None:
+            processes = os.cpu_count() or 1
+        prefixes = _split(masks, processes)
+
+        found: Iterator[tuple[int, ...]]
+        if processes <= 1 or len(prefixes) <= 1:
+            found = itertools.chain.from_iterable(_search(masks, *start) for start in prefixes)
+        else:
+            found = _search_in_pool(masks, prefixes, min(processes, len(prefixes)))
+        for choices in found:
+            yield _build_timetable(slots, semester_code, choices)
+    return None
+
+
+def _search_in_pool(masks: list[list[int]], prefixes: list[tuple[tuple[int, ...], int]],
+                    processes: int) -> Iterator[tuple[int, ...]]:
+    """Yield every conflict-free choice of sections for all slots in <masks> that starts
+    with one of <prefixes>, in order, searching with <processes> worker processes.
+
+    Each prefix is searched by a chain of tasks, each returning at most _CHUNK_SIZE
+    choices and the search stack to continue from. At most 2 * processes tasks are
+    pending at once, and the continuation of the oldest task goes first, so that the
+    choices are produced in order.
+    """
+    tasks = ((masks, [start]) for start in prefixes)
+    with ProcessPoolExecutor(processes) as executor:
+        pending = collections.deque(executor.submit(_search_task, first_task)
+                                    for first_task in itertools.islice(tasks, 2 * processes))
+        while pending:
+            found, stack = pending.popleft().result()
+            if stack:
+                pending.appendleft(executor.submit(_search_task, (masks, stack)))
+            else:
+                for task in itertools.islice(tasks, 1):
+                    pending.append(executor.submit(_search_task, task))
+            yield from found
+    return None
+
+
+def _slot_masks(slots: list[tuple[Course, list[Section]]]) -> list[list[int]]:
+    """Return the occupancy bitmasks of the sections of each choice in <slots>."""
+    return [[section.mask for section in sections] for _, sections in slots]
+
+
+def _build_timetable(slots: list[tuple[Course, list[Section]]], semester_code: str,
+                     choices: tuple[int, ...]) -> Timetable:
+    """Return the timetable that takes section choices[i] of each choice slots[i]."""
+    timetable = Timetable(semester_code)
+    for (course, sections), i in zip(slots, choices):
+        timetable.add_section_by_code(course, sections[i].section_code)
+    return timetable
+
+
+def _split(masks: list[list[int]], processes: int) -> list[tuple[tuple[int, ...], int]]:
+    """Return (prefix, occupied) pairs that partition the search over <masks>.
+
+    Each prefix is a conflict-free choice for the first len(prefix) slots, and occupied
+    is the union of the masks of its sections. Prefixes are extended one slot at a time
+    until there are enough of them to keep <processes> workers busy.
+    """
+    prefixes: list[tuple[tuple[int, ...], int]] = [((), 0)]
+    if processes <= 1:
+        return prefixes
+
+    depth = 0
+    while depth < len(masks) and 0 < len(prefixes) < processes * _TASKS_PER_PROCESS:
+        prefixes = [(prefix + (i,), occupied | mask)
+                    for prefix, occupied in prefixes
+                    for i, mask in enumerate(masks[depth]) if not occupied & mask]
+        depth += 1
+    return prefixes
+
+
+def _count(masks: list[list[int]], depth: int, occupied: int) -> int:
+    """Return the number of conflict-free ways to choose a section for each of the slots
+    masks[depth:], given that the chosen sections so far occupy <occupied>.
+    """
+    if depth == len(masks):
+        return 1
+    if depth == len(masks) - 1:
+        return sum(1 for mask in masks[depth] if not occupied & mask)
+    return sum(_count(masks, depth + 1, occupied | mask)
+               for mask in masks[depth] if not occupied & mask)
+
+
+def _search(masks: list[list[int]], prefix: tuple[int, ...],
+            occupied: int) -> Iterator[tuple[int, ...]]:
+    """Yield every conflict-free choice of sections for all slots in <masks> that starts
+    with <prefix>, given that the sections of prefix occupy <occupied>.
+    """
+    depth = len(prefix)
+    if depth == len(masks):
+        yield prefix
+    else:
+        for i, mask in enumerate(masks[depth]):
+            if not occupied & mask:
+                yield from _search(masks, prefix + (i,), occupied | mask)
+    return None
+
+
+def _count_task(task: tuple[list[list[int]], int, int]) -> int:
+    """Run _count on <task> in a worker process."""
+    return _count(*task)
+
+
+def _search_task(task: tuple[list[list[int]], list[tuple[tuple[int, ...], int]]]
+                 ) -> tuple[list[tuple[int, ...]], list[tuple[tuple[int, ...], int]]]:
+    """Continue a search in a worker process, for at most _CHUNK_SIZE choices.
+
+    <task> is (masks, stack), where stack holds the (prefix, occupied) pairs (as for
+    _search) still to be searched, the next one last. Return the choices found, in the
+    same order as _search, and the stack left to search.
+    """
+    masks, stack = task
+    found: list[tuple[int, ...]] = []
+    while stack and len(found) < _CHUNK_SIZE:
+        prefix, occupied = stack.pop()
+        depth = len(prefix)
+        if depth == len(masks):
+            found.append(prefix)
+        else:
+            stack.extend((prefix + (i,), occupied | masks[depth][i])
+                         for i in reversed(range(len(masks[depth])))
+                         if not occupied & masks[depth][i])
+    return found, stack
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
+
+    import python_ta
+
+    python_ta.check_all(config={
+        'max-line-length': 100,
+        'extra-imports': ['collections', 'concurrent.futures', 'itertools', 'os', 'typing',
+                          'a0_part2', 'a0_part3', 'a0_part4'],
+    })
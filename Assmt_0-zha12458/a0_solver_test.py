@@ -0,0 +1,111 @@
+"""CSC148 Assignment 0 - Object-Oriented Modelling, Timetable Solver (Tests)
+
+=== Module Description ===
+
+This file contains tests for the timetable solver. The course data is generated
+inline so that these tests do not depend on the files in data/.
+"""
+import itertools
+import random
+
+import pytest
+
+import a0_solver
+from a0_part3 import Course
+from a0_solver import _search, _search_task, _slot_masks, build_slots, count_timetables, \
+    enumerate_timetables
+
+
+def _random_course(rng: random.Random, code: str, methods: dict[str, int]) -> Course:
+    """Return a course named <code> with methods[m] random one-hour sections of each
+    teaching method m in semester 20239, plus one LEC section in 20241."""
+    sections = []
+    for method, count in methods.items():
+        for i in range(count):
+            day = rng.randint(1, 5)
+            start = rng.randint(9, 17) * 3600000
+            sections.append({'name': f'{method}{i + 101:04}',
+                             'deliveryModes': [{'session': '20239'}],
+                             'meetingTimes': [{'start': {'day': day, 'millisofday': start},
+                                               'end': {'day': day,
+                                                       'millisofday': start + 3600000}}]})
+    sections.append({'name': 'LEC0101', 'deliveryModes': [{'session': '20241'}],
+                     'meetingTimes': [{'start': {'day': 1, 'millisofday': 32400000},
+                                       'end': {'day': 1, 'millisofday': 36000000}}]})
+    return Course({'name': code, 'code': code, 'sections': sections})
+
+
+@pytest.fixture
+def courses() -> list[Course]:
+    """Four courses with a mix of LEC, TUT and PRA sections."""
+    rng = random.Random(148)
+    return [_random_course(rng, 'AAA100H1', {'LEC': 2, 'TUT': 3}),
+            _random_course(rng, 'BBB100H1', {'LEC': 2}),
+            _random_course(rng, 'CCC100H1', {'LEC': 2, 'TUT': 2, 'PRA': 2}),
+            _random_course(rng, 'DDD100H1', {'LEC': 3, 'PRA': 2})]
+
+
+def _brute_force_count(courses: list[Course]) -> int:
+    """Return the number of valid timetables for <courses> in 20239, by comparing the
+    timeslots of every pair of sections in every combination of sections."""
+    slots = build_slots(courses, '20239')
+    total = 0
+    for sections in itertools.product(*(sections for _, sections in slots)):
+        timeslots = [timeslot for section in sections for timeslot in section.timeslots]
+        if all(t1.day != t2.day or t1.end <= t2.start or t2.end <= t1.start
+               for t1, t2 in itertools.combinations(timeslots, 2)):
+            total += 1
+    return total
+
+
+def test_count_matches_brute_force(courses: list[Course]) -> None:
+    """Test that the serial and parallel counts match a brute-force count."""
+    expected = _brute_force_count(courses)
+
+    assert expected > 0
+    assert count_timetables(courses, '20239', processes=1) == expected
+    assert count_timetables(courses, '20239', processes=2) == expected
+
+
+def test_enumerate_timetables_valid(courses: list[Course]) -> None:
+    """Test that every enumerated timetable is valid and takes one section per method, and
+    that the serial and parallel searches produce the same timetables in the same order."""
+    timetables = list(enumerate_timetables(courses[:3], '20239', processes=2))
+
+    assert len(timetables) == count_timetables(courses[:3], '20239', processes=1)
+    for timetable in timetables:
+        assert timetable.is_valid()
+        assert len(timetable.get_all_sections()) == 6
+    assert [timetable.get_all_sections() for timetable in timetables] == \
+        [timetable.get_all_sections()
+         for timetable in enumerate_timetables(courses[:3], '20239', processes=1)]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 5, 4096])
+def test_search_task_chunks(courses: list[Course], chunk_size: int,
+                            monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a search continued from the stack returned by each task finds every
+    choice of _search, in the same order, at most chunk_size choices at a time."""
+    monkeypatch.setattr(a0_solver, '_CHUNK_SIZE', chunk_size)
+    masks = _slot_masks(build_slots(courses, '20239'))
+    found, stack = [], [((), 0)]
+    while stack:
+        chunk, stack = _search_task((masks, stack))
+        assert len(chunk) <= chunk_size
+        found.extend(chunk)
+    assert found == list(_search(masks, (), 0))
+
+
+def test_no_lecture_in_semester(courses: list[Course]) -> None:
+    """Test that there are no timetables when a course has no LEC in the semester."""
+    no_lecture = Course({'name': 'Tutorials only', 'code': 'EEE100H1', 'sections': [
+        {'name': 'TUT0101', 'deliveryModes': [{'session': '20239'}],
+         'meetingTimes': [{'start': {'day': 5, 'millisofday': 0},
+                           'end': {'day': 5, 'millisofday': 3600000}}]}]})
+
+    assert count_timetables(courses + [no_lecture], '20239') == 0
+    assert list(enumerate_timetables(courses + [no_lecture], '20239')) == []
+
+
+if __name__ == '__main__':
+    pytest.main(['a0_solver_test.py', '-v'])
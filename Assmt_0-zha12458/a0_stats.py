@@ -0,0 +1,322 @@
+"""CSC148 Assignment 0 - Object-Oriented Modelling, Instrumentation
+
+=== Module Description ===
+
+This file contains an opt-in instrumentation layer that records the number of
+calls and the latency (total and percentiles) of the hot-path methods listed in
+INSTRUMENTED_METHODS, of the functions listed in INSTRUMENTED_FUNCTIONS, and of
+the phases of the catalog loaders (e.g., JSON decoding vs. Course construction
+in load_courses_data_fast).
+
+Instrumentation is off by default. While it is off, the methods and functions are
+the plain, unwrapped ones and phase() returns a shared do-nothing context manager,
+so the only cost is one global lookup per loader phase. Turn it on for a whole
+program with enable() / disable(), or for a block of code with collecting():
+
+    >>> from datetime import time
+    >>> from a0_part1 import Timeslot
+    >>> with collecting() as stats:
+    ...     _ = Timeslot(1, time(9), time(10)).has_conflict(Timeslot(1, time(9), time(11)))
+    >>> stats['Timeslot.has_conflict']['calls']
+    1
+
+Statistics are recorded per process: calls made in worker processes (e.g., by
+a0_batch or a0_ingest) are not included. Calls made on several threads at once are
+all recorded.
+"""
+from __future__ import annotations
+import contextlib
+import functools
+import importlib
+import random
+import threading
+import time
+from typing import Any, Callable, ContextManager, Iterator
+
+# The methods that are timed while instrumentation is on, as
+# (module name, class name, method name) triples.
+INSTRUMENTED_METHODS = (
+    ('a0_part1', 'Timeslot', 'has_conflict'),
+    ('a0_part2', 'Section', 'has_conflict'),
+    ('a0_part3', 'Course', 'lookup_section'),
+    ('a0_part3', 'Course', 'get_compatible_sections'),
+    ('a0_part4', 'Timetable', 'is_valid'),
+)
+
+# The module-level functions that are timed while instrumentation is on, as (module
+# name, function name) pairs. Only the calls that look the function up in its module
+# while instrumentation is on (e.g., a0_part4.load_courses_data(file)) are timed.
+INSTRUMENTED_FUNCTIONS = (
+    ('a0_part4', 'load_courses_data'),
+)
+
+# The maximum number of latencies kept per name to compute percentiles. Beyond this,
+# a uniform random sample of the latencies is kept (reservoir sampling).
+MAX_SAMPLES = 10_000
+
+# The percentiles reported by get_stats.
+PERCENTILES = (50, 90, 99)
+
+
+class _Recorder:
+    """The call counts and latencies recorded for each name.
+
+    Instance Attributes:
+        - calls: maps each name to its number of recorded calls
+        - total_ns: maps each name to the total latency of its calls, in nanoseconds
+        - samples: maps each name to a sample of at most MAX_SAMPLES of its latencies,
+            in nanoseconds
+    """
+    calls: dict[str, int]
+    total_ns: dict[str, int]
+    samples: dict[str, list[int]]
+
+    def __init__(self) -> None:
+        """Initialize a recorder with nothing recorded."""
+        self.calls = {}
+        self.total_ns = {}
+        self.samples = {}
+
+    def add(self, name: str, latency_ns: int) -> None:
+        """Record one call of <name> that took <latency_ns> nanoseconds."""
+        calls = self.calls.get(name, 0) + 1
+        self.calls[name] = calls
+        self.total_ns[name] = self.total_ns.get(name, 0) + latency_ns
+
+        samples = self.samples.setdefault(name, [])
+        if len(samples) < MAX_SAMPLES:
+            samples.append(latency_ns)
+        else:
+            i = random.randrange(calls)
+            if i < MAX_SAMPLES:
+                samples[i] = latency_ns
+
+    def merge(self, other: _Recorder) -> None:
+        """Add everything recorded by <other> to this recorder."""
+        for name, calls in other.calls.items():
+            self.calls[name] = self.calls.get(name, 0) + calls
+            self.total_ns[name] = self.total_ns.get(name, 0) + other.total_ns[name]
+            self.samples[name] = _merge_samples(self.samples.get(name, []),
+                                                self.calls[name] - calls,
+                                                other.samples[name], calls)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Return the statistics of each name, in the format returned by get_stats."""
+        res = {}
+        for name, calls in self.calls.items():
+            samples = sorted(self.samples[name])
+            res[name] = {'calls': calls,
+                         'total_s': self.total_ns[name] / 1e9,
+                         'mean_us': self.total_ns[name] / calls / 1e3,
+                         **percentiles_us(samples)}
+        return res
+
+
+def percentiles_us(samples: list[int]) -> dict[str, float]:
+    """Return the nearest-rank percentiles of PERCENTILES of the sorted latencies <samples>
+    (in nanoseconds), in microseconds, as e.g. {'p50_us': ..., 'p90_us': ..., ...}.
+
+    The percentiles of no latencies are 0.0.
+
+    >>> percentiles_us([1000, 2000, 3000, 4000])
+    {'p50_us': 2.0, 'p90_us': 4.0, 'p99_us': 4.0}
+    """
+    stats = {}
+    for p in PERCENTILES:
+        rank = max(1, -(-p * len(samples) // 100))
+        stats[f'p{p}_us'] = samples[rank - 1] / 1e3 if samples else 0.0
+    return stats
+
+
+def _merge_samples(samples1: list[int], calls1: int, samples2: list[int],
+                   calls2: int) -> list[int]:
+    """Return a uniform random sample of at most MAX_SAMPLES of the latencies of
+    <calls1> + <calls2> calls, given uniform random samples <samples1> of the latencies
+    of the first <calls1> calls and <samples2> of the other <calls2> calls.
+
+    Each sample is either complete, or has MAX_SAMPLES elements. The number of latencies
+    taken from each sample follows the share of the calls it comes from.
+    """
+    if len(samples1) + len(samples2) <= MAX_SAMPLES:
+        return samples1 + samples2
+
+    # Which of the calls a uniform sample of MAX_SAMPLES of all the calls would pick.
+    num1 = sum(1 for i in random.sample(range(calls1 + calls2), MAX_SAMPLES) if i < calls1)
+    num1 = max(MAX_SAMPLES - len(samples2), min(num1, len(samples1)))
+    return random.sample(samples1, num1) + random.sample(samples2, MAX_SAMPLES - num1)
+
+
+# The recorders that calls are currently recorded in, innermost last: one for
+# enable, and one for each active collecting block. Instrumentation is on exactly
+# when this is not empty.
+_RECORDERS: list[_Recorder] = []
+
+# The original (class or module, attribute name, value) of each method and function
+# of INSTRUMENTED_METHODS and INSTRUMENTED_FUNCTIONS, while instrumentation is on.
+_ORIGINALS: list[tuple[Any, str, Any]] = []
+
+# The context manager returned by phase while instrumentation is off.
+_NO_PHASE = contextlib.nullcontext()
+
+# The lock held while a recorder of _RECORDERS is read or updated, since instrumented
+# code can run on several threads at once (e.g., in a0_replay's thread mode).
+_LOCK = threading.Lock()
+
+
+def enable() -> None:
+    """Turn instrumentation on, if it is not already on.
+
+    Statistics recorded since the last call to reset or disable are kept.
+    """
+    if _RECORDERS:
+        return
+
+    _RECORDERS.append(_Recorder())
+    for module_name, class_name, method_name in INSTRUMENTED_METHODS:
+        klass = getattr(importlib.import_module(module_name), class_name)
+        method = klass.__dict__[method_name]
+        _ORIGINALS.append((klass, method_name, method))
+        setattr(klass, method_name, _timed(f'{class_name}.{method_name}', method))
+    for module_name, function_name in INSTRUMENTED_FUNCTIONS:
+        module = importlib.import_module(module_name)
+        function = getattr(module, function_name)
+        _ORIGINALS.append((module, function_name, function))
+        setattr(module, function_name, _timed_function(function_name, function))
+
+
+def disable() -> None:
+    """Turn instrumentation off and discard all recorded statistics, restoring the
+    original methods and functions.
+    """
+    _RECORDERS.clear()
+    while _ORIGINALS:
+        owner, name, value = _ORIGINALS.pop()
+        setattr(owner, name, value)
+
+
+def is_enabled() -> bool:
+    """Return whether instrumentation is on."""
+    return bool(_RECORDERS)
+
+
+def reset() -> None:
+    """Discard all recorded statistics, without turning instrumentation on or off."""
+    with _LOCK:
+        if _RECORDERS:
+            _RECORDERS[-1] = _Recorder()
+
+
+def get_stats() -> dict[str, dict[str, float]]:
+    """Return the statistics recorded for each method, function and loader phase.
+
+    The result maps each name (e.g., 'Section.has_conflict' or
+    'load_courses_data_fast.decode') to a dictionary with its number of calls ('calls'),
+    its total latency in seconds ('total_s'), and its mean and percentile latencies in
+    microseconds ('mean_us', 'p50_us', 'p90_us', 'p99_us'). Names that were never called
+    are left out. The result is empty when instrumentation is off.
+    """
+    with _LOCK:
+        return _RECORDERS[-1].summary() if _RECORDERS else {}
+
+
+@contextlib.contextmanager
+def collecting() -> Iterator[dict[str, dict[str, float]]]:
+    """Return a context manager that records the statistics of the calls made inside
+    its block only, and fills the dictionary it returns with them (in the format
+    returned by get_stats) when the block ends.
+
+    Blocks can be nested, and instrumentation can already be on; the calls made inside
+    the block are then also recorded in the enclosing block, or by get_stats.
+    Instrumentation is turned back off at the end of the block if it was off before.
+    """
+    was_enabled = is_enabled()
+    enable()
+    with _LOCK:
+        _RECORDERS.append(_Recorder())
+    res: dict[str, dict[str, float]] = {}
+
+    try:
+        yield res
+    finally:
+        with _LOCK:
+            inner = _RECORDERS.pop()
+            if was_enabled:
+                _RECORDERS[-1].merge(inner)
+        res.update(inner.summary())
+        if not was_enabled:
+            disable()
+    return None
+
+
+def phase(name: str) -> ContextManager:
+    """Return a context manager that records one call of <name> lasting as long as its
+    block, if instrumentation is on, and does nothing otherwise.
+
+    This is used to time the phases of the catalog loaders.
+    """
+    if not _RECORDERS:
+        return _NO_PHASE
+    return _timed_block(name)
+
+
+@contextlib.contextmanager
+def _timed_block(name: str) -> Iterator[None]:
+    """Return a context manager that records one call of <name> lasting as long as its
+    block."""
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        _record(name, time.perf_counter_ns() - start)
+    return None
+
+
+def _timed(name: str, method: Any) -> Callable:
+    """Return a method that calls <method> and records the call as a call of <name>.
+
+    <method> is the value of the method in its class's __dict__; it is bound to each
+    instance through the descriptor protocol, as the contract-checking wrappers need.
+    """
+    @functools.wraps(method)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter_ns()
+        try:
+            return method.__get__(self, type(self))(*args, **kwargs)
+        finally:
+            _record(name, time.perf_counter_ns() - start)
+
+    return wrapper
+
+
+def _timed_function(name: str, function: Callable) -> Callable:
+    """Return a function that calls <function> and records the call as a call of <name>."""
+    @functools.wraps(function)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter_ns()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _record(name, time.perf_counter_ns() - start)
+
+    return wrapper
+
+
+def _record(name: str, latency_ns: int) -> None:
+    """Record one call of <name> that took <latency_ns> nanoseconds, if instrumentation is
+    still on."""
+    with _LOCK:
+        if _RECORDERS:
+            _RECORDERS[-1].add(name, latency_ns)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
+
+    import python_ta
+
+    python_ta.check_all(config={
+        'max-line-length': 100,
+        'extra-imports': ['contextlib', 'functools', 'importlib', 'random', 'threading', 'time',
+                          'typing']
+    })
@@ -0,0 +1,137 @@
+"""CSC148 Assignment 0 - Object-Oriented Modelling, Instrumentation (Tests)
+
+=== Module Description ===
+
+This file contains tests for the a0_stats instrumentation layer.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import time
+import os
+import random
+import sys
+
+import pytest
+
+import a0_part4
+import a0_stats
+from a0_benchmark import write_catalog
+from a0_part1 import Timeslot
+from a0_part2 import Section
+
+
+@pytest.fixture(autouse=True)
+def instrumentation_off() -> None:
+    """Make sure that every test starts and ends with instrumentation off."""
+    a0_stats.disable()
+    yield
+    a0_stats.disable()
+
+
+def test_disabled_methods_are_unwrapped() -> None:
+    """Test that turning instrumentation off restores the original methods."""
+    original = Section.__dict__['has_conflict']
+    a0_stats.enable()
+    assert Section.__dict__['has_conflict'] is not original
+    a0_stats.disable()
+    assert Section.__dict__['has_conflict'] is original
+    assert a0_stats.get_stats() == {}
+
+
+def test_collecting_counts_calls() -> None:
+    """Test that collecting records the calls made inside its block, and only those."""
+    timeslot1 = Timeslot(1, time(9), time(10))
+    timeslot2 = Timeslot(1, time(9, 30), time(11))
+    timeslot1.has_conflict(timeslot2)
+
+    with a0_stats.collecting() as stats:
+        for _ in range(5):
+            assert timeslot1.has_conflict(timeslot2)
+    timeslot1.has_conflict(timeslot2)
+
+    assert stats['Timeslot.has_conflict']['calls'] == 5
+    result = stats['Timeslot.has_conflict']
+    assert 0 < result['p50_us'] <= result['p90_us'] <= result['p99_us']
+    assert not a0_stats.is_enabled()
+
+
+def test_nested_collecting() -> None:
+    """Test that the calls of an inner block are also recorded by the outer block."""
+    timeslot = Timeslot(2, time(9), time(10))
+    with a0_stats.collecting() as outer:
+        timeslot.has_conflict(timeslot)
+        with a0_stats.collecting() as inner:
+            timeslot.has_conflict(timeslot)
+        assert a0_stats.is_enabled()
+
+    assert inner['Timeslot.has_conflict']['calls'] == 1
+    assert outer['Timeslot.has_conflict']['calls'] == 2
+
+
+def test_loader_phases(tmp_path: str) -> None:
+    """Test that load_courses_data is timed, that load_courses_data_fast records its
+    decoding and construction phases, and that load_courses_data is restored."""
+    original = a0_part4.load_courses_data
+    file = os.path.join(tmp_path, 'courses.json')
+    write_catalog(file, 5)
+
+    with a0_stats.collecting() as stats:
+        assert len(a0_part4.load_courses_data(file)) == 5
+        a0_part4.load_courses_data_fast(file)
+
+    assert stats['load_courses_data']['calls'] == 1
+    assert stats['load_courses_data_fast.decode']['calls'] == 1
+    assert stats['load_courses_data_fast.construct']['calls'] == 1
+    assert a0_part4.load_courses_data is original
+
+
+def test_sample_limit(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that at most MAX_SAMPLES latencies are kept per name."""
+    monkeypatch.setattr(a0_stats, 'MAX_SAMPLES', 10)
+    a0_stats.enable()
+    for _ in range(25):
+        with a0_stats.phase('phase'):
+            pass
+
+    assert a0_stats.get_stats()['phase']['calls'] == 25
+    assert len(a0_stats._RECORDERS[-1].samples['phase']) == 10
+
+
+def test_merge_weighted_by_calls(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that merging the samples of a collecting block into a full sample keeps
+    latencies from each side in proportion to its number of calls."""
+    monkeypatch.setattr(a0_stats, 'MAX_SAMPLES', 100)
+    random.seed(148)
+    a0_stats.enable()
+    for _ in range(1000):
+        a0_stats._record('phase', 1)
+    with a0_stats.collecting():
+        for _ in range(3000):
+            a0_stats._record('phase', 2)
+
+    samples = a0_stats._RECORDERS[-1].samples['phase']
+    assert a0_stats.get_stats()['phase']['calls'] == 4000
+    assert len(samples) == 100
+    assert 60 <= samples.count(2) <= 90
+
+
+
+def test_threads(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the calls made on several threads at once are all recorded, with a full
+    sample."""
+    monkeypatch.setattr(a0_stats, 'MAX_SAMPLES', 100)
+    old_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with a0_stats.collecting() as stats:
+            with ThreadPoolExecutor(4) as executor:
+                list(executor.map(lambda _: [a0_stats._record('phase', 1) for _ in range(5000)],
+                                  range(4)))
+    finally:
+        sys.setswitchinterval(old_interval)
+
+    assert stats['phase']['calls'] == 20000
+    assert stats['phase']['total_s'] == 20000 / 1e9
+
+
+if __name__ == '__main__':
+    pytest.main(['a0_stats_test.py', '-v'])